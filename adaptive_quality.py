@@ -0,0 +1,173 @@
+import collections
+import time
+
+from config import Config
+
+# 화질 단계 (이름, 세로 해상도, 비디오 비트레이트 kbps, fps)
+QualityLevel = collections.namedtuple('QualityLevel', ['name', 'height', 'bitrate', 'fps'])
+
+# 높은 화질부터 (YouTube 권장 비트레이트 범위 기준, 가장 낮은 단계는 fps도 낮춤)
+QUALITY_LADDER = (
+    QualityLevel('1080p', 1080, 4500, 30),
+    QualityLevel('720p', 720, 2500, 30),
+    QualityLevel('480p', 480, 1000, 30),
+    QualityLevel('360p', 360, 500, 15),
+)
+
+# 혼잡 판단 기준 (한 번이라도 넘으면 혼잡)
+CONGESTED_DROP_RATIO = 0.02     # 캡처 대비 버린 프레임 비율
+CONGESTED_ENCODE_RATIO = 0.90   # 목표 fps 대비 실제 전송 프레임 비율
+CONGESTED_QUEUE_FILL = 0.50     # 큐 사용률
+CONGESTED_WRITE_LOAD = 0.90     # 프레임 간격 대비 평균 싱크 쓰기 시간 (전송 경로 사용률)
+
+# 여유 판단 기준 (버린 프레임 없이 모두 만족해야 여유). 쓰기 시간이 프레임 간격의 절반 미만이어야
+# 비트레이트가 두 배 가까운 윗 단계로 올라가도 버틸 수 있음
+HEADROOM_QUEUE_FILL = 0.25
+HEADROOM_WRITE_LOAD = 0.50
+
+# 히스테리시스: 내릴 때는 빠르게, 올릴 때는 천천히
+DOWN_AFTER = 2          # 연속 혼잡 표본 수
+UP_AFTER = 10           # 연속 여유 표본 수
+HOLD_SECONDS = 10.0     # 단계를 바꾼 뒤 다시 올리기까지 최소 시간
+MAX_UP_BACKOFF = 8      # 올렸다가 곧 다시 내린 단계는 UP_AFTER를 최대 몇 배까지 늘릴지
+SETTLE_SAMPLES = 1      # 단계 변경 직후 무시할 표본 수 (ffmpeg 재시작 중 지연은 혼잡이 아님)
+
+
+def build_ladder(source_height, max_quality=None, ladder=QUALITY_LADDER):
+    """원본 해상도와 최고 화질 설정(STREAM_QUALITY)을 넘지 않는 단계만 (업스케일하지 않음)"""
+    max_quality = max_quality or Config.STREAM_QUALITY
+    limit = source_height
+    for level in ladder:
+        if level.name == max_quality:
+            limit = min(limit, level.height)
+    levels = [level for level in ladder if level.height <= limit]
+    # 원본이 가장 낮은 단계보다 작으면 가장 낮은 단계만 사용
+    return levels or [ladder[-1]]
+
+
+class QualityController:
+    """인코더/큐 지표로 화질 단계를 고르는 적응형 비트레이트·해상도 제어기
+
+    파이프라인 stats()를 일정 간격으로 observe()에 넘기면, 직전 표본 이후의 전송 프레임 비율,
+    버린 프레임 비율, 큐 사용률, 싱크 쓰기 시간(RTMP 전송 대기 포함)으로 혼잡/여유를 판단합니다.
+    - 혼잡이 DOWN_AFTER번 연속이면 한 단계 내림
+    - 여유가 up_after번 연속이고 마지막 변경 후 hold초가 지났으면 한 단계 올림
+    - 올린 뒤 곧 다시 내려야 했다면 그 단계로 다시 올릴 때 필요한 표본 수를 두 배로 늘려,
+      경계 대역폭에서 단계가 오르내리기를 반복하지 않게 함 (올린 단계가 유지되면 원래대로)
+    """
+
+    def __init__(self, ladder=None, source_fps=None, down_after=DOWN_AFTER, up_after=UP_AFTER,
+                 hold=HOLD_SECONDS, start=0):
+        self.ladder = list(ladder or QUALITY_LADDER)
+        self.source_fps = source_fps or Config.STREAM_FPS
+        self.down_after = down_after
+        self.up_after = up_after
+        self.hold = hold
+        # 올렸다가 실패한 단계 번호 -> 그 단계로 다시 올리기까지 필요한 연속 여유 표본 수
+        self.retry_after = {}
+        self.index = start
+        self.state = 'stable'
+        self.reason = ''
+        # 최근 단계 변경 기록과 전체 변경 횟수
+        self.events = collections.deque(maxlen=20)
+        self.changes = 0
+        self._congested = 0
+        self._headroom = 0
+        self._settle = 0
+        self._previous = None
+        self._changed_at = None
+        self._last_direction = None
+
+    @property
+    def level(self):
+        """현재 화질 단계"""
+        return self.ladder[self.index]
+
+    def target_fps(self, level=None):
+        """단계의 fps (원본 fps보다 높을 수 없음)"""
+        return min((level or self.level).fps, self.source_fps)
+
+    def _assess(self, previous, stats, elapsed):
+        """직전 표본 이후 구간의 (상태, 이유)"""
+        captured = stats['frames_captured'] - previous['frames_captured']
+        encoded = stats['frames_encoded'] - previous['frames_encoded']
+        dropped = stats['frames_dropped'] - previous['frames_dropped']
+        fps = self.target_fps()
+        # 카메라가 느려져도(저조도 등) 페이서가 직전 프레임을 반복해 목표 fps를 채우므로,
+        # 목표보다 적게 전송했다면 싱크가 틱을 따라가지 못한 것
+        encode_ratio = encoded / (fps * elapsed)
+        drop_ratio = dropped / captured if captured else 0.0
+        queue_fill = stats['queue_depth'] / stats['queue_size']
+        # p95는 일시적인 흔들림에 민감하므로 사용률은 평균 쓰기 시간으로 판단
+        write_avg = stats['write_avg_ms'] or 0.0
+        write_load = write_avg / 1000 * fps
+
+        if drop_ratio > CONGESTED_DROP_RATIO:
+            return 'congested', f"버린 프레임 {drop_ratio:.0%}"
+        if encode_ratio < CONGESTED_ENCODE_RATIO:
+            return 'congested', f"전송 {encoded / elapsed:.1f}fps ({encode_ratio:.0%})"
+        if queue_fill >= CONGESTED_QUEUE_FILL:
+            return 'congested', f"큐 {stats['queue_depth']}/{stats['queue_size']}"
+        if write_load > CONGESTED_WRITE_LOAD:
+            return 'congested', f"쓰기 {write_avg:.0f}ms ({write_load:.0%})"
+        if dropped == 0 and queue_fill <= HEADROOM_QUEUE_FILL and write_load < HEADROOM_WRITE_LOAD:
+            return 'headroom', f"쓰기 {write_avg:.0f}ms ({write_load:.0%})"
+        return 'stable', ''
+
+    def observe(self, stats, now=None):
+        """지표 표본 반영. 단계를 바꿔야 하면 새 QualityLevel, 아니면 None"""
+        now = time.monotonic() if now is None else now
+        previous, self._previous = self._previous, dict(stats, observed_at=now)
+        if previous is None or self._settle:
+            # 첫 표본이나 단계 변경 직후는 기준점으로만 사용
+            self._settle = max(0, self._settle - 1)
+            return None
+        elapsed = now - previous['observed_at']
+        if elapsed <= 0:
+            return None
+
+        self.state, self.reason = self._assess(previous, stats, elapsed)
+
+        # 올린 단계가 충분히 유지되면 그 단계의 재시도 대기를 원래대로
+        recently_raised = self._last_direction == 'up' and now - self._changed_at < self.hold * 3
+        if self._last_direction == 'up' and not recently_raised:
+            self.retry_after.pop(self.index, None)
+            self._last_direction = None
+
+        if self.state == 'congested':
+            self._congested += 1
+            self._headroom = 0
+            if self._congested >= self.down_after and self.index < len(self.ladder) - 1:
+                if recently_raised:
+                    # 올리자마자 혼잡: 이 단계로는 더 오래 기다린 뒤 다시 올림
+                    required = self.retry_after.get(self.index, self.up_after)
+                    self.retry_after[self.index] = min(required * 2, self.up_after * MAX_UP_BACKOFF)
+                return self._change(self.index + 1, 'down', now)
+        elif self.state == 'headroom':
+            self._headroom += 1
+            self._congested = 0
+            held = self._changed_at is None or now - self._changed_at >= self.hold
+            required = self.retry_after.get(self.index - 1, self.up_after)
+            if self._headroom >= required and held and self.index > 0:
+                return self._change(self.index - 1, 'up', now)
+        else:
+            self._congested = 0
+            self._headroom = 0
+        return None
+
+    def _change(self, index, direction, now):
+        previous = self.level
+        self.index = index
+        self.events.append({
+            'at': now,
+            'from': previous.name,
+            'to': self.level.name,
+            'reason': self.reason
+        })
+        self.changes += 1
+        self._congested = 0
+        self._headroom = 0
+        self._settle = SETTLE_SAMPLES
+        self._changed_at = now
+        self._last_direction = direction
+        return self.level
@@ -0,0 +1,244 @@
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import Config
+from http_client import retry_count
+
+# 응답 지연 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 국가 구분이 없는 호출 (videos 등)의 region 라벨
+NO_REGION = '-'
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def is_error_status(status):
+    """HTTP 오류 응답 또는 요청 자체 실패(timeout/error/quota_exceeded) 여부"""
+    status = str(status)
+    return not status.isdigit() or int(status) >= 400
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+class ApiMetrics:
+    """외부 API 호출 지표 수집 (스레드 안전)
+
+    엔드포인트/국가별로 요청 수(상태 코드별), 지연 히스토그램, 응답 바이트,
+    재시도 횟수, 사용 할당량, 캐시 적중/미스를 집계하고 Prometheus 텍스트로 출력합니다.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._requests = Counter()      # (endpoint, region, status) -> 요청 수
+        self._latency = {}              # (endpoint, region) -> [구간별 누적 수..., 합계, 개수]
+        self._bytes = Counter()         # (endpoint, region) -> 응답 바이트
+        self._retries = Counter()       # (endpoint, region) -> 재시도 횟수
+        self._quota_units = Counter()   # (endpoint, region) -> 사용 할당량
+        self._cache = Counter()         # (endpoint, region, result) -> 캐시 조회 수
+
+    def observe_request(self, endpoint, region, status, duration=None, response_bytes=0, retries=0, quota_units=0):
+        """API 호출 한 건 기록 (duration이 None이면 요청을 보내지 않은 경우)"""
+        key = (endpoint, region or NO_REGION)
+        with self._lock:
+            self._requests[key + (str(status),)] += 1
+            self._bytes[key] += response_bytes
+            self._retries[key] += retries
+            self._quota_units[key] += quota_units
+            if duration is not None:
+                histogram = self._latency.get(key)
+                if histogram is None:
+                    histogram = self._latency[key] = [0] * (len(self.buckets) + 2)
+                for index, bound in enumerate(self.buckets):
+                    if duration <= bound:
+                        histogram[index] += 1
+                histogram[-2] += duration
+                histogram[-1] += 1
+
+    def observe_response(self, endpoint, region, response, duration, quota_units=0):
+        """requests 응답 객체로 호출 기록 (urllib3 재시도 횟수 포함, 할당량은 재시도한 요청까지 호출당 비용으로 계산)"""
+        retries = retry_count(response)
+        self.observe_request(endpoint, region, response.status_code, duration,
+                             len(response.content or b''), retries, quota_units * (1 + retries))
+
+    def record_cache(self, endpoint, region, result):
+        """캐시 조회 결과 기록 (result: hit / miss / stale)"""
+        with self._lock:
+            self._cache[(endpoint, region or NO_REGION, result)] += 1
+
+    def clear(self):
+        """지표 초기화"""
+        with self._lock:
+            for counter in (self._requests, self._bytes, self._retries, self._quota_units, self._cache):
+                counter.clear()
+            self._latency.clear()
+
+    def snapshot(self):
+        """엔드포인트/국가별 요약 (진단 패널용)"""
+        with self._lock:
+            keys = sorted({key[:2] for key in self._requests} | {key[:2] for key in self._cache})
+            rows = []
+            for endpoint, region in keys:
+                requests = errors = 0
+                for (req_endpoint, req_region, status), count in self._requests.items():
+                    if (req_endpoint, req_region) == (endpoint, region):
+                        requests += count
+                        if is_error_status(status):
+                            errors += count
+                histogram = self._latency.get((endpoint, region))
+                rows.append({
+                    'endpoint': endpoint,
+                    'region': region,
+                    'requests': requests,
+                    'errors': errors,
+                    'error_rate': errors / requests if requests else 0.0,
+                    'p50_ms': self._quantile(histogram, 0.50),
+                    'p95_ms': self._quantile(histogram, 0.95),
+                    'bytes': self._bytes[(endpoint, region)],
+                    'retries': self._retries[(endpoint, region)],
+                    'quota_units': self._quota_units[(endpoint, region)],
+                    'cache_hits': self._cache[(endpoint, region, 'hit')] + self._cache[(endpoint, region, 'stale')],
+                    'cache_misses': self._cache[(endpoint, region, 'miss')]
+                })
+            return rows
+
+    def render(self):
+        """Prometheus 텍스트 형식으로 출력"""
+        lines = []
+        with self._lock:
+            lines += ['# HELP youtube_api_requests_total YouTube API requests by status',
+                      '# TYPE youtube_api_requests_total counter']
+            for (endpoint, region, status), count in sorted(self._requests.items()):
+                lines.append(f"youtube_api_requests_total{_labels(endpoint=endpoint, region=region, status=status)} {count}")
+
+            lines += ['# HELP youtube_api_request_duration_seconds YouTube API request latency',
+                      '# TYPE youtube_api_request_duration_seconds histogram']
+            for (endpoint, region), histogram in sorted(self._latency.items()):
+                for bound, count in zip(self.buckets, histogram):
+                    labels = _labels(endpoint=endpoint, region=region, le=f"{bound:g}")
+                    lines.append(f"youtube_api_request_duration_seconds_bucket{labels} {count}")
+                labels = _labels(endpoint=endpoint, region=region, le='+Inf')
+                lines.append(f"youtube_api_request_duration_seconds_bucket{labels} {histogram[-1]}")
+                labels = _labels(endpoint=endpoint, region=region)
+                lines.append(f"youtube_api_request_duration_seconds_sum{labels} {histogram[-2]:.6f}")
+                lines.append(f"youtube_api_request_duration_seconds_count{labels} {histogram[-1]}")
+
+            for name, help_text, counter in (
+                ('youtube_api_response_bytes_total', 'YouTube API response body bytes', self._bytes),
+                ('youtube_api_retries_total', 'YouTube API transport retries', self._retries),
+                ('youtube_api_quota_units_total', 'YouTube API quota units spent', self._quota_units)
+            ):
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+                for (endpoint, region), value in sorted(counter.items()):
+                    lines.append(f"{name}{_labels(endpoint=endpoint, region=region)} {value}")
+
+            lines += ['# HELP youtube_api_cache_lookups_total Response cache lookups by result',
+                      '# TYPE youtube_api_cache_lookups_total counter']
+            for (endpoint, region, result), count in sorted(self._cache.items()):
+                lines.append(f"youtube_api_cache_lookups_total{_labels(endpoint=endpoint, region=region, result=result)} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def _quantile(self, histogram, fraction):
+        """히스토그램 구간 내 선형 보간으로 분위수 추정 (ms)"""
+        if not histogram or not histogram[-1]:
+            return None
+        target = fraction * histogram[-1]
+        lower, previous = 0.0, 0
+        for bound, count in zip(self.buckets, histogram):
+            if count >= target:
+                share = (target - previous) / (count - previous) if count > previous else 1.0
+                return (lower + (bound - lower) * share) * 1000
+            lower, previous = bound, count
+        # 마지막 구간을 넘는 경우 마지막 경계값으로 표시
+        return self.buckets[-1] * 1000
+
+
+# 프로세스 전역 공유 지표
+_api_metrics = None
+_api_metrics_lock = threading.Lock()
+
+
+def get_api_metrics():
+    """모든 추출기 인스턴스가 공유하는 API 지표 반환"""
+    global _api_metrics
+    if _api_metrics is None:
+        with _api_metrics_lock:
+            if _api_metrics is None:
+                _api_metrics = ApiMetrics()
+    return _api_metrics
+
+
+def render_diagnostics_panel(metrics=None):
+    """Streamlit 진단 패널 (엔드포인트/국가별 지연, 오류율, 할당량, 캐시 적중)"""
+    import streamlit as st
+
+    rows = (metrics or get_api_metrics()).snapshot()
+    with st.expander("📈 API 진단", expanded=True):
+        if not rows:
+            st.caption("아직 기록된 API 호출이 없습니다.")
+        else:
+            st.dataframe([{
+                '엔드포인트': row['endpoint'],
+                '국가': row['region'],
+                '요청': row['requests'],
+                '오류율': f"{row['error_rate']:.1%}",
+                'p50 (ms)': None if row['p50_ms'] is None else round(row['p50_ms']),
+                'p95 (ms)': None if row['p95_ms'] is None else round(row['p95_ms']),
+                '응답 KB': round(row['bytes'] / 1024, 1),
+                '재시도': row['retries'],
+                '할당량': row['quota_units'],
+                '캐시 적중': row['cache_hits'],
+                '캐시 미스': row['cache_misses']
+            } for row in rows], hide_index=True)
+        if _metrics_server is not None:
+            host, port = _metrics_server.server_address[:2]
+            st.caption(f"Prometheus: http://{host}:{port}/metrics")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = get_api_metrics().render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', PROMETHEUS_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_metrics_server = None
+_metrics_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=None, host=None):
+    """Prometheus 수집용 /metrics 엔드포인트 시작 (프로세스당 한 번, 포트 0이면 비활성화)
+
+    Streamlit은 스크립트를 매번 다시 실행하므로 여러 번 호출해도 서버는 하나만 유지됩니다.
+    """
+    global _metrics_server
+    port = Config.METRICS_PORT if port is None else port
+    if not port:
+        return None
+    with _metrics_server_lock:
+        if _metrics_server is None:
+            try:
+                _metrics_server = ThreadingHTTPServer((host or Config.METRICS_HOST, port), _MetricsHandler)
+            except OSError:
+                # 이미 다른 프로세스가 포트를 사용 중이면 지표 노출만 건너뜀
+                return None
+            _metrics_server.daemon_threads = True
+            threading.Thread(target=_metrics_server.serve_forever, name='metrics', daemon=True).start()
+        return _metrics_server
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""적응형 화질 조절 벤치마크 (업로드 대역폭을 제한한 로컬 싱크)
+
+ThrottledSink는 프레임마다 현재 화질 단계의 비트레이트로 인코딩했을 때의 크기
+(비트레이트 / fps)를 제한된 업로드 대역폭으로 보내는 시간만큼 쓰기를 지연시켜,
+RTMP 전송이 밀리는 상황을 ffmpeg 없이 재현합니다. 대역폭을 구간별로 바꿔 가며
+단계가 내려가고 다시 올라오는지, 경계 대역폭에서 단계가 오르내리기를 반복하지 않는지 확인합니다.
+
+- after : 히스테리시스 적용 (기본 제어기 설정)
+- before: --no-hysteresis, 혼잡/여유 한 번에 바로 단계 변경
+
+사용법: python benchmarks/bench_adaptive_quality.py [--schedule 6000:8,1500:12,2800:20,6000:30]
+        [--size 1920x1080] [--interval 0.5] [--no-hysteresis]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adaptive_quality import QualityController, build_ladder
+from config import Config
+from stream_pipeline import StreamPipeline, SyntheticSource
+
+
+class ThrottledSink:
+    """업로드 대역폭(kbps)을 구간별로 제한하는 로컬 싱크 (프레임은 버림)
+
+    원시 프레임을 실제로 기록하면 그 시간(1080p 프레임당 6MB)이 쓰기 시간에 섞이므로
+    전송 시간만 재현합니다.
+    """
+
+    def __init__(self, schedule):
+        # [(구간 끝 시각, kbps), ...]
+        self.schedule = schedule
+        self.level = None
+        self.started_at = None
+
+    def uplink(self):
+        """현재 업로드 대역폭 (kbps)"""
+        elapsed = time.monotonic() - self.started_at
+        for until, kbps in self.schedule:
+            if elapsed < until:
+                return kbps
+        return self.schedule[-1][1]
+
+    def open(self):
+        self.started_at = self.started_at or time.monotonic()
+
+    def set_quality(self, level):
+        self.level = level
+
+    def write(self, frame):
+        # 인코딩된 프레임 한 장 크기(kbit)를 업로드 대역폭으로 보내는 시간
+        time.sleep(self.level.bitrate / self.level.fps / self.uplink())
+
+    def close(self, timeout=None):
+        pass
+
+    def error_output(self):
+        return ''
+
+
+def parse_schedule(text):
+    """'6000:8,1500:12' -> [(8, 6000), (20, 1500)] (구간 끝 시각, kbps)"""
+    schedule, until = [], 0.0
+    for part in text.split(','):
+        kbps, seconds = part.split(':')
+        until += float(seconds)
+        schedule.append((until, int(kbps)))
+    return schedule
+
+
+def main():
+    parser = argparse.ArgumentParser(description='적응형 화질 조절 벤치마크')
+    parser.add_argument('--schedule', default='6000:8,1500:12,2800:20,6000:30',
+                        help='업로드 대역폭 구간 (kbps:초, 쉼표로 구분)')
+    parser.add_argument('--size', default='1920x1080', help='프레임 크기 (WxH)')
+    parser.add_argument('--fps', type=int, default=Config.STREAM_FPS, help='캡처 fps')
+    parser.add_argument('--max-quality', default='1080p', help='최고 화질 단계')
+    parser.add_argument('--queue-size', type=int, default=Config.STREAM_QUEUE_SIZE, help='프레임 큐 크기')
+    parser.add_argument('--interval', type=float, default=0.5, help='화질 판단 간격 (초)')
+    parser.add_argument('--no-hysteresis', action='store_true', help='혼잡/여유 표본 하나로 바로 단계 변경')
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.size.lower().split('x'))
+    schedule = parse_schedule(args.schedule)
+    duration = schedule[-1][0]
+    ladder = build_ladder(height, args.max_quality)
+    if args.no_hysteresis:
+        controller = QualityController(ladder, source_fps=args.fps, down_after=1, up_after=1, hold=0)
+    else:
+        # 판단 간격이 짧으면 같은 시간만큼 기다리도록 표본 수를 맞춤
+        scale = 1.0 / args.interval
+        controller = QualityController(ladder, source_fps=args.fps,
+                                       up_after=round(10 * scale), hold=10.0)
+
+    sink = ThrottledSink(schedule)
+    pipeline = StreamPipeline(SyntheticSource(width, height, args.fps), sink, queue_size=args.queue_size,
+                              controller=controller, adapt_interval=args.interval, fps=args.fps)
+    mode = 'before (no hysteresis)' if args.no_hysteresis else 'after (hysteresis)'
+    print(f"{mode}  {width}x{height}@{args.fps}  ladder={'/'.join(level.name for level in ladder)}  "
+          f"schedule={args.schedule}")
+    print(f"{'t':>5s} {'uplink':>7s} {'level':>6s} {'fps':>6s} {'dropped':>8s} {'queue':>6s} {'write avg':>10s}  state")
+
+    pipeline.start()
+    started = time.monotonic()
+    previous = pipeline.stats()
+    try:
+        while time.monotonic() - started < duration and pipeline.running:
+            time.sleep(1.0)
+            stats = pipeline.stats()
+            write_avg = stats['write_avg_ms']
+            print(f"{time.monotonic() - started:5.1f} {sink.uplink():7d} {stats['quality']:>6s} "
+                  f"{stats['frames_encoded'] - previous['frames_encoded']:6d} "
+                  f"{stats['frames_dropped'] - previous['frames_dropped']:8d} {stats['queue_depth']:6d} "
+                  f"{'-' if write_avg is None else f'{write_avg:.0f}ms':>10s}  {controller.state}")
+            previous = stats
+    finally:
+        pipeline.stop()
+
+    stats = pipeline.stats()
+    print(f"changes={controller.changes}  dropped={stats['frames_dropped']}  skipped={stats['frames_skipped']}  "
+          f"latency p95={stats['latency_p95_ms']:.1f}ms")
+    for event in controller.events:
+        print(f"  {event['at'] - started:5.1f}s {event['from']} -> {event['to']} ({event['reason']})")
+    if stats['error']:
+        print(f"error: {stats['error']}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""추출기 처리량/지연 벤치마크 (로컬 모의 API 서버 사용, 할당량 소모 없음)
+
+시나리오:
+- search: 매번 다른 키워드로 search_videos 호출 (캐시 미스, 페이지네이션 포함)
+- stats : 통계 50개 get_video_statistics_bulk 호출
+- render: Streamlit AppTest로 검색 버튼 클릭 후 결과 페이지 전체 렌더링
+
+p50/p95/p99 지연, 초당 처리 수, 호출당 최대 메모리 할당량(tracemalloc)을 출력하고
+benchmarks/results/history.jsonl 에 커밋 해시, 측정 환경과 함께 누적 저장하여
+같은 환경의 이전 실행과 비교합니다 (p95가 10% 이상 느려지면 회귀로 표시).
+커밋하지 않은 변경이 있으면 어떤 코드의 결과인지 알 수 없으므로 저장하지 않습니다 (--save-dirty로 저장).
+
+사용법: python benchmarks/bench_extractor.py [--scenario search stats render]
+        [--iterations 50] [--concurrency 1] [--max-results 50] [--latency 0.02]
+        [--error-rate 503=0.01] [--no-save] [--save-dirty]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILE = os.path.join(ROOT, 'benchmarks', 'results', 'history.jsonl')
+REGRESSION_THRESHOLD = 1.10
+
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_youtube_api import parse_error_rates, start_mock_server
+
+
+def configure_environment(base_url, cache_dir):
+    """프로젝트 모듈을 불러오기 전에 모의 서버 주소와 벤치마크용 제한 해제 설정"""
+    os.environ.update({
+        'YOUTUBE_API_KEY': 'bench-key',
+        'YOUTUBE_API_BASE_URL': base_url,
+        # 할당량/속도 제한이 측정값을 좌우하지 않도록 충분히 크게 설정
+        'QUOTA_DAILY_UNITS': str(10 ** 9),
+        'QUOTA_RATE_PER_SEC': str(10 ** 6),
+        'QUOTA_BURST': str(10 ** 6),
+        'THUMBNAIL_CACHE_DIR': cache_dir
+    })
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(operation, iterations, concurrency):
+    """operation(i)를 반복 실행하여 지연 분포와 초당 처리 수 측정"""
+    def timed(i):
+        start = time.perf_counter()
+        operation(i)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(timed, range(iterations)))
+    else:
+        latencies = [timed(i) for i in range(iterations)]
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+        'ops_per_sec': round(iterations / elapsed, 2)
+    }
+
+
+def measure_allocations(operation, iterations, offset):
+    """호출당 최대 메모리 할당량 (KiB, tracemalloc 측정은 지연 측정과 분리)"""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(iterations):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            operation(offset + i)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+    finally:
+        tracemalloc.stop()
+    return {'alloc_peak_kib': round(statistics.median(peaks) / 1024, 1)}
+
+
+def search_operation(args):
+    from youtube_video_extractor import YouTubeVideoExtractor
+
+    extractor = YouTubeVideoExtractor('bench-key')
+
+    def operation(i):
+        videos, error = extractor.search_videos(f"bench search {i}", 'JP', args.max_results,
+                                                event_type='video', with_statistics=True)
+        # 오류 비율을 설정한 경우 실패한 호출도 지연 분포에 포함
+        assert error is not None or len(videos) == args.max_results, len(videos)
+    return operation
+
+
+def stats_operation(args):
+    from youtube_video_extractor import YouTubeVideoExtractor
+
+    extractor = YouTubeVideoExtractor('bench-key')
+
+    def operation(i):
+        stats = extractor.get_video_statistics_bulk(f"v{i:06d}_{j:02d}" for j in range(50))
+        assert len(stats) == 50, len(stats)
+    return operation
+
+
+def render_operation(args):
+    import logging
+    from streamlit.testing.v1 import AppTest
+
+    # 렌더링 중 Streamlit 경고 로그가 결과 출력을 가리지 않도록 함
+    logging.getLogger('streamlit.deprecation_util').disabled = True
+
+    page = os.path.join(ROOT, 'youtube_video_extractor.py')
+
+    def operation(i):
+        at = AppTest.from_file(page, default_timeout=60)
+        at.run()
+        at.sidebar.text_input[0].input(f"bench render {i}")
+        at.sidebar.slider[0].set_value(args.max_results)
+        at.sidebar.button[0].click().run()
+        assert not at.exception, at.exception
+    return operation
+
+
+SCENARIOS = {
+    'search': search_operation,
+    'stats': stats_operation,
+    'render': render_operation
+}
+
+
+def git_revision():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                         stderr=subprocess.DEVNULL, text=True).strip()
+        dirty = bool(subprocess.check_output(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                             cwd=ROOT, stderr=subprocess.DEVNULL, text=True).strip())
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+    return commit, dirty
+
+
+def machine_info():
+    """측정 환경 (다른 환경의 결과와는 비교하지 않음)"""
+    return {'platform': platform.platform(), 'python': platform.python_version(), 'cpus': os.cpu_count()}
+
+
+def load_history():
+    if not os.path.exists(RESULTS_FILE):
+        return []
+    with open(RESULTS_FILE, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def previous_result(history, record):
+    """같은 시나리오/설정/환경에서 측정한 가장 최근 결과"""
+    for previous in reversed(history):
+        if (previous['scenario'] == record['scenario'] and previous['settings'] == record['settings']
+                and previous.get('machine') == record['machine']):
+            return previous
+    return None
+
+
+def report(record, previous):
+    line = (f"{record['scenario']:<7} p50={record['p50_ms']:>9.2f}ms  p95={record['p95_ms']:>9.2f}ms  "
+            f"p99={record['p99_ms']:>9.2f}ms  {record['ops_per_sec']:>8.2f} ops/s  "
+            f"alloc={record['alloc_peak_kib']:>8.1f}KiB  api_requests={record['api_requests']}")
+    print(line)
+    if previous:
+        change = record['p95_ms'] / previous['p95_ms'] if previous['p95_ms'] else 1.0
+        mark = '⚠️ 회귀' if change > REGRESSION_THRESHOLD else '✅'
+        print(f"        {mark} 이전 {previous['commit']} 대비 p95 {(change - 1) * 100:+.1f}%  "
+              f"ops/s {previous['ops_per_sec']} -> {record['ops_per_sec']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='추출기 벤치마크 (모의 API 서버)')
+    parser.add_argument('--scenario', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--iterations', type=int, default=50, help='시나리오별 반복 횟수')
+    parser.add_argument('--render-iterations', type=int, default=10, help='render 시나리오 반복 횟수')
+    parser.add_argument('--alloc-iterations', type=int, default=5, help='메모리 측정 반복 횟수')
+    parser.add_argument('--concurrency', type=int, default=1, help='동시 실행 수 (render 제외)')
+    parser.add_argument('--max-results', type=int, default=50, help='검색 결과 개수')
+    parser.add_argument('--latency', type=float, default=0.02, help='모의 서버 응답 지연 (초)')
+    parser.add_argument('--error-rate', action='append', metavar='CODE=RATE', help='모의 서버 오류 비율')
+    parser.add_argument('--no-save', action='store_true', help='결과를 기록하지 않음')
+    parser.add_argument('--save-dirty', action='store_true', help='커밋하지 않은 변경이 있어도 결과를 기록')
+    args = parser.parse_args()
+
+    settings = {'latency': args.latency, 'error_rates': parse_error_rates(args.error_rate)}
+    server, base_url = start_mock_server(**settings)
+    commit, dirty = git_revision()
+    machine = machine_info()
+    history = load_history()
+    save = not args.no_save and (args.save_dirty or not dirty)
+    if dirty and not args.no_save and not save:
+        print('⚠️ 커밋하지 않은 변경이 있어 결과를 기록하지 않습니다 (--save-dirty로 기록).')
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        configure_environment(base_url, cache_dir)
+        for scenario in args.scenario:
+            operation = SCENARIOS[scenario](args)
+            iterations = args.render_iterations if scenario == 'render' else args.iterations
+            concurrency = 1 if scenario == 'render' else args.concurrency
+
+            server.settings.requests.clear()
+            record = measure(operation, iterations, concurrency)
+            api_requests = sum(count for endpoint, count in server.settings.requests.items()
+                               if endpoint in ('search', 'videos'))
+            record.update(measure_allocations(operation, args.alloc_iterations, iterations))
+
+            record = {
+                'scenario': scenario,
+                'commit': commit + ('-dirty' if dirty else ''),
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'machine': machine,
+                'settings': {
+                    'iterations': iterations, 'concurrency': concurrency, 'max_results': args.max_results,
+                    'latency': args.latency, 'error_rates': {str(code): rate for code, rate in settings['error_rates'].items()}
+                },
+                **record,
+                'api_requests': api_requests
+            }
+            report(record, previous_result(history, record))
+            if save:
+                os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+                with open(RESULTS_FILE, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""프레임 페이싱 벤치마크 (목표 fps 대비 출력 간격 흔들림/누적 어긋남)
+
+목표보다 빠른 카메라, 느린 카메라, 프레임이 몰려 들어오는 카메라(SyntheticSource 기반)로
+싱크에 기록되는 시각을 측정합니다.
+- before (no pacing) : 프레임이 들어오는 대로 바로 기록 (카메라 속도와 몰림이 그대로 인코더로 전달)
+- before (sleep loop): 기록 후 1/fps만큼 sleep (읽기/기록 시간만큼 느려지며 어긋남이 누적)
+- after (pacer)      : StreamPipeline + FramePacer (monotonic_ns 마감 시각, 최신 프레임 전송/반복)
+
+지표: 출력 fps, 프레임 간격 오차 p50/p99/최대(ms), 누적 어긋남(경과 시간 - 프레임 수 x 간격, ms)
+
+사용법: python benchmarks/bench_frame_pacing.py [--fps 30] [--seconds 5] [--size 1280x720] [--histogram]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from stream_pipeline import StreamPipeline, SyntheticSource, percentile
+
+
+class BurstySource:
+    """fps는 맞지만 burst장씩 몰아서 들어오는 카메라 (드라이버 버퍼링 재현)"""
+
+    def __init__(self, width, height, fps, burst=3):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.burst = burst
+        self._frames = SyntheticSource(width, height, fps=1e9)
+        self._index = 0
+        self._next_at = None
+
+    def read(self, out=None):
+        if self._index % self.burst == 0:
+            now = time.monotonic()
+            if self._next_at is None:
+                self._next_at = now
+            elif now < self._next_at:
+                time.sleep(self._next_at - now)
+            self._next_at += self.burst / self.fps
+        self._index += 1
+        return self._frames.read(out=out)
+
+    def close(self):
+        pass
+
+
+class RecordingSink:
+    """프레임 기록 시각(monotonic_ns)만 남기는 싱크"""
+
+    def __init__(self):
+        self.times = []
+
+    def open(self):
+        pass
+
+    def write(self, frame):
+        self.times.append(time.monotonic_ns())
+
+    def set_quality(self, level):
+        pass
+
+    def close(self, timeout=None):
+        pass
+
+    def error_output(self):
+        return ''
+
+
+def summarize(times, fps):
+    period_ms = 1000 / fps
+    intervals = sorted(abs((later - earlier) / 1e6 - period_ms) for earlier, later in zip(times, times[1:]))
+    elapsed_ms = (times[-1] - times[0]) / 1e6
+    return {
+        'fps': (len(times) - 1) / elapsed_ms * 1000,
+        'jitter_p50': percentile(intervals, 0.50),
+        'jitter_p99': percentile(intervals, 0.99),
+        'jitter_max': intervals[-1],
+        'drift': elapsed_ms - (len(times) - 1) * period_ms
+    }
+
+
+def run_unpaced(source, fps, seconds, sleep_after_write):
+    sink = RecordingSink()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        sink.write(source.read())
+        if sleep_after_write:
+            time.sleep(1 / fps)
+    return sink.times
+
+
+def run_paced(source, fps, seconds):
+    sink = RecordingSink()
+    pipeline = StreamPipeline(source, sink, fps=fps)
+    pipeline.start()
+    time.sleep(seconds)
+    pipeline.stop()
+    stats = pipeline.stats()
+    extra = f"  skipped={stats['frames_skipped']} repeated={stats['frames_repeated']} rebases={stats['pacer_rebases']}"
+    return sink.times, extra, pipeline.pacer
+
+
+def report(label, times, fps, extra=''):
+    result = summarize(times, fps)
+    print(f"  {label:22s} fps={result['fps']:6.2f}  jitter p50={result['jitter_p50']:6.2f}ms "
+          f"p99={result['jitter_p99']:6.2f}ms max={result['jitter_max']:6.2f}ms  drift={result['drift']:+8.1f}ms{extra}")
+
+
+def print_histogram(name, histogram):
+    cells = '  '.join(f"{label}:{count}" for label, count in histogram.buckets() if count)
+    print(f"    {name:7s} {cells}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='프레임 페이싱 벤치마크')
+    parser.add_argument('--fps', type=int, default=Config.STREAM_FPS, help='목표 출력 fps')
+    parser.add_argument('--seconds', type=float, default=5.0, help='시나리오별 측정 시간 (초)')
+    parser.add_argument('--size', default='1280x720', help='프레임 크기 (WxH)')
+    parser.add_argument('--histogram', action='store_true', help='페이서 jitter/drift 히스토그램 출력')
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.size.lower().split('x'))
+    scenarios = [
+        (f'fast camera ({args.fps * 1.5:g}fps)', lambda: SyntheticSource(width, height, args.fps * 1.5)),
+        (f'slow camera ({args.fps * 2 / 3:g}fps)', lambda: SyntheticSource(width, height, args.fps * 2 / 3)),
+        (f'bursty camera ({args.fps}fps x3)', lambda: BurstySource(width, height, args.fps)),
+    ]
+    print(f"target={args.fps}fps  {width}x{height}  {args.seconds:g}s per run")
+    for name, make_source in scenarios:
+        print(name)
+        report('before (no pacing)', run_unpaced(make_source(), args.fps, args.seconds, False), args.fps)
+        report('before (sleep loop)', run_unpaced(make_source(), args.fps, args.seconds, True), args.fps)
+        times, extra, pacer = run_paced(make_source(), args.fps, args.seconds)
+        report('after (pacer)', times, args.fps, extra)
+        if args.histogram:
+            print_histogram('jitter', pacer.jitter)
+            print_histogram('drift', pacer.drift)
+
+
+if __name__ == '__main__':
+    main()
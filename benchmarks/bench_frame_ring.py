@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""프레임 링 버퍼 벤치마크 (캡처 경로 할당/메모리 대역폭)
+
+- capture : cv2.VideoCapture로 테스트 영상(MJPG, 기본 1280x720) 디코딩
+            before: read()마다 새 배열 / after: read(image=슬롯)으로 링 버퍼 슬롯에 디코딩
+- synthetic: 카메라 없이 프레임 생성만 비교 (디코딩 비용 제외, 순수 할당/복사 비용)
+- process : 다른 프로세스의 인코더로 프레임 전달
+            before: multiprocessing.Queue로 ndarray 전송 (pickle + 파이프 복사)
+            after : 공유 메모리 FrameRing, 소비자 프로세스가 attach()하여 get/release로 슬롯을 주고받음
+
+지표: 초당 프레임, 초당 새 프레임 버퍼 수/할당량(MB/s), 초당 minor page fault, 프레임 데이터 처리량(MB/s)
+
+사용법: python benchmarks/bench_frame_ring.py [--frames 300] [--size 1280x720] [--slots 10]
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_ring import FrameRing, attach
+from stream_pipeline import SyntheticSource
+
+
+def minor_faults():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_minflt
+
+
+def report(label, frames, elapsed, new_buffers, faults, frame_bytes):
+    print(f"{label:28s} fps={frames / elapsed:8.1f}  new_buffers/s={new_buffers / elapsed:7.1f}  "
+          f"alloc={new_buffers * frame_bytes / elapsed / 1e6:8.1f}MB/s  faults/s={faults / elapsed:9.0f}  "
+          f"throughput={frames * frame_bytes / elapsed / 1e6:8.1f}MB/s")
+
+
+def make_video(path, frames, width, height):
+    """테스트용 MJPG 영상 생성"""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (width, height))
+    source = SyntheticSource(width, height, fps=1e9)
+    for _ in range(frames):
+        writer.write(source.read())
+    writer.release()
+
+
+def bench_capture(path, frames, shape, slots, use_ring):
+    capture = cv2.VideoCapture(path)
+    ring = FrameRing(slots, shape) if use_ring else None
+    new_buffers = 0
+    faults = minor_faults()
+    start = time.perf_counter()
+    for _ in range(frames):
+        if use_ring:
+            index, slot = ring.acquire()
+            ok, frame = capture.read(image=slot)
+            # 크기/형식이 맞지 않으면 OpenCV가 슬롯 대신 새 배열에 디코딩함
+            new_buffers += frame is not slot
+            ring.publish(index, time.monotonic())
+            # 소비자 역할: 바로 꺼내서 반납
+            index, _, _ = ring.get()
+            ring.release(index)
+        else:
+            ok, frame = capture.read()
+            new_buffers += 1
+        if not ok:
+            break
+    elapsed = time.perf_counter() - start
+    capture.release()
+    return elapsed, new_buffers, minor_faults() - faults
+
+
+def bench_synthetic(frames, shape, slots, use_ring):
+    height, width, _ = shape
+    source = SyntheticSource(width, height, fps=1e9)
+    ring = FrameRing(slots, shape) if use_ring else None
+    new_buffers = 0
+    faults = minor_faults()
+    start = time.perf_counter()
+    for _ in range(frames):
+        if use_ring:
+            index, slot = ring.acquire()
+            source.read(out=slot)
+            ring.publish(index, time.monotonic())
+            index, frame, _ = ring.get()
+            ring.release(index)
+        else:
+            frame = source.read()
+            new_buffers += 1
+    return time.perf_counter() - start, new_buffers, minor_faults() - faults
+
+
+def _queue_consumer(frames_queue, done):
+    # 인코더 프로세스 역할: 프레임을 받아 한 바이트씩 건드림
+    total = 0
+    while True:
+        frame = frames_queue.get()
+        if frame is None:
+            break
+        total += int(frame[0, 0, 0])
+    done.put(total)
+
+
+def _shm_consumer(handle, done):
+    # 링의 get/release 규약으로 슬롯을 받아 읽고 반납 (읽는 동안 생산자가 덮어쓰지 않음)
+    ring = attach(handle)
+    total = 0
+    while True:
+        item = ring.get()
+        if item is None:
+            break
+        index, frame, _ = item
+        total += int(frame[0, 0, 0])
+        ring.release(index)
+    del item, frame
+    ring.release_memory()
+    done.put(total)
+
+
+def bench_process(frames, shape, slots, use_ring):
+    height, width, _ = shape
+    source = SyntheticSource(width, height, fps=1e9)
+    context = multiprocessing.get_context('spawn')
+    new_buffers = 0
+    if not use_ring:
+        frames_queue, done = context.Queue(maxsize=slots), context.Queue()
+        consumer = context.Process(target=_queue_consumer, args=(frames_queue, done))
+        consumer.start()
+        faults = minor_faults()
+        start = time.perf_counter()
+        for _ in range(frames):
+            frames_queue.put(source.read())
+            new_buffers += 1
+        frames_queue.put(None)
+        done.get()
+    else:
+        ring = FrameRing(slots, shape, shared_memory=True, context=context)
+        done = context.Queue()
+        consumer = context.Process(target=_shm_consumer, args=(ring.handle(), done))
+        consumer.start()
+        faults = minor_faults()
+        start = time.perf_counter()
+        for _ in range(frames):
+            # mp.Queue(maxsize)와 같은 조건이 되도록 프레임을 버리지 않고 빈 슬롯을 기다림
+            index, slot = ring.acquire(overwrite=False)
+            source.read(out=slot)
+            ring.publish(index, time.monotonic())
+        ring.close()
+        done.get()
+    elapsed = time.perf_counter() - start
+    consumer.join()
+    if use_ring:
+        ring.release_memory()
+    return elapsed, new_buffers, minor_faults() - faults
+
+
+def main():
+    parser = argparse.ArgumentParser(description='프레임 링 버퍼 벤치마크')
+    parser.add_argument('--frames', type=int, default=300, help='프레임 수')
+    parser.add_argument('--size', default='1280x720', help='프레임 크기 (WxH)')
+    parser.add_argument('--slots', type=int, default=10, help='링 버퍼 슬롯 수')
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.size.lower().split('x'))
+    shape = (height, width, 3)
+    frame_bytes = height * width * 3
+    print(f"{width}x{height} frame={frame_bytes / 1e6:.2f}MB  frames={args.frames}  slots={args.slots}")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'capture.avi')
+        make_video(path, args.frames, width, height)
+        for use_ring in (False, True):
+            label = 'capture after (ring)' if use_ring else 'capture before (read())'
+            report(label, args.frames, *bench_capture(path, args.frames, shape, args.slots, use_ring), frame_bytes)
+
+    for use_ring in (False, True):
+        label = 'synthetic after (ring)' if use_ring else 'synthetic before (new array)'
+        report(label, args.frames, *bench_synthetic(args.frames, shape, args.slots, use_ring), frame_bytes)
+
+    for use_ring in (False, True):
+        label = 'process after (shm ring)' if use_ring else 'process before (mp.Queue)'
+        report(label, args.frames, *bench_process(args.frames, shape, args.slots, use_ring), frame_bytes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""HTTP 커넥션 재사용 벤치마크
+
+로컬 HTTP/1.1 서버를 띄워 요청당 새 TCP 연결(핸드셰이크) 수를 비교합니다.
+- before: 요청마다 requests.get 호출 (기존 방식)
+- after : 공유 세션을 사용하는 YouTubeVideoExtractor
+
+사용법: python benchmarks/bench_http_pool.py [--requests 200]
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_client import create_session
+from youtube_video_extractor import YouTubeVideoExtractor
+
+SEARCH_BODY = json.dumps({
+    'items': [{
+        'id': {'videoId': 'bench0001'},
+        'snippet': {
+            'title': 'bench', 'description': 'bench', 'channelTitle': 'bench',
+            'publishedAt': '2024-07-13T09:00:00Z', 'liveBroadcastContent': 'none',
+            'thumbnails': {'medium': {'url': 'http://localhost/thumb.jpg'}}
+        }
+    }]
+}).encode('utf-8')
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with CountingHandler.lock:
+            CountingHandler.connections += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(SEARCH_BODY)))
+        self.end_headers()
+        self.wfile.write(SEARCH_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(label, call, n):
+    CountingHandler.connections = 0
+    start = time.perf_counter()
+    for _ in range(n):
+        call()
+    elapsed = time.perf_counter() - start
+    conns = CountingHandler.connections
+    print(f"{label:<8} requests={n:<5} connections={conns:<5} "
+          f"handshakes/request={conns / n:.3f} avg_latency={elapsed / n * 1000:.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP 커넥션 풀 벤치마크')
+    parser.add_argument('--requests', type=int, default=200, help='요청 횟수')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CountingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/youtube/v3"
+
+    run('before', lambda: requests.get(f"{base_url}/search", params={'q': 'bench'}).json(), args.requests)
+
+    extractor = YouTubeVideoExtractor('bench-key', session=create_session(), base_url=base_url)
+    run('after', lambda: extractor.search_videos('bench'), args.requests)
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""진입점 import 시간 프로파일
+
+각 Streamlit 진입점을 새 인터프리터에서 `python -X importtime`으로 가져와 비교합니다.
+- total  : 인터프리터 시작부터 모듈 로드 완료까지 걸린 시간 (콜드 스타트, 중앙값)
+- module : streamlit을 먼저 로드한 뒤 진입점 모듈만 가져오는 데 걸린 시간
+           (`streamlit run`은 서버가 streamlit을 이미 로드한 상태에서 스크립트를 실행)
+- heavy  : 진입점이 끌어오는 무거운 패키지 (누적 시간 상위)
+
+사용법: python benchmarks/bench_import_time.py [--runs 5] [--top 5] [모듈 ...]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = (
+    'youtube_video_extractor',
+    'youtube_video_extractor_with_fallback',
+    'demo_youtube_extractor',
+    'youtube_live_streamer'
+)
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력을 (모듈명, 깊이, 누적 us) 목록으로 변환"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), depth, int(cumulative)))
+    return rows
+
+
+def profile(module):
+    """진입점 하나를 새 프로세스에서 가져와 (전체 ms, 모듈 ms, 하위 패키지별 ms) 반환"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import streamlit; import {module}'],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    total = (time.perf_counter() - start) * 1000
+
+    rows = parse_importtime(result.stderr)
+    # 출력은 하위 모듈이 먼저 나오므로, 최상위 진입점 줄 앞까지가 진입점이 가져온 모듈
+    end = next(index for index, (name, depth, _) in enumerate(rows) if name == module and depth == 0)
+    start_index = max((index + 1 for index, (_, depth, _) in enumerate(rows[:end]) if depth == 0), default=0)
+    module_ms = rows[end][2] / 1000
+    children = {name: cumulative / 1000 for name, depth, cumulative in rows[start_index:end] if depth == 1}
+    return total, module_ms, children
+
+
+def main():
+    parser = argparse.ArgumentParser(description='진입점 import 시간 프로파일')
+    parser.add_argument('modules', nargs='*', default=ENTRY_POINTS, help='측정할 모듈')
+    parser.add_argument('--runs', type=int, default=5, help='모듈별 반복 횟수 (중앙값 사용)')
+    parser.add_argument('--top', type=int, default=5, help='표시할 무거운 하위 패키지 수')
+    args = parser.parse_args()
+
+    for module in args.modules:
+        runs = [profile(module) for _ in range(args.runs)]
+        total = statistics.median(run[0] for run in runs)
+        module_ms = statistics.median(run[1] for run in runs)
+        children = runs[len(runs) // 2][2]
+        heavy = sorted(children.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        print(f"{module:40s} total={total:7.0f}ms  module={module_ms:6.0f}ms")
+        print('    heavy: ' + ', '.join(f"{name} {ms:.0f}ms" for name, ms in heavy))
+
+
+if __name__ == '__main__':
+    main()
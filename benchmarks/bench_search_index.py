@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""데모/샘플 검색 색인 벤치마크
+
+합성 레코드(synthetic_corpus, 기본 100,000개)에 대해 비교합니다.
+- before: 레코드마다 .lower() 후 부분 문자열 검색 (기존 search_demo_videos 방식)
+- after : SearchIndex (문자 2-gram + 한글/한자 글자 역색인, 구축 시간 별도 표시)
+
+측정 후 검색 결과가 맞는지 확인합니다 (검색어 n-gram이 여러 필드에 흩어진 레코드는 일치가 아님,
+일치한 레코드는 한 필드에 검색어를 그대로 포함). 틀리면 종료 코드 1로 끝납니다.
+
+사용법: python benchmarks/bench_search_index.py [--records 100000] [--queries 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex, tokenize
+from synthetic_corpus import generate_records
+
+
+def linear_search(records, keyword, max_results):
+    keyword = keyword.lower()
+    found = [video for video in records
+             if keyword in video['title'].lower() or keyword in video['description'].lower()]
+    return found[:max_results]
+
+
+def check_matches(index, queries):
+    """정확성 확인: 실패한 항목 설명 목록 (비어 있으면 통과)"""
+    failures = []
+    # '후지산'의 2-gram(후지, 지산)이 제목과 설명에 나뉘어 있을 뿐 검색어는 없는 레코드
+    cross_field = SearchIndex([{'title': '후지 여행', 'description': '지산 계곡'},
+                               {'title': '후지산 라이브', 'description': ''}])
+    if cross_field.search_ids('후지산', partial=False) != [1]:
+        failures.append("'후지산'이 필드에 나뉜 2-gram('후지 여행' / '지산 계곡')과 일치함")
+    for query in queries:
+        phrase = ' '.join(tokenize(query))
+        for record in index.search(query, partial=False):
+            if not any(phrase in ' '.join(tokenize(record.get(field))) for field, _ in index.fields):
+                failures.append(f"{query!r}: 검색어가 없는 레코드 {record['title']!r}")
+                break
+    return failures
+
+
+def timeit(search, queries):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return latencies[len(latencies) // 2] * 1000, latencies[int(len(latencies) * 0.95)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='검색 색인 벤치마크')
+    parser.add_argument('--records', type=int, default=100000, help='레코드 수')
+    parser.add_argument('--queries', type=int, default=200, help='검색 횟수')
+    parser.add_argument('--max-results', type=int, default=50, help='검색 결과 개수')
+    args = parser.parse_args()
+
+    records = list(generate_records(args.records))
+    # 합성 레코드의 제목 일부를 검색어로 사용 (한국어/일본어/영어 등 혼합)
+    queries = [records[i * 7919 % len(records)]['title'].lstrip('🔴 ').split(' ')[0] for i in range(args.queries)]
+
+    p50, p95 = timeit(lambda query: linear_search(records, query, args.max_results), queries[:20])
+    print(f"before  p50={p50:8.2f}ms  p95={p95:8.2f}ms  (linear scan, {len(records):,} records)")
+
+    start = time.perf_counter()
+    index = SearchIndex(records)
+    build = time.perf_counter() - start
+    p50, p95 = timeit(lambda query: index.search(query, args.max_results), queries)
+    print(f"after   p50={p50:8.2f}ms  p95={p95:8.2f}ms  (index build {build:.2f}s, {len(index._vocabulary):,} grams)")
+
+    failures = check_matches(index, queries[:20])
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ 검색 결과 확인 (필드에 나뉜 n-gram 제외, 일치 레코드는 검색어 포함)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""동시 전송 벤치마크 (주소 N개로 보낼 때 CPU 사용량과 느린 주소의 영향)
+
+로컬 FLV 파일을 RTMP 주소 대신 사용합니다 (실제 ffmpeg 필요).
+- before: 주소마다 FfmpegSink를 따로 두고 같은 프레임을 각각 인코딩 (주소 수만큼 libx264)
+- after : SimulcastSink, 한 번 인코딩한 FLV 태그를 주소별 ffmpeg -c copy로 전달
+
+--stuck 을 주면 마지막 주소를 읽지 않는 FIFO로 바꿔 응답 없는 서버를 재현합니다.
+before는 그 주소의 쓰기가 막히면서 파이프라인 전체가 멈추고, after는 그 주소만 재연결을 반복합니다.
+
+지표: 인코딩 fps, 버린 프레임, CPU(코어, 자식 ffmpeg 포함), 주소별 전송 크기
+
+사용법: python benchmarks/bench_simulcast.py [--destinations 3] [--seconds 10] [--size 1280x720]
+        [--ffmpeg ffmpeg] [--stuck]
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from simulcast import SimulcastSink
+from stream_pipeline import FfmpegSink, StreamPipeline, SyntheticSource
+
+
+class FanoutSink:
+    """같은 프레임을 여러 싱크에 차례로 기록 (주소별 인코딩)"""
+
+    def __init__(self, sinks):
+        self.sinks = sinks
+
+    def open(self):
+        for sink in self.sinks:
+            sink.open()
+
+    def write(self, frame):
+        for sink in self.sinks:
+            sink.write(frame)
+
+    def set_quality(self, level):
+        for sink in self.sinks:
+            sink.set_quality(level)
+
+    def close(self, timeout=5):
+        for sink in self.sinks:
+            sink.close(timeout)
+
+    def error_output(self):
+        return '\n'.join(filter(None, (sink.error_output() for sink in self.sinks)))
+
+
+def cpu_seconds():
+    """이 프로세스와 종료된 자식 프로세스의 CPU 시간 합 (초)"""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def file_size(path):
+    return os.path.getsize(path) if os.path.isfile(path) else 0
+
+
+def run(label, sink, outputs, args, width, height, release):
+    pipeline = StreamPipeline(SyntheticSource(width, height, args.fps), sink, fps=args.fps)
+    cpu_before = cpu_seconds()
+    pipeline.start()
+    time.sleep(args.seconds)
+    health = sink.health() if isinstance(sink, SimulcastSink) else None
+    pipeline.stop()
+    # 막힌 주소를 풀어 줘야 쓰기에서 멈춘 인코더 스레드가 싱크를 닫고 끝남 (ffmpeg CPU 시간도 그때 집계됨)
+    release()
+    pipeline.join()
+    cpu = cpu_seconds() - cpu_before
+    stats = pipeline.stats()
+
+    print(f"{label}")
+    print(f"  encoded={stats['frames_encoded'] / args.seconds:5.1f}fps  dropped={stats['frames_dropped']}  "
+          f"cpu={cpu / args.seconds:.2f} cores")
+    for index, (name, path) in enumerate(outputs):
+        line = f"    {name:8s} {file_size(path) / 1024:8.0f}KB"
+        if health:
+            item = health[index]
+            line += (f"  state={item['state']:10s} reconnects={item['reconnects']} "
+                     f"dropped_gops={item['dropped_gops']}")
+        print(line)
+    if stats['error']:
+        print(f"  error: {stats['error'].splitlines()[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='동시 전송 벤치마크')
+    parser.add_argument('--destinations', type=int, default=3, help='전송 주소 수')
+    parser.add_argument('--seconds', type=float, default=10.0, help='방식별 측정 시간 (초)')
+    parser.add_argument('--size', default='1280x720', help='프레임 크기 (WxH)')
+    parser.add_argument('--fps', type=int, default=Config.STREAM_FPS, help='캡처/출력 fps')
+    parser.add_argument('--preset', default=Config.STREAM_PRESET, help='x264 preset')
+    parser.add_argument('--ffmpeg', default=Config.FFMPEG_PATH, help='ffmpeg 실행 파일 경로')
+    parser.add_argument('--stuck', action='store_true', help='마지막 주소를 읽지 않는 FIFO로 (응답 없는 서버)')
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.size.lower().split('x'))
+    print(f"{args.destinations} destinations  {width}x{height}@{args.fps}  preset={args.preset}  "
+          f"{args.seconds:g}s per run{'  (last destination stuck)' if args.stuck else ''}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in ('before', 'after'):
+            outputs = [(f'dest-{index + 1}', os.path.join(directory, f'{mode}-{index + 1}.flv'))
+                       for index in range(args.destinations)]
+            stuck_fds = []
+            if args.stuck:
+                path = outputs[-1][1]
+                os.mkfifo(path)
+                # 읽는 쪽을 열어만 두어 ffmpeg가 출력을 연 뒤 쓰기에서 멈추게 함
+                stuck_fds.append(os.open(path, os.O_RDONLY | os.O_NONBLOCK))
+
+            def release():
+                # 읽는 쪽을 닫으면 FIFO에 쓰던 ffmpeg가 Broken pipe로 종료
+                while stuck_fds:
+                    os.close(stuck_fds.pop())
+
+            try:
+                if mode == 'before':
+                    sink = FanoutSink([FfmpegSink(path, width, height, args.fps, preset=args.preset,
+                                                  ffmpeg=args.ffmpeg) for _, path in outputs])
+                    run('before (encode per destination)', sink, outputs, args, width, height, release)
+                else:
+                    sink = SimulcastSink(outputs, width, height, args.fps, preset=args.preset, ffmpeg=args.ffmpeg)
+                    run('after (encode once, relay -c copy)', sink, outputs, args, width, height, release)
+            finally:
+                release()
+
+
+if __name__ == '__main__':
+    main()
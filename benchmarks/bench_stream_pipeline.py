@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""스트리밍 파이프라인 벤치마크 (캡처 -> 제한 큐 -> 인코더 -> 싱크)
+
+카메라 대신 SyntheticSource로 지정한 fps의 프레임을 만들고, 지속 fps와
+프레임별 지연(캡처 시각 -> 싱크 기록 완료), 버린 프레임 수를 측정합니다.
+- raw   : ffmpeg 없이 원시 프레임을 파일에 기록 (기본)
+- file  : ffmpeg로 H.264/FLV 파일에 인코딩
+- rtmp  : 로컬 ffmpeg RTMP 수신 서버(-listen 1)를 띄워 실제 RTMP 전송 경로로 측정
+
+사용법: python benchmarks/bench_stream_pipeline.py [--sink raw|file|rtmp] [--frames 300] [--fps 30] [--size 1280x720]
+        [--sink-delay 0.05]  # 싱크마다 지연을 넣어 인코더가 느릴 때 큐 동작 확인
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from stream_pipeline import FfmpegSink, RawFileSink, StreamPipeline, SyntheticSource
+
+RTMP_STAND_IN_URL = 'rtmp://127.0.0.1:19350/live/bench'
+
+
+class SlowSink:
+    """프레임마다 지연을 추가하는 싱크 래퍼 (느린 인코더/네트워크 재현)"""
+
+    def __init__(self, sink, delay):
+        self.sink = sink
+        self.delay = delay
+
+    def open(self):
+        self.sink.open()
+
+    def write(self, frame):
+        time.sleep(self.delay)
+        self.sink.write(frame)
+
+    def close(self, timeout=5):
+        self.sink.close(timeout)
+
+    def error_output(self):
+        return self.sink.error_output()
+
+
+def start_rtmp_stand_in(ffmpeg):
+    """수신한 RTMP 스트림을 버리는 로컬 ffmpeg 서버"""
+    process = subprocess.Popen(
+        [ffmpeg, '-hide_banner', '-loglevel', 'error', '-listen', '1', '-i', RTMP_STAND_IN_URL, '-c', 'copy', '-f', 'null', '-'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    # 서버가 포트를 열 때까지 잠시 대기
+    time.sleep(1.0)
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description='스트리밍 파이프라인 벤치마크')
+    parser.add_argument('--sink', choices=['raw', 'file', 'rtmp'], default='raw', help='프레임 싱크')
+    parser.add_argument('--frames', type=int, default=300, help='전송할 프레임 수')
+    parser.add_argument('--fps', type=int, default=Config.STREAM_FPS, help='캡처 fps')
+    parser.add_argument('--size', default=f'{Config.CAMERA_WIDTH}x{Config.CAMERA_HEIGHT}', help='프레임 크기 (WxH)')
+    parser.add_argument('--bitrate', type=int, default=int(Config.STREAM_BITRATE), help='비디오 비트레이트 (kbps)')
+    parser.add_argument('--queue-size', type=int, default=Config.STREAM_QUEUE_SIZE, help='프레임 큐 크기')
+    parser.add_argument('--sink-delay', type=float, default=0.0, help='프레임마다 추가할 싱크 지연 (초)')
+    parser.add_argument('--ffmpeg', default=Config.FFMPEG_PATH, help='ffmpeg 실행 파일')
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.size.lower().split('x'))
+    if args.sink != 'raw' and shutil.which(args.ffmpeg) is None:
+        parser.error(f'ffmpeg를 찾을 수 없습니다: {args.ffmpeg}')
+
+    stand_in = None
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if args.sink == 'raw':
+            sink = RawFileSink(os.path.join(tmpdir, 'frames.bgr'))
+        elif args.sink == 'file':
+            sink = FfmpegSink(os.path.join(tmpdir, 'stream.flv'), width, height, args.fps, args.bitrate, ffmpeg=args.ffmpeg)
+        else:
+            stand_in = start_rtmp_stand_in(args.ffmpeg)
+            sink = FfmpegSink(RTMP_STAND_IN_URL, width, height, args.fps, args.bitrate, ffmpeg=args.ffmpeg)
+        if args.sink_delay:
+            sink = SlowSink(sink, args.sink_delay)
+
+        pipeline = StreamPipeline(SyntheticSource(width, height, args.fps), sink,
+                                  queue_size=args.queue_size, max_frames=args.frames, fps=args.fps)
+        try:
+            pipeline.start()
+            pipeline.join()
+        finally:
+            pipeline.stop()
+            if stand_in is not None:
+                stand_in.terminate()
+                stand_in.wait()
+
+    stats = pipeline.stats()
+    print(f"sink={args.sink}  {width}x{height}@{args.fps}  queue={args.queue_size}  sink_delay={args.sink_delay}s")
+    print(f"fps={stats['fps']:6.2f}  encoded={stats['frames_encoded']}  dropped={stats['frames_dropped']}  "
+          f"skipped={stats['frames_skipped']}  repeated={stats['frames_repeated']}  "
+          f"latency p50={stats['latency_p50_ms']:.1f}ms p95={stats['latency_p95_ms']:.1f}ms p99={stats['latency_p99_ms']:.1f}ms")
+    if stats['error']:
+        print(f"error: {stats['error']}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""섬네일 캐시 벤치마크
+
+로컬 HTTP 서버(응답 지연 설정 가능)에서 섬네일 50개(기본 1280x720)를 제공하고 비교합니다.
+- before: 카드마다 원본 이미지를 순차로 받는 경우 (전송량 포함)
+- cold  : ThumbnailCache.fetch_many 동시 다운로드 + 리사이즈 + 디스크 저장
+- warm  : 디스크 캐시에서 로드
+- render: Streamlit AppTest로 50개 카드 그리드 렌더링 시간 (URL vs 로컬 바이트)
+
+사용법: python benchmarks/bench_thumbnails.py [--count 50] [--delay 0.05] [--size 1280x720]
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from thumbnail_cache import ThumbnailCache
+
+
+def make_jpeg(width=1280, height=720):
+    image = Image.new('RGB', (width, height))
+    pixels = image.load()
+    for x in range(0, width, 4):
+        for y in range(0, height, 4):
+            pixels[x, y] = (x % 256, y % 256, (x + y) % 256)
+    output = io.BytesIO()
+    image.save(output, format='JPEG', quality=90)
+    return output.getvalue()
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    body = b''
+    delay = 0.0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def render_grid(images):
+    """Streamlit AppTest로 3열 그리드 렌더링 시간 측정"""
+    from streamlit.testing.v1 import AppTest
+
+    def app():
+        import streamlit as st
+        cols = st.columns(3)
+        for idx, image in enumerate(st.session_state.images):
+            with cols[idx % 3]:
+                st.image(image)
+                st.markdown(f"**video {idx}**")
+                st.caption('📺 channel')
+                st.divider()
+
+    at = AppTest.from_function(app)
+    at.session_state.images = images
+    start = time.perf_counter()
+    at.run(timeout=60)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='섬네일 캐시 벤치마크')
+    parser.add_argument('--count', type=int, default=50, help='섬네일 수')
+    parser.add_argument('--delay', type=float, default=0.05, help='이미지 응답 지연 (초)')
+    parser.add_argument('--size', default='1280x720', help='원본 이미지 크기 (WxH)')
+    args = parser.parse_args()
+
+    ImageHandler.body = make_jpeg(*map(int, args.size.split('x')))
+    ImageHandler.delay = args.delay
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ImageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/vi/{i}/maxres.jpg" for i in range(args.count)]
+
+    session = requests.Session()
+    start = time.perf_counter()
+    original_bytes = sum(len(session.get(url).content) for url in urls)
+    print(f"before  fetch={time.perf_counter() - start:.3f}s  bytes={original_bytes:,}")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ThumbnailCache(cache_dir=cache_dir, session=session)
+        start = time.perf_counter()
+        thumbnails = cache.fetch_many(urls)
+        cold = time.perf_counter() - start
+        resized_bytes = sum(len(data) for data in thumbnails.values())
+        print(f"cold    fetch={cold:.3f}s  bytes={resized_bytes:,} (width={cache.width})")
+
+        cache = ThumbnailCache(cache_dir=cache_dir, session=session)
+        start = time.perf_counter()
+        thumbnails = cache.fetch_many(urls)
+        print(f"warm    fetch={time.perf_counter() - start:.3f}s")
+
+        print(f"render  urls={render_grid(urls):.3f}s  "
+              f"local_bytes={render_grid([thumbnails[url] for url in urls]):.3f}s")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""검색 응답 크기 및 결과 메모리 벤치마크
+
+- 응답 크기: 전체 snippet 응답 vs fields= 부분 응답 (1,000건 기준)
+- 메모리: 영상별 딕셔너리(기존) vs VideoRecord(__slots__) 1,000건
+
+사용법: python benchmarks/bench_video_record.py [--count 1000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_record import VideoRecord
+
+
+def full_item(i):
+    """search.list part=snippet 전체 응답 항목 (fields 미지정)"""
+    video_id = f"vid{i:08d}"
+    thumbnail = 'https://i.ytimg.com/vi/{}/{}.jpg'
+    return {
+        'kind': 'youtube#searchResult',
+        'etag': f"etag-{i:032d}",
+        'id': {'kind': 'youtube#video', 'videoId': video_id},
+        'snippet': {
+            'publishedAt': '2024-07-13T09:00:00Z',
+            'channelId': f"UC{i:022d}",
+            'title': f"🔴 LIVE: 후지산 실시간 라이브 캠 - Mount Fuji Live Camera #{i}",
+            'description': '후지산의 아름다운 실시간 모습을 24시간 생중계합니다. ' * 3,
+            'thumbnails': {
+                'default': {'url': thumbnail.format(video_id, 'default'), 'width': 120, 'height': 90},
+                'medium': {'url': thumbnail.format(video_id, 'mqdefault'), 'width': 320, 'height': 180},
+                'high': {'url': thumbnail.format(video_id, 'hqdefault'), 'width': 480, 'height': 360}
+            },
+            'channelTitle': 'Fujisan Live Cam',
+            'liveBroadcastContent': 'live' if i % 3 == 0 else 'none',
+            'publishTime': '2024-07-13T09:00:00Z'
+        }
+    }
+
+
+def projected_item(item):
+    """SEARCH_FIELDS 마스크를 적용한 부분 응답 항목"""
+    snippet = item['snippet']
+    return {
+        'id': {'videoId': item['id']['videoId']},
+        'snippet': {
+            'publishedAt': snippet['publishedAt'],
+            'title': snippet['title'],
+            'description': snippet['description'],
+            'thumbnails': {'medium': {'url': snippet['thumbnails']['medium']['url']}},
+            'channelTitle': snippet['channelTitle'],
+            'liveBroadcastContent': snippet['liveBroadcastContent']
+        }
+    }
+
+
+def dict_record(item):
+    """기존 방식의 영상별 딕셔너리"""
+    live_status = '🔴 LIVE' if item['snippet'].get('liveBroadcastContent') == 'live' else '📹 영상'
+    return {
+        'video_id': item['id']['videoId'],
+        'title': item['snippet']['title'],
+        'description': item['snippet']['description'][:200] + '...' if len(item['snippet']['description']) > 200 else item['snippet']['description'],
+        'channel_title': item['snippet']['channelTitle'],
+        'published_at': item['snippet']['publishedAt'],
+        'thumbnail_url': item['snippet']['thumbnails']['medium']['url'],
+        'video_url': f"https://www.youtube.com/watch?v={item['id']['videoId']}",
+        'live_status': live_status,
+        'is_live': item['snippet'].get('liveBroadcastContent') == 'live'
+    }
+
+
+def measure(build, items):
+    """레코드 생성 후 유지되는 메모리 (bytes)"""
+    tracemalloc.start()
+    records = [build(item) for item in items]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, records
+
+
+def main():
+    parser = argparse.ArgumentParser(description='VideoRecord 벤치마크')
+    parser.add_argument('--count', type=int, default=1000, help='결과 수')
+    args = parser.parse_args()
+
+    # 응답 본문은 JSON 문자열로 받은 뒤 파싱되므로 파싱 결과로 비교
+    full_body = json.dumps({'items': [full_item(i) for i in range(args.count)]})
+    projected_body = json.dumps({'items': [projected_item(full_item(i)) for i in range(args.count)]})
+    print(f"response  full={len(full_body):>9,}B  fields={len(projected_body):>9,}B  "
+          f"({(1 - len(projected_body) / len(full_body)) * 100:.1f}% smaller)")
+
+    items = json.loads(projected_body)['items']
+    dict_bytes, _ = measure(dict_record, items)
+    record_bytes, _ = measure(VideoRecord.from_search_item, items)
+    print(f"memory    dict={dict_bytes:>9,}B  VideoRecord={record_bytes:>9,}B  "
+          f"({(1 - record_bytes / dict_bytes) * 100:.1f}% smaller, per {args.count} results)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""로컬 모의 YouTube Data API 서버
+
+할당량을 쓰지 않고 추출기의 처리량/지연을 측정하기 위한 대역 서버입니다.
+- /youtube/v3/search : 키워드/국가별로 항상 같은 결과, pageToken 페이지네이션
+- /youtube/v3/videos : id 목록의 통계 정보
+- /vi/<id>/mqdefault.jpg : 섬네일 이미지
+응답 지연, 오류 비율(400/403/5xx), 전체 결과 수, 설명 길이를 설정할 수 있습니다.
+
+사용법:
+    python benchmarks/mock_youtube_api.py --port 8765 --latency 0.05 --error-rate 503=0.01
+    YOUTUBE_API_BASE_URL=http://127.0.0.1:8765/youtube/v3 streamlit run youtube_video_extractor.py
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ERROR_BODIES = {
+    400: {'code': 400, 'message': 'Invalid value', 'errors': [{'reason': 'invalid'}]},
+    403: {'code': 403, 'message': 'Quota exceeded', 'errors': [{'reason': 'quotaExceeded'}]},
+    429: {'code': 429, 'message': 'Rate limit exceeded', 'errors': [{'reason': 'rateLimitExceeded'}]},
+    500: {'code': 500, 'message': 'Backend error', 'errors': [{'reason': 'backendError'}]},
+    503: {'code': 503, 'message': 'Service unavailable', 'errors': [{'reason': 'backendError'}]}
+}
+
+
+def make_thumbnail(width=320, height=180):
+    """단색 JPEG 섬네일 (Pillow가 없으면 빈 바이트)"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return b''
+    output = io.BytesIO()
+    Image.new('RGB', (width, height), (200, 30, 30)).save(output, format='JPEG', quality=80)
+    return output.getvalue()
+
+
+class MockSettings:
+    """모의 서버 동작 설정 (실행 중에도 변경 가능)"""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rates=None, total_results=500,
+                 description_length=200, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rates = dict(error_rates or {})  # 상태 코드 -> 비율
+        self.total_results = total_results
+        self.description_length = description_length
+        self.random = random.Random(seed)
+        self.requests = Counter()  # 엔드포인트별 요청 수
+        self.lock = threading.Lock()
+
+
+class MockYouTubeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    @property
+    def settings(self):
+        return self.server.settings
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        endpoint = parts.path.rstrip('/').rsplit('/', 1)[-1]
+        settings = self.settings
+
+        with settings.lock:
+            settings.requests[endpoint] += 1
+            delay = settings.latency + settings.random.uniform(0, settings.jitter)
+            error_code = self._pick_error(settings)
+        if delay:
+            time.sleep(delay)
+
+        if parts.path.startswith('/vi/'):
+            return self._send(200, self.server.thumbnail, 'image/jpeg')
+        if error_code is not None:
+            return self._send_json(error_code, {'error': ERROR_BODIES.get(error_code, {'code': error_code})})
+        if parts.path == '/youtube/v3/search':
+            return self._send_json(200, self._search(params))
+        if parts.path == '/youtube/v3/videos':
+            return self._send_json(200, self._videos(params))
+        return self._send_json(404, {'error': {'code': 404, 'message': 'Not found'}})
+
+    def _pick_error(self, settings):
+        roll = settings.random.random()
+        for code, rate in settings.error_rates.items():
+            if roll < rate:
+                return code
+            roll -= rate
+        return None
+
+    def _search(self, params):
+        settings = self.settings
+        query = params.get('q', '')
+        region = params.get('regionCode', 'KR')
+        live_only = params.get('eventType') == 'live'
+        page_size = min(int(params.get('maxResults', 5)), 50)
+        offset = int(params.get('pageToken') or 0)
+        end = min(offset + page_size, settings.total_results)
+        thumbnail_base = f"http://{self.headers.get('Host')}/vi"
+
+        items = []
+        for index in range(offset, end):
+            video_id = hashlib.md5(f"{query}|{region}|{index}".encode('utf-8')).hexdigest()[:11]
+            items.append({
+                'id': {'videoId': video_id},
+                'snippet': {
+                    'title': f"{query} 영상 {index + 1} ({region})",
+                    'description': ('모의 설명 ' * settings.description_length)[:settings.description_length],
+                    'channelTitle': f"채널 {index % 17}",
+                    'publishedAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(1720000000 - index * 3600)),
+                    'liveBroadcastContent': 'live' if live_only or index % 5 == 0 else 'none',
+                    'thumbnails': {'medium': {'url': f"{thumbnail_base}/{video_id}/mqdefault.jpg"}}
+                }
+            })
+
+        body = {'items': items, 'pageInfo': {'totalResults': settings.total_results, 'resultsPerPage': page_size}}
+        if end < settings.total_results:
+            body['nextPageToken'] = str(end)
+        return body
+
+    def _videos(self, params):
+        items = []
+        for video_id in filter(None, params.get('id', '').split(',')):
+            seed = int(hashlib.md5(video_id.encode('utf-8')).hexdigest()[:8], 16)
+            items.append({
+                'id': video_id,
+                'statistics': {
+                    'viewCount': str(seed % 10000000),
+                    'likeCount': str(seed % 100000),
+                    'commentCount': str(seed % 5000)
+                }
+            })
+        return {'items': items}
+
+    def _send_json(self, status, body):
+        self._send(status, json.dumps(body, ensure_ascii=False).encode('utf-8'), 'application/json; charset=UTF-8')
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_server(host='127.0.0.1', port=0, **settings):
+    """백그라운드 스레드에서 모의 서버 시작 후 (서버, API base_url) 반환"""
+    server = ThreadingHTTPServer((host, port), MockYouTubeHandler)
+    server.daemon_threads = True
+    server.settings = MockSettings(**settings)
+    server.thumbnail = make_thumbnail()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/youtube/v3"
+
+
+def parse_error_rates(values):
+    """['503=0.01', '403=0.001'] -> {503: 0.01, 403: 0.001}"""
+    rates = {}
+    for value in values or []:
+        code, rate = value.split('=')
+        rates[int(code)] = float(rate)
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description='모의 YouTube Data API 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='응답 지연 (초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='추가 무작위 지연 최대값 (초)')
+    parser.add_argument('--error-rate', action='append', metavar='CODE=RATE',
+                        help='오류 응답 비율 (예: 503=0.01, 여러 번 지정 가능)')
+    parser.add_argument('--total-results', type=int, default=500, help='검색어당 전체 결과 수')
+    parser.add_argument('--description-length', type=int, default=200, help='설명 길이 (응답 크기 조절)')
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(
+        args.host, args.port, latency=args.latency, jitter=args.jitter,
+        error_rates=parse_error_rates(args.error_rate), total_results=args.total_results,
+        description_length=args.description_length
+    )
+    print(f"🧪 모의 API 서버 실행 중: YOUTUBE_API_BASE_URL={base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+import threading
+import time
+
+from config import Config
+
+# 회로 상태
+STATE_CLOSED = 'closed'        # 정상: 요청 허용
+STATE_OPEN = 'open'            # 차단: 대기 시간 동안 요청 거부
+STATE_HALF_OPEN = 'half_open'  # 시험: 한 건만 허용하여 복구 여부 확인
+
+
+class CircuitBreaker:
+    """실제 API 호출 결과로 상태를 학습하는 서킷 브레이커 (스레드 안전)
+
+    - 연속 실패가 failure_threshold 회 이상이면 열림
+    - 할당량 초과(403) 같은 치명적 실패는 즉시 열림
+    - cooldown 초가 지나면 반열림 상태로 한 건을 시험하고, 성공하면 닫힘
+    """
+
+    def __init__(self, failure_threshold=None, cooldown=None, clock=time.monotonic):
+        self.failure_threshold = failure_threshold or Config.BREAKER_FAILURE_THRESHOLD
+        self.cooldown = cooldown or Config.BREAKER_COOLDOWN
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_started_at = None
+
+    @property
+    def state(self):
+        with self._lock:
+            self._update_state()
+            return self._state
+
+    def allow_request(self):
+        """지금 API를 호출해도 되는지 확인 (반열림 상태에서는 시험 요청 한 건만 허용)"""
+        with self._lock:
+            self._update_state()
+            if self._state == STATE_CLOSED:
+                return True
+            if self._state == STATE_OPEN:
+                return False
+            # 시험 요청이 결과 없이 오래 걸리면 새 시험 요청 허용
+            now = self._clock()
+            if self._trial_started_at is None or now - self._trial_started_at >= self.cooldown:
+                self._trial_started_at = now
+                return True
+            return False
+
+    def record_success(self):
+        """호출 성공 기록"""
+        with self._lock:
+            self._state = STATE_CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._trial_started_at = None
+
+    def record_failure(self, fatal=False):
+        """호출 실패 기록 (fatal=True 이면 즉시 차단)"""
+        with self._lock:
+            self._failures += 1
+            self._trial_started_at = None
+            if fatal or self._state == STATE_HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = STATE_OPEN
+                self._opened_at = self._clock()
+
+    def stats(self):
+        """현재 상태 및 연속 실패 횟수"""
+        with self._lock:
+            self._update_state()
+            return {'state': self._state, 'consecutive_failures': self._failures}
+
+    def _update_state(self):
+        if self._state == STATE_OPEN and self._clock() - self._opened_at >= self.cooldown:
+            self._state = STATE_HALF_OPEN
+            self._trial_started_at = None
+
+
+# API 키별 공유 브레이커 (여러 세션의 실제 호출 결과를 함께 반영)
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name):
+    """이름(API 키 등)별로 공유되는 서킷 브레이커 반환"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker()
+        return breaker
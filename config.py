@@ -9,11 +9,19 @@ class Config:
     YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY', '')
     YOUTUBE_CLIENT_ID = os.getenv('YOUTUBE_CLIENT_ID', '')
     YOUTUBE_CLIENT_SECRET = os.getenv('YOUTUBE_CLIENT_SECRET', '')
+    YOUTUBE_API_BASE_URL = os.getenv('YOUTUBE_API_BASE_URL', 'https://www.googleapis.com/youtube/v3')
     
     # 스트리밍 설정
     STREAM_QUALITY = os.getenv('STREAM_QUALITY', '720p')
     STREAM_BITRATE = os.getenv('STREAM_BITRATE', '2500')
     STREAM_FPS = int(os.getenv('STREAM_FPS', '30'))
+    STREAM_PRESET = os.getenv('STREAM_PRESET', 'veryfast')
+    # 캡처-인코더 사이 프레임 큐 크기 (가득 차면 오래된 프레임부터 버림)
+    STREAM_QUEUE_SIZE = int(os.getenv('STREAM_QUEUE_SIZE', '8'))
+    FFMPEG_PATH = os.getenv('FFMPEG_PATH', 'ffmpeg')
+    # 전송 상태에 따라 화질 단계(STREAM_QUALITY 이하)를 자동 조절, 판단 간격(초)
+    STREAM_ADAPTIVE = os.getenv('STREAM_ADAPTIVE', 'True').lower() == 'true'
+    STREAM_ADAPT_INTERVAL = float(os.getenv('STREAM_ADAPT_INTERVAL', '1.0'))
     
     # 카메라 설정
     CAMERA_INDEX = int(os.getenv('CAMERA_INDEX', '0'))
@@ -24,13 +32,86 @@ class Config:
     DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     
+    # HTTP 커넥션 풀 설정
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '4'))
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '20'))
+    HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '10'))
+    # 연결 오류/5xx 응답 자동 재시도 횟수와 대기 시간 (초, 재시도마다 두 배)
+    HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '2'))
+    HTTP_RETRY_BACKOFF = float(os.getenv('HTTP_RETRY_BACKOFF', '0.5'))
+
+    # 여러 국가 동시 검색 최대 동시 요청 수
+    FANOUT_MAX_WORKERS = int(os.getenv('FANOUT_MAX_WORKERS', '5'))
+
+    # API 할당량 설정
+    QUOTA_DAILY_UNITS = int(os.getenv('QUOTA_DAILY_UNITS', '10000'))
+    QUOTA_RESERVE_UNITS = int(os.getenv('QUOTA_RESERVE_UNITS', '1000'))
+    QUOTA_RATE_PER_SEC = float(os.getenv('QUOTA_RATE_PER_SEC', '5'))
+    QUOTA_BURST = int(os.getenv('QUOTA_BURST', '10'))
+
+    # 서킷 브레이커 설정 (연속 실패 횟수, 차단 후 재시도까지 대기 초)
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv('BREAKER_FAILURE_THRESHOLD', '3'))
+    BREAKER_COOLDOWN = float(os.getenv('BREAKER_COOLDOWN', '60'))
+
+    # 응답 캐시 설정 (TTL 단위: 초)
+    CACHE_MAX_BYTES = int(os.getenv('CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+    CACHE_TTL_LIVE = int(os.getenv('CACHE_TTL_LIVE', '60'))
+    CACHE_TTL_UPLOADED = int(os.getenv('CACHE_TTL_UPLOADED', '3600'))
+    CACHE_TTL_SEARCH = int(os.getenv('CACHE_TTL_SEARCH', '600'))
+    CACHE_TTL_STATS = int(os.getenv('CACHE_TTL_STATS', '120'))
+
+    # 섬네일 캐시 설정
+    THUMBNAIL_CACHE_DIR = os.getenv('THUMBNAIL_CACHE_DIR', os.path.join('.cache', 'thumbnails'))
+    THUMBNAIL_CACHE_MAX_BYTES = int(os.getenv('THUMBNAIL_CACHE_MAX_BYTES', str(200 * 1024 * 1024)))
+    THUMBNAIL_WIDTH = int(os.getenv('THUMBNAIL_WIDTH', '480'))
+    THUMBNAIL_WORKERS = int(os.getenv('THUMBNAIL_WORKERS', '8'))
+    THUMBNAIL_TIMEOUT = float(os.getenv('THUMBNAIL_TIMEOUT', '3'))
+
+    # 결과 그리드 설정 (한 페이지에 표시할 카드 수, 3열 배수 권장)
+    RESULTS_PAGE_SIZE = int(os.getenv('RESULTS_PAGE_SIZE', '12'))
+
+    # 데모 데이터 설정 (합성 데이터 파일 경로 또는 생성할 레코드 수, 비우면 기본 샘플 사용)
+    DEMO_CORPUS_PATH = os.getenv('DEMO_CORPUS_PATH', '')
+    DEMO_CORPUS_SIZE = int(os.getenv('DEMO_CORPUS_SIZE', '0'))
+
+    # API 지표 설정 (Prometheus /metrics 포트, 0이면 비활성화)
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+
     # RTMP 설정
     RTMP_URL = 'rtmp://a.rtmp.youtube.com/live2/'
+    # YouTube 백업 수집 서버 (같은 스트림 키 사용)
+    RTMP_BACKUP_URL = 'rtmp://b.rtmp.youtube.com/live2?backup=1/'
+    
+    # 동시 전송 설정: 백업 서버 전송 여부, 추가 주소 (이름=rtmp://주소/키, 쉼표로 구분)
+    STREAM_BACKUP_INGEST = os.getenv('STREAM_BACKUP_INGEST', 'False').lower() == 'true'
+    STREAM_EXTRA_DESTINATIONS = os.getenv('STREAM_EXTRA_DESTINATIONS', '')
+    # 주소별 전송 버퍼(초, 넘으면 오래된 GOP부터 버림)와 재연결 최대 대기(초)
+    STREAM_RELAY_BUFFER = float(os.getenv('STREAM_RELAY_BUFFER', '4'))
+    STREAM_RECONNECT_MAX_DELAY = float(os.getenv('STREAM_RECONNECT_MAX_DELAY', '30'))
+    
+    @classmethod
+    def get_rtmp_url(cls, stream_key, backup=False):
+        """RTMP URL 생성 (backup이면 YouTube 백업 수집 서버)"""
+        return f"{cls.RTMP_BACKUP_URL if backup else cls.RTMP_URL}{stream_key}"
     
     @classmethod
-    def get_rtmp_url(cls, stream_key):
-        """RTMP URL 생성"""
-        return f"{cls.RTMP_URL}{stream_key}"
+    def get_stream_destinations(cls, stream_key, backup=None, extra=None):
+        """동시 전송할 [(이름, RTMP URL), ...] (YouTube 기본 + 백업 서버 + 추가 주소)"""
+        backup = cls.STREAM_BACKUP_INGEST if backup is None else backup
+        extra = cls.STREAM_EXTRA_DESTINATIONS if extra is None else extra
+        destinations = [('youtube', cls.get_rtmp_url(stream_key))]
+        if backup:
+            destinations.append(('youtube-backup', cls.get_rtmp_url(stream_key, backup=True)))
+        for index, item in enumerate(part.strip() for part in extra.split(',')):
+            if not item:
+                continue
+            name, separator, url = item.partition('=')
+            # 이름 없이 주소만 적은 경우
+            if not separator or '://' in name:
+                name, url = f'extra-{index + 1}', item
+            destinations.append((name.strip(), url.strip()))
+        return destinations
     
     @classmethod
     def validate_config(cls):
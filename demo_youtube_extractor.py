@@ -1,7 +1,10 @@
 import streamlit as st
 import json
 from datetime import datetime
-import random
+from config import Config
+from results_grid import render_results_grid
+from synthetic_corpus import generate_records, load_corpus
+from youtube_core import COUNTRY_CODES, format_number
 
 # 데모 데이터 (실제 API 대신 사용)
 DEMO_VIDEOS = [
@@ -79,61 +82,63 @@ DEMO_VIDEOS = [
     }
 ]
 
-# 국가 코드 매핑
-COUNTRY_CODES = {
-    '한국': 'KR',
-    '미국': 'US',
-    '일본': 'JP',
-    '중국': 'CN',
-    '영국': 'GB',
-    '독일': 'DE',
-    '프랑스': 'FR',
-    '이탈리아': 'IT',
-    '스페인': 'ES',
-    '캐나다': 'CA',
-    '호주': 'AU',
-    '인도': 'IN',
-    '브라질': 'BR',
-    '러시아': 'RU',
-    '멕시코': 'MX',
-    '태국': 'TH',
-    '베트남': 'VN',
-    '인도네시아': 'ID',
-    '필리핀': 'PH',
-    '말레이시아': 'MY'
-}
+@st.cache_resource(show_spinner="데모 데이터 준비 중...")
+def get_demo_corpus():
+    """데모 검색 대상 (프로세스당 한 번 로드)
 
-def format_number(num_str):
-    """숫자를 한국어 단위로 포맷팅"""
-    try:
-        num = int(num_str)
-        if num >= 100000000:  # 1억 이상
-            return f"{num // 100000000}억 {(num % 100000000) // 10000}만"
-        elif num >= 10000:  # 1만 이상
-            return f"{num // 10000}만 {(num % 10000) // 1000}천"
-        elif num >= 1000:  # 1천 이상
-            return f"{num // 1000}천 {num % 1000}"
-        else:
-            return str(num)
-    except:
-        return num_str
+    DEMO_CORPUS_PATH 또는 DEMO_CORPUS_SIZE 설정 시 대용량 합성 데이터를 사용합니다.
+    """
+    if Config.DEMO_CORPUS_PATH:
+        return list(load_corpus(Config.DEMO_CORPUS_PATH))
+    if Config.DEMO_CORPUS_SIZE:
+        return list(generate_records(Config.DEMO_CORPUS_SIZE))
+    return DEMO_VIDEOS
+
+@st.cache_resource(show_spinner="검색 색인 준비 중...")
+def get_demo_index():
+    """데모 검색 색인 (첫 검색 시 한 번 구축)"""
+    # numpy는 색인을 만들 때만 로드 (첫 화면 표시 시간에 포함되지 않음)
+    from search_index import SearchIndex
+    return SearchIndex(get_demo_corpus())
 
 def search_demo_videos(keyword, country_code, max_results):
     """데모 비디오 검색 (실제 API 대신 사용)"""
-    # 키워드에 따라 다른 결과 반환
-    filtered_videos = []
-    
-    for video in DEMO_VIDEOS:
-        if keyword.lower() in video['title'].lower() or keyword.lower() in video['description'].lower():
-            filtered_videos.append(video)
+    # 색인에서 관련도 순으로 검색 (원본 데이터는 변경하지 않음)
+    filtered_videos = get_demo_index().search(keyword, max_results)
     
     # 결과가 없으면 모든 비디오 반환
     if not filtered_videos:
-        filtered_videos = DEMO_VIDEOS
+        filtered_videos = get_demo_corpus()[:max_results]
     
-    # 무작위로 섞고 최대 결과 수만큼 반환
-    random.shuffle(filtered_videos)
-    return filtered_videos[:max_results]
+    return filtered_videos
+
+def render_video_card(video, idx, thumbnail):
+    """결과 카드 하나 (섬네일, 제목, 채널, 일시, 통계, 설명)"""
+    # 섬네일 이미지
+    st.image(thumbnail, use_column_width=True)
+    
+    # 제목 (클릭 가능한 링크)
+    st.markdown(f"**[{video['title']}]({video['video_url']})**")
+    
+    # 채널명
+    st.caption(f"📺 {video['channel_title']}")
+    
+    # 업로드 일시
+    published_date = datetime.fromisoformat(video['published_at'].replace('Z', '+00:00'))
+    st.caption(f"📅 {published_date.strftime('%Y-%m-%d %H:%M')}")
+    
+    # 통계 정보
+    col_a, col_b = st.columns(2)
+    with col_a:
+        st.metric("조회수", format_number(video['view_count']))
+    with col_b:
+        st.metric("좋아요", format_number(video['like_count']))
+    
+    # 설명
+    with st.expander("설명 보기"):
+        st.write(video['description'])
+    
+    st.divider()
 
 def main():
     st.set_page_config(
@@ -159,7 +164,8 @@ def main():
     country_code = COUNTRY_CODES[country]
     
     # 검색 결과 개수
-    max_results = st.sidebar.slider("검색 결과 개수", 3, 6, 6)
+    corpus_size = len(get_demo_corpus())
+    max_results = st.sidebar.slider("검색 결과 개수", 3, max(6, min(corpus_size, 200)), 6)
     
     # 정렬 방식
     order_options = {
@@ -187,38 +193,8 @@ def main():
         st.subheader(f"🎯 검색 결과: '{st.session_state.search_keyword}' ({st.session_state.search_country})")
         st.info(f"총 {len(st.session_state.videos)}개의 영상을 찾았습니다. (데모 데이터)")
         
-        # 그리드 레이아웃으로 비디오 표시
-        cols = st.columns(3)  # 3열 그리드
-        
-        for idx, video in enumerate(st.session_state.videos):
-            col = cols[idx % 3]
-            
-            with col:
-                # 섬네일 이미지
-                st.image(video['thumbnail_url'], use_column_width=True)
-                
-                # 제목 (클릭 가능한 링크)
-                st.markdown(f"**[{video['title']}]({video['video_url']})**")
-                
-                # 채널명
-                st.caption(f"📺 {video['channel_title']}")
-                
-                # 업로드 일시
-                published_date = datetime.fromisoformat(video['published_at'].replace('Z', '+00:00'))
-                st.caption(f"📅 {published_date.strftime('%Y-%m-%d %H:%M')}")
-                
-                # 통계 정보
-                col_a, col_b = st.columns(2)
-                with col_a:
-                    st.metric("조회수", format_number(video['view_count']))
-                with col_b:
-                    st.metric("좋아요", format_number(video['like_count']))
-                
-                # 설명
-                with st.expander("설명 보기"):
-                    st.write(video['description'])
-                
-                st.divider()
+        # 현재 페이지 카드만 렌더링 (다음 페이지 섬네일은 백그라운드로 미리 받기)
+        render_results_grid(st.session_state.videos, render_video_card)
     else:
         # 초기 화면
         st.info("🔍 왼쪽 사이드바에서 키워드와 국가를 선택한 후 검색 버튼을 클릭하세요.")
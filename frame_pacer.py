@@ -0,0 +1,134 @@
+import bisect
+import time
+
+# 출력 간격 흔들림 히스토그램 구간 (ms, 실제 프레임 간격 - 목표 간격)
+JITTER_BUCKETS_MS = (-10, -5, -2, -1, -0.5, 0.5, 1, 2, 5, 10, 20, 50)
+
+# 누적 어긋남 히스토그램 구간 (ms, 경과 시간 - 출력한 프레임 수 x 목표 간격)
+DRIFT_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# 이보다 오래 밀리면 따라잡지 않고 마감 시각을 현재로 다시 맞춤 (초)
+MAX_CATCHUP_SECONDS = 0.5
+
+# 마감 시각에 새 프레임이 없을 때 반복하기 전에 기다리는 시간 (프레임 간격 대비 비율).
+# 카메라와 출력 fps가 같으면 캡처 시각이 틱 경계에서 조금만 흔들려도 반복+건너뜀이 번갈아 생기는데,
+# ffmpeg는 타임스탬프를 프레임 순서로 매기므로 조금 늦게 기록하는 편이 화면이 끊기지 않음
+REPEAT_GRACE = 0.25
+
+NS_PER_SECOND = 1_000_000_000
+
+
+class Histogram:
+    """고정 구간 히스토그램 (구간 상한 이하로 집계, 마지막 구간은 +Inf)"""
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, fraction):
+        """분위수가 속한 구간의 상한 (마지막 구간이면 최댓값, 값이 없으면 None)"""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.max
+
+    def buckets(self):
+        """[(구간 라벨, 개수), ...] (빈 구간 포함)"""
+        labels = [f"<={bound:g}" for bound in self.bounds] + [f">{self.bounds[-1]:g}"]
+        return list(zip(labels, self.counts))
+
+
+class FramePacer:
+    """time.monotonic_ns 마감 시각으로 출력 프레임 간격을 일정하게 유지하는 스케줄러
+
+    n번째 마감 시각을 기준 시각 + n x 간격(정수 ns)으로 계산하므로 sleep 오차가 누적되지 않습니다.
+    wait()가 마감 시각까지 기다린 뒤 반환하면, 호출한 쪽이 틱마다 한 프레임을 출력합니다.
+    - 틱 사이에 새 프레임이 여러 장이면 가장 최근 것만 출력 (나머지는 버림)
+    - 새 프레임이 없으면 grace_seconds만큼 기다린 뒤에도 없을 때 직전 프레임을 반복 (출력 fps 유지)
+    - 싱크가 느려 마감이 지났으면 대기 없이 바로 반환하여 밀린 틱을 따라잡고,
+      max_catchup초 이상 밀리면 따라잡기를 포기하고 기준 시각을 현재로 다시 맞춤 (rebases 증가)
+
+    jitter(프레임 간격 - 목표 간격)와 drift(경과 시간 - 출력 프레임 수 x 간격)는 호출한 쪽이 실제로 프레임을
+    출력한 시각을 record()로 넘겨 집계합니다 (반복 전 대기처럼 틱 이후의 지연도 포함되도록).
+    """
+
+    def __init__(self, fps, max_catchup=MAX_CATCHUP_SECONDS, repeat_grace=REPEAT_GRACE,
+                 clock=time.monotonic_ns, sleep=time.sleep):
+        self.max_catchup = max_catchup
+        self.repeat_grace = repeat_grace
+        self.clock = clock
+        self.sleep = sleep
+        self.jitter = Histogram(JITTER_BUCKETS_MS)
+        self.drift = Histogram(DRIFT_BUCKETS_MS)
+        self.ticks = 0
+        self.late_ticks = 0
+        self.rebases = 0
+        self.drift_ms = 0.0
+        self._origin = None
+        self._index = 0
+        self._started_ns = None
+        self._last_ns = None
+        self._media_ns = 0
+        self.set_fps(fps)
+
+    def set_fps(self, fps):
+        """출력 fps 변경 (실행 중이면 다음 마감 시각부터 새 간격 적용)"""
+        if self._origin is not None:
+            self._origin += self._index * self.period_ns
+            self._index = 0
+        self.fps = fps
+        self.period_ns = round(NS_PER_SECOND / fps)
+
+    @property
+    def grace_seconds(self):
+        """새 프레임이 없을 때 반복 전 대기 시간 (초)"""
+        return self.period_ns * self.repeat_grace / NS_PER_SECOND
+
+    def start(self, now=None):
+        """첫 마감 시각을 지금으로 설정"""
+        now = self.clock() if now is None else now
+        self._origin = self._started_ns = now
+        self._index = 0
+
+    def wait(self):
+        """다음 마감 시각까지 대기 후 현재 시각(ns) 반환 (출력 시각은 record()로 따로 기록)"""
+        if self._origin is None:
+            self.start()
+        deadline = self._origin + self._index * self.period_ns
+        now = self.clock()
+        if now < deadline:
+            self.sleep((deadline - now) / NS_PER_SECOND)
+            now = self.clock()
+        elif now - deadline >= self.period_ns:
+            self.late_ticks += 1
+            if now - deadline >= self.max_catchup * NS_PER_SECOND:
+                # 너무 밀림: 밀린 틱을 몰아서 내보내지 않고 지금부터 다시 시작
+                self.rebases += 1
+                self._origin, self._index = now, 0
+        self._index += 1
+        return now
+
+    def record(self, now=None):
+        """프레임을 실제로 출력한 시각(ns, 기본 지금)으로 jitter/drift 집계"""
+        now = self.clock() if now is None else now
+        if self._last_ns is not None:
+            self.jitter.observe((now - self._last_ns - self.period_ns) / 1e6)
+        self.drift_ms = (now - self._started_ns - self._media_ns) / 1e6
+        self.drift.observe(self.drift_ms)
+        self._last_ns = now
+        self._media_ns += self.period_ns
+        self.ticks += 1
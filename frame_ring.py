@@ -0,0 +1,229 @@
+import collections
+import threading
+
+import numpy as np
+
+# 슬롯 상태
+SLOT_FREE = 0      # 비어 있음 (생산자가 가져갈 수 있음)
+SLOT_WRITING = 1   # 생산자가 프레임을 채우는 중
+SLOT_READY = 2     # 소비자를 기다리는 중
+SLOT_READING = 3   # 소비자가 사용 중 (덮어쓰지 않음)
+
+# 카운터 배열 위치
+_DROPPED = 0      # 슬롯이 모자라 덮어쓴 프레임 수
+_SUPERSEDED = 1   # get_latest()가 더 최근 프레임을 꺼내면서 건너뛴 프레임 수
+_CLOSED = 2       # close() 호출 여부
+_NEXT_SEQ = 3     # 다음 공개 순번 (대기 프레임의 오래된 순서)
+_COUNTERS = 4
+
+# 다른 프로세스에서 attach()할 때 필요한 정보 (condition은 multiprocessing 조건 변수)
+RingHandle = collections.namedtuple('RingHandle', ['name', 'slots', 'shape', 'dtype', 'condition'])
+
+
+class FrameRing:
+    """미리 할당한 프레임 슬롯 링 버퍼 (생산자 1 / 소비자 1)
+
+    프레임마다 새 배열을 만들지 않고 고정된 슬롯에 캡처한 뒤, 소비자에게 슬롯 뷰를
+    복사 없이 넘깁니다. 소비자가 느려 빈 슬롯이 없으면 가장 오래된 대기 프레임을 회수하여
+    최신 프레임을 받습니다 (지연이 쌓이지 않도록 오래된 프레임을 버림).
+
+    슬롯 상태/공개 순번/카운터는 프레임과 같은 버퍼의 앞부분에 둡니다. shared_memory=True이면 이 버퍼를
+    multiprocessing.shared_memory에 두고 조건 변수도 multiprocessing 것을 사용하므로, 다른 프로세스가
+    handle()을 Process 인자로 받아 attach()하면 같은 acquire/publish/get/release 규약으로 슬롯을 주고받을 수
+    있습니다 (읽는 중인 슬롯은 덮어쓰지 않음, pickle 없음).
+    """
+
+    def __init__(self, slots, shape, dtype=np.uint8, shared_memory=False, context=None):
+        if slots < 3:
+            # 쓰는 슬롯, 읽는 슬롯 외에 대기 슬롯이 최소 하나 필요
+            raise ValueError("slots는 3 이상이어야 합니다.")
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.shm = None
+        self._owner = True
+        size = self._header_bytes() + self.nbytes
+        if shared_memory:
+            import multiprocessing
+            from multiprocessing import shared_memory as shm_module
+            self.shm = shm_module.SharedMemory(create=True, size=size)
+            # 소비자 프로세스를 만들 컨텍스트(spawn 등)와 같은 컨텍스트의 조건 변수를 사용
+            self._cond = (context or multiprocessing.get_context()).Condition()
+            self._map(self.shm.buf)
+        else:
+            self._cond = threading.Condition()
+            self._map(bytearray(size))
+        # 페이지를 미리 건드려 첫 프레임에서 페이지 폴트가 몰리지 않도록 함
+        self.frames.fill(0)
+
+    def _header_bytes(self):
+        # 상태, 공개 순번, 캡처 시각(슬롯별 8바이트) + 카운터
+        return (3 * self.slots + _COUNTERS) * 8
+
+    def _map(self, buffer):
+        # 슬롯 수가 적어 상태 접근은 numpy보다 memoryview 원소 접근이 빠름
+        view = memoryview(buffer)
+        size = self.slots * 8
+        self._state = view[:size].cast('q')
+        self._seq = view[size:2 * size].cast('q')
+        self._timestamps = view[2 * size:3 * size].cast('d')
+        self._counters = view[3 * size:self._header_bytes()].cast('q')
+        self.frames = np.ndarray((self.slots,) + self.shape, dtype=self.dtype, buffer=buffer,
+                                 offset=self._header_bytes())
+
+    @property
+    def nbytes(self):
+        """모든 슬롯의 바이트 수"""
+        return self.slots * int(np.prod(self.shape)) * self.dtype.itemsize
+
+    @property
+    def name(self):
+        """공유 메모리 이름"""
+        return self.shm.name if self.shm is not None else None
+
+    @property
+    def dropped(self):
+        """슬롯이 모자라 덮어쓴 프레임 수"""
+        return self._counters[_DROPPED]
+
+    @property
+    def superseded(self):
+        """get_latest()가 더 최근 프레임을 꺼내면서 건너뛴 프레임 수"""
+        return self._counters[_SUPERSEDED]
+
+    def handle(self):
+        """다른 프로세스에서 attach()할 정보 (조건 변수가 들어 있어 Process 인자로만 넘길 수 있음)"""
+        if self.shm is None:
+            raise ValueError("shared_memory=True로 만든 링만 다른 프로세스와 공유할 수 있습니다.")
+        return RingHandle(self.shm.name, self.slots, self.shape, self.dtype.str, self._cond)
+
+    def _slots_in(self, state):
+        return [index for index in range(self.slots) if self._state[index] == state]
+
+    def _oldest(self, ready):
+        return min(ready, key=self._seq.__getitem__)
+
+    def acquire(self, overwrite=True):
+        """쓸 슬롯 (번호, 배열 뷰) 반환
+
+        빈 슬롯이 없으면 가장 오래된 대기 프레임을 회수 (overwrite=False이면 빈 슬롯이 생길 때까지 대기).
+        """
+        with self._cond:
+            while True:
+                free = self._slots_in(SLOT_FREE)
+                if free:
+                    index = free[0]
+                else:
+                    ready = self._slots_in(SLOT_READY)
+                    if not overwrite or not ready:
+                        # 모든 슬롯이 쓰는 중/읽는 중이거나 덮어쓰지 않고 기다리는 경우
+                        self._cond.wait()
+                        continue
+                    index = self._oldest(ready)
+                    self._counters[_DROPPED] += 1
+                self._state[index] = SLOT_WRITING
+                return index, self.frames[index]
+
+    def publish(self, index, timestamp):
+        """채운 슬롯을 소비자에게 공개"""
+        with self._cond:
+            self._state[index] = SLOT_READY
+            self._timestamps[index] = timestamp
+            self._seq[index] = self._counters[_NEXT_SEQ]
+            self._counters[_NEXT_SEQ] += 1
+            self._cond.notify_all()
+
+    def _wait_ready(self, timeout):
+        ready = self._slots_in(SLOT_READY)
+        while not ready:
+            if self._counters[_CLOSED]:
+                return None
+            if not self._cond.wait(timeout):
+                return None
+            ready = self._slots_in(SLOT_READY)
+        return ready
+
+    def get(self, timeout=None):
+        """가장 오래된 대기 프레임 (번호, 배열 뷰, 캡처 시각). 닫히고 비었으면 None
+
+        사용이 끝나면 release(번호)를 호출해야 슬롯이 재사용됩니다.
+        """
+        with self._cond:
+            ready = self._wait_ready(timeout)
+            if ready is None:
+                return None
+            index = self._oldest(ready)
+            self._state[index] = SLOT_READING
+            return index, self.frames[index], self._timestamps[index]
+
+    def get_latest(self, timeout=None):
+        """가장 최근 대기 프레임 (번호, 배열 뷰, 캡처 시각). 더 오래된 대기 프레임은 반납
+
+        대기 프레임이 없으면 timeout만큼 기다리고, 그래도 없거나 닫혔으면 None
+        (timeout=0이면 기다리지 않음).
+        """
+        with self._cond:
+            ready = self._wait_ready(timeout)
+            if ready is None:
+                return None
+            index = max(ready, key=self._seq.__getitem__)
+            for other in ready:
+                self._state[other] = SLOT_FREE
+            self._counters[_SUPERSEDED] += len(ready) - 1
+            self._state[index] = SLOT_READING
+            self._cond.notify_all()
+            return index, self.frames[index], self._timestamps[index]
+
+    def release(self, index):
+        """다 쓴 슬롯 반납 (프레임을 채우지 못한 쓰기 슬롯도 같은 방법으로 반납)"""
+        with self._cond:
+            self._state[index] = SLOT_FREE
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        """close() 호출 여부 (대기 프레임이 남아 있을 수 있음)"""
+        return bool(self._counters[_CLOSED])
+
+    def pending(self):
+        """대기 중인 프레임 수"""
+        with self._cond:
+            return len(self._slots_in(SLOT_READY))
+
+    def close(self):
+        """더 이상 프레임을 넣지 않음 (소비자는 남은 프레임을 받은 뒤 None)"""
+        with self._cond:
+            self._counters[_CLOSED] = 1
+            self._cond.notify_all()
+
+    def release_memory(self):
+        """공유 메모리 연결 해제 (만든 프로세스에서는 삭제까지)
+
+        슬롯 뷰를 들고 있으면 해제할 수 없으므로 받은 배열 참조를 먼저 지워야 합니다.
+        """
+        if self.shm is not None:
+            for view in (self._state, self._seq, self._timestamps, self._counters):
+                view.release()
+            self.frames = self._state = self._seq = self._timestamps = self._counters = None
+            self.shm.close()
+            if self._owner:
+                self.shm.unlink()
+            self.shm = None
+
+
+def attach(handle):
+    """다른 프로세스에서 handle()로 받은 FrameRing 열기 (같은 슬롯/상태/조건 변수 공유)
+
+    사용이 끝나면 슬롯 뷰 참조를 지운 뒤 release_memory()를 호출합니다 (삭제는 만든 쪽에서).
+    """
+    from multiprocessing import shared_memory as shm_module
+
+    ring = FrameRing.__new__(FrameRing)
+    ring.slots = handle.slots
+    ring.shape = tuple(handle.shape)
+    ring.dtype = np.dtype(handle.dtype)
+    ring.shm = shm_module.SharedMemory(name=handle.name)
+    ring._owner = False
+    ring._cond = handle.condition
+    ring._map(ring.shm.buf)
+    return ring
@@ -0,0 +1,73 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import Config
+
+# 자동 재시도할 응답 코드 (429/403은 할당량 스케줄러가 처리하므로 제외)
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+# 프로세스 전역 공유 세션
+_session = None
+_session_lock = threading.Lock()
+
+
+def create_retry(retries=None, backoff=None):
+    """연결 오류와 일시적인 서버 오류(5xx)를 GET에 한해 재시도하는 urllib3 정책
+
+    재시도 이력은 응답(response.raw.retries.history)에 남아 API 지표의 재시도 횟수로 집계됩니다.
+    재시도 후에도 실패하면 예외 대신 마지막 응답을 돌려주어 기존 오류 처리(차단기 등)를 그대로 거칩니다.
+    """
+    return Retry(
+        total=Config.HTTP_RETRIES if retries is None else retries,
+        backoff_factor=Config.HTTP_RETRY_BACKOFF if backoff is None else backoff,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({'GET'}),
+        raise_on_status=False
+    )
+
+
+def retry_count(response):
+    """urllib3가 이 응답을 받기까지 자동 재시도한 횟수 (재시도한 요청도 서버에 도달했으면 할당량 차감 대상)"""
+    retries = getattr(response.raw, 'retries', None)
+    return len(getattr(retries, 'history', None) or ())
+
+
+def create_session(pool_connections=None, pool_maxsize=None, retries=None):
+    """keep-alive 커넥션 풀을 사용하는 HTTP 세션 생성 (retries=0이면 자동 재시도 없음)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections or Config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize or Config.HTTP_POOL_MAXSIZE,
+        max_retries=create_retry(retries),
+        pool_block=False
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+
+def get_session():
+    """모든 추출기 인스턴스가 공유하는 HTTP 세션 반환
+
+    커넥션 풀(urllib3)은 스레드 안전하므로 여러 Streamlit 세션에서
+    동시에 사용해도 googleapis.com 과의 TCP+TLS 연결을 재사용합니다.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def close_session():
+    """공유 세션 종료 (테스트/재설정용)"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
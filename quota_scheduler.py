@@ -0,0 +1,208 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from config import Config
+
+try:
+    from zoneinfo import ZoneInfo
+    # YouTube Data API 할당량은 태평양 시간 자정에 초기화됨
+    QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+except Exception:
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+# 엔드포인트별 할당량 비용 (units)
+ENDPOINT_COSTS = {
+    'search': 100,
+    'videos': 1
+}
+
+# 요청 우선순위 (숫자가 작을수록 우선)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+# 일일 할당량 초과 (태평양 시간 자정까지 키 사용 중지)
+QUOTA_REASONS = ('quotaExceeded', 'dailyLimitExceeded')
+# 짧은 시간 동안의 호출 제한 (잠시 후 다시 시도하면 되는 일시적 오류)
+RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded')
+
+# 호출 제한 응답 재시도 횟수와 대기 시간 (초, 재시도마다 두 배, Retry-After가 있으면 그 값)
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BASE_DELAY = 0.5
+RATE_LIMIT_MAX_DELAY = 8.0
+
+
+class QuotaExceeded(Exception):
+    """할당량 부족으로 API 호출 전에 요청이 거부됨"""
+
+
+def _error_reasons(response):
+    try:
+        errors = response.json().get('error', {}).get('errors', [])
+    except (ValueError, AttributeError):
+        return set()
+    return {error.get('reason') for error in errors if isinstance(error, dict)}
+
+
+def is_quota_error(response):
+    """403 응답이 일일 할당량 초과 때문인지 확인 (짧은 호출 제한은 제외)"""
+    if response.status_code != 403:
+        return False
+    return bool(_error_reasons(response) & set(QUOTA_REASONS))
+
+
+def is_rate_limit_error(response):
+    """429 또는 호출 제한(rateLimitExceeded) 403 응답인지 확인"""
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and bool(_error_reasons(response) & set(RATE_LIMIT_REASONS))
+
+
+def rate_limit_delay(response, attempt):
+    """호출 제한 응답 후 재시도 전 대기 시간 (초)"""
+    try:
+        return min(float(response.headers['Retry-After']), RATE_LIMIT_MAX_DELAY)
+    except (KeyError, TypeError, ValueError):
+        return min(RATE_LIMIT_BASE_DELAY * 2 ** attempt, RATE_LIMIT_MAX_DELAY)
+
+
+class QuotaScheduler:
+    """API 키별 일일 할당량과 토큰 버킷 속도 제한을 적용하는 요청 스케줄러
+
+    - 엔드포인트별 비용을 호출 전에 차감하고 일일 예산을 넘으면 QuotaExceeded 발생
+    - 백그라운드 요청은 대화형 요청을 위한 예비 할당량을 사용할 수 없음
+    - 토큰 대기 중인 대화형 요청이 있으면 백그라운드 요청은 양보
+    """
+
+    def __init__(self, daily_units=None, reserve_units=None, rate_per_sec=None, burst=None,
+                 clock=time.monotonic, now=None):
+        self.daily_units = daily_units if daily_units is not None else Config.QUOTA_DAILY_UNITS
+        self.reserve_units = reserve_units if reserve_units is not None else Config.QUOTA_RESERVE_UNITS
+        self.rate_per_sec = rate_per_sec or Config.QUOTA_RATE_PER_SEC
+        self.burst = burst or Config.QUOTA_BURST
+        self._clock = clock
+        self._now = now or (lambda: datetime.now(QUOTA_TIMEZONE))
+        self._cond = threading.Condition()
+        self._tokens = float(self.burst)
+        self._last_refill = clock()
+        self._waiting_interactive = 0
+        self._usage = {}  # api_key -> {'day', 'used', 'started_at', 'exhausted'}
+
+    def cost(self, endpoint):
+        """엔드포인트 호출 비용"""
+        return ENDPOINT_COSTS.get(endpoint, 1)
+
+    def acquire(self, api_key, endpoint, priority=PRIORITY_INTERACTIVE):
+        """호출 허가를 받을 때까지 대기 후 비용 차감 (할당량 부족 시 QuotaExceeded)"""
+        cost = self.cost(endpoint)
+        interactive = priority == PRIORITY_INTERACTIVE
+        with self._cond:
+            if interactive:
+                self._waiting_interactive += 1
+            try:
+                while True:
+                    self._check_budget(api_key, cost, priority)
+                    self._refill()
+                    if self._tokens >= 1 and (interactive or self._waiting_interactive == 0):
+                        break
+                    self._cond.wait(max((1 - self._tokens) / self.rate_per_sec, 0.01))
+                self._tokens -= 1
+                usage = self._get_usage(api_key)
+                usage['used'] += cost
+                if usage['started_at'] is None:
+                    usage['started_at'] = self._now()
+            finally:
+                if interactive:
+                    self._waiting_interactive -= 1
+                self._cond.notify_all()
+
+    def charge(self, api_key, endpoint, count=1):
+        """이미 보낸 추가 요청(HTTP 자동 재시도 등)의 비용 차감 (대기/거부 없음)"""
+        if count <= 0:
+            return
+        with self._cond:
+            usage = self._get_usage(api_key)
+            usage['used'] += self.cost(endpoint) * count
+            if usage['started_at'] is None:
+                usage['started_at'] = self._now()
+
+    def mark_exhausted(self, api_key):
+        """API가 할당량 초과로 거부한 키는 초기화 시점까지 사용 중지"""
+        with self._cond:
+            self._get_usage(api_key)['exhausted'] = True
+
+    def remaining(self, api_key):
+        """남은 일일 할당량"""
+        with self._cond:
+            usage = self._get_usage(api_key)
+            if usage['exhausted']:
+                return 0
+            return max(self.daily_units - usage['used'], 0)
+
+    def is_low(self, api_key):
+        """남은 할당량이 대화형 예비분 이하인지 확인"""
+        return self.remaining(api_key) <= self.reserve_units
+
+    def status(self, api_key):
+        """할당량 사용 현황 및 예상 소진 시각"""
+        with self._cond:
+            usage = self._get_usage(api_key)
+            now = self._now()
+            used = usage['used']
+            remaining = 0 if usage['exhausted'] else max(self.daily_units - used, 0)
+            resets_at = datetime.combine(usage['day'] + timedelta(days=1), datetime.min.time(),
+                                         tzinfo=now.tzinfo)
+
+            # 오늘 사용 속도를 기준으로 소진 시각 추정 (초기화 전에 소진되지 않으면 None)
+            projected_exhaustion = None
+            if remaining == 0:
+                projected_exhaustion = now
+            elif usage['started_at'] is not None and used > 0:
+                elapsed = max((now - usage['started_at']).total_seconds(), 1.0)
+                eta = now + timedelta(seconds=remaining / (used / elapsed))
+                if eta < resets_at:
+                    projected_exhaustion = eta
+
+            return {
+                'used': used,
+                'remaining': remaining,
+                'daily_units': self.daily_units,
+                'resets_at': resets_at,
+                'projected_exhaustion': projected_exhaustion
+            }
+
+    def _get_usage(self, api_key):
+        today = self._now().date()
+        usage = self._usage.get(api_key)
+        if usage is None or usage['day'] != today:
+            usage = {'day': today, 'used': 0, 'started_at': None, 'exhausted': False}
+            self._usage[api_key] = usage
+        return usage
+
+    def _check_budget(self, api_key, cost, priority):
+        usage = self._get_usage(api_key)
+        if usage['exhausted']:
+            raise QuotaExceeded("API 할당량이 소진되었습니다.")
+        floor = self.reserve_units if priority != PRIORITY_INTERACTIVE else 0
+        if self.daily_units - usage['used'] - cost < floor:
+            raise QuotaExceeded("남은 API 할당량이 부족합니다.")
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate_per_sec)
+        self._last_refill = now
+
+
+# 프로세스 전역 공유 스케줄러
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_quota_scheduler():
+    """모든 추출기 인스턴스가 공유하는 할당량 스케줄러 반환"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = QuotaScheduler()
+    return _scheduler
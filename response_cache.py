@@ -0,0 +1,135 @@
+import copy
+import json
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from config import Config
+
+
+def normalize_keyword(keyword):
+    """캐시 키용 키워드 정규화 (공백 정리, casefold, 한글 NFC)"""
+    keyword = ' '.join((keyword or '').split())
+    return unicodedata.normalize('NFC', keyword.casefold())
+
+
+def search_cache_key(keyword, country_code, max_results, order, event_type, **options):
+    """search_videos 호출 파라미터로 캐시 키 생성"""
+    return ('search', normalize_keyword(keyword), country_code, int(max_results), order, event_type,
+            tuple(sorted(options.items())))
+
+
+def search_ttl(event_type):
+    """영상 유형별 검색 결과 TTL (라이브는 짧게, 완료된 영상은 길게)"""
+    if event_type == 'live':
+        return Config.CACHE_TTL_LIVE
+    if event_type == 'uploaded':
+        return Config.CACHE_TTL_UPLOADED
+    return Config.CACHE_TTL_SEARCH
+
+
+def _json_default(value):
+    # VideoRecord 등 to_dict()를 제공하는 객체 지원
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    return str(value)
+
+
+def _estimate_size(value):
+    """캐시 값의 대략적인 바이트 크기"""
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=_json_default).encode('utf-8'))
+    except (TypeError, ValueError):
+        return 1024
+
+
+class ResponseCache:
+    """바이트 예산 기반 LRU + TTL 응답 캐시 (스레드 안전)"""
+
+    def __init__(self, max_bytes=None, clock=time.monotonic):
+        self.max_bytes = max_bytes if max_bytes is not None else Config.CACHE_MAX_BYTES
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, allow_stale=False):
+        """캐시 값 반환 (없거나 만료되면 None)
+
+        만료된 항목은 LRU로 밀려날 때까지 보관되며, allow_stale=True 이면
+        할당량 부족 시 대체 응답으로 사용할 수 있도록 만료된 값도 반환합니다.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, size, value = entry
+            if expires_at <= self._clock() and not allow_stale:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # 호출자가 결과를 수정해도 캐시가 오염되지 않도록 복사본 반환
+        return copy.deepcopy(value)
+
+    def set(self, key, value, ttl):
+        """캐시 값 저장 (예산 초과 시 오래된 항목부터 제거)"""
+        if ttl <= 0:
+            return
+        value = copy.deepcopy(value)
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self._clock() + ttl, size, value)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and self._entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """적중/미스 카운터 및 사용량 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
+
+
+# 프로세스 전역 공유 캐시
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """모든 추출기 인스턴스가 공유하는 응답 캐시 반환"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
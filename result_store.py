@@ -0,0 +1,101 @@
+import time
+
+from response_cache import normalize_keyword, search_ttl
+
+# 클라이언트에서 다시 정렬할 수 있는 정렬 방식 -> (컬럼, 오름차순 여부)
+CLIENT_SORTS = {
+    'date': ('published_at', False),
+    'viewCount': ('view_count', False)
+}
+
+STAT_COLUMNS = ('view_count', 'like_count', 'comment_count')
+
+
+def to_frame(videos):
+    """검색 결과를 컬럼 형식 DataFrame으로 변환 (시각 파싱, 통계 숫자 변환)"""
+    # pandas는 첫 검색 결과를 저장할 때 로드 (페이지 시작 시간에 포함되지 않음)
+    import pandas as pd
+
+    frame = pd.DataFrame({
+        'video_id': [video['video_id'] for video in videos],
+        'published_at': [video['published_at'] for video in videos],
+        'is_live': [bool(video.get('is_live')) for video in videos],
+        **{column: [video.get(column) for video in videos] for column in STAT_COLUMNS}
+    })
+    frame['published_at'] = pd.to_datetime(frame['published_at'], utc=True, errors='coerce')
+    for column in STAT_COLUMNS:
+        frame[column] = pd.to_numeric(frame[column], errors='coerce').astype('Int64')
+    frame['is_live'] = frame['is_live'].astype(bool)
+    # 원래 API 순서 (관련성 등 서버 정렬 순서)
+    frame['rank'] = range(len(frame))
+    return frame
+
+
+class ResultStore:
+    """한 번 받아온 검색 결과를 보관하고 정렬/필터/개수 변경에 재사용
+
+    API를 다시 호출하지 않고도 응답할 수 있는 경우:
+    - 같은 키워드/국가이고, 영상 유형이 같거나 전체 결과를 모두 받아둔 상태에서 라이브만 걸러내는 경우
+    - 요청한 개수 이하이거나 이전 결과가 이미 전체 결과였으며
+    - 정렬이 처음 요청한 정렬이거나, 전체 결과를 모두 받아둔 상태에서 날짜/조회수처럼 컬럼으로 정렬 가능한 경우
+      (일부만 받은 결과를 다시 정렬하면 그 정렬의 상위 결과가 아님)
+    - 영상 유형별 캐시 TTL(라이브는 짧게)이 지나지 않은 경우
+
+    조건이 모두 같은 재검색은 보관한 결과로 응답하지 않고 캐시된 API 경로로 보내 TTL에 따라 갱신되게 합니다.
+    개수는 국가별 개수이므로 여러 국가 결과는 최대 (개수 x 국가 수)개를 반환합니다.
+    """
+
+    def __init__(self, keyword, country_codes, event_type, order, max_results, videos, clock=time.monotonic):
+        self.keyword = normalize_keyword(keyword)
+        self.country_codes = tuple(country_codes)
+        self.event_type = event_type
+        self.order = order
+        self.max_results = max_results
+        self.videos = list(videos)
+        self.frame = to_frame(self.videos)
+        self.clock = clock
+        self.expires_at = clock() + search_ttl(event_type)
+        # 국가마다 요청한 개수보다 적게 왔으면 더 받아올 결과가 없음 (여러 국가 결과는 region_codes로 국가별 개수 계산)
+        self.exhausted = all(self._region_count(code) < max_results for code in self.country_codes)
+
+    def _region_count(self, code):
+        if len(self.country_codes) == 1:
+            return len(self.videos)
+        return sum(code in video.get('region_codes', ()) for video in self.videos)
+
+    def matches(self, keyword, country_codes, event_type):
+        """같은 검색 대상인지 확인"""
+        if normalize_keyword(keyword) != self.keyword or tuple(country_codes) != self.country_codes:
+            return False
+        # 전체 영상 결과를 모두 받아둔 경우에만 라이브를 걸러낼 수 있음 (일부만 받았으면 라이브가 빠져 있음)
+        return event_type == self.event_type or (self.event_type == 'video' and event_type == 'live' and self.exhausted)
+
+    def can_answer(self, keyword, country_codes, event_type, order, max_results):
+        """API 호출 없이 응답 가능한지 확인"""
+        if self.clock() >= self.expires_at or not self.matches(keyword, country_codes, event_type):
+            return False
+        if (event_type, order, max_results) == (self.event_type, self.order, self.max_results):
+            return False
+        if max_results > self.max_results and not self.exhausted:
+            return False
+        if order == self.order:
+            return True
+        # 일부 결과만 받았으면 다른 정렬의 상위 N개가 빠져 있을 수 있으므로 API로 다시 요청
+        if order not in CLIENT_SORTS or not self.exhausted:
+            return False
+        # 조회수 정렬은 통계가 모두 병합되어 있어야 가능
+        column, _ = CLIENT_SORTS[order]
+        return column != 'view_count' or not self.frame['view_count'].isna().any()
+
+    def select(self, event_type, order, max_results):
+        """정렬/필터/개수 제한을 벡터 연산으로 적용한 결과 반환"""
+        frame = self.frame
+        if event_type == 'live' and self.event_type != 'live':
+            frame = frame[frame['is_live']]
+        if order == self.order:
+            frame = frame.sort_values('rank', kind='stable')
+        else:
+            column, ascending = CLIENT_SORTS[order]
+            frame = frame.sort_values([column, 'rank'], ascending=[ascending, True],
+                                      na_position='last', kind='stable')
+        return [self.videos[position] for position in frame['rank'].head(max_results * len(self.country_codes))]
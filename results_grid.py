@@ -0,0 +1,74 @@
+import math
+
+import streamlit as st
+
+from config import Config
+from thumbnail_cache import get_thumbnail_cache
+
+# 그리드 열 수
+GRID_COLUMNS = 3
+
+
+def page_count(total, page_size):
+    """전체 페이지 수 (결과가 없어도 1페이지)"""
+    return max(1, math.ceil(total / page_size))
+
+
+def page_range(total, page, page_size):
+    """페이지 번호(0부터)에 해당하는 결과 범위 [start, end)"""
+    page = max(0, min(page, page_count(total, page_size) - 1))
+    start = page * page_size
+    return start, min(start + page_size, total)
+
+
+def _move_page(page_key, delta):
+    st.session_state[page_key] = st.session_state.get(page_key, 0) + delta
+
+
+@st.fragment
+def render_results_grid(videos, render_card, key='results', page_size=None, state=None):
+    """검색 결과를 페이지 단위 그리드로 렌더링
+
+    - 현재 페이지 카드만 생성하므로 결과 수와 관계없이 재실행 시간/전송량이 일정
+    - 페이지 이동은 fragment 안에서 처리되어 사이드바 등 페이지 전체를 다시 실행하지 않음
+    - 현재 페이지 섬네일만 기다리고, 다음 페이지 섬네일은 백그라운드로 미리 받아 둠
+
+    render_card(video, idx, thumbnail)는 카드 하나를 그리는 함수이며, idx는 전체 결과 기준 번호입니다.
+    state는 결과를 만든 정렬/필터 조건이며, 바뀌면 결과가 같은 영상이라도 첫 페이지로 돌아갑니다.
+    """
+    page_size = page_size or Config.RESULTS_PAGE_SIZE
+    total = len(videos)
+    pages = page_count(total, page_size)
+
+    # 새 검색 결과나 정렬/필터 변경이 들어오면 첫 페이지부터 표시
+    # (받아둔 결과를 다시 정렬하면 개수와 처음/마지막 영상이 같아도 중간 순서가 바뀔 수 있음)
+    page_key = f"{key}_page"
+    signature = (state, total, videos[0]['video_id'], videos[-1]['video_id']) if videos else None
+    if st.session_state.get(f"{key}_signature") != signature:
+        st.session_state[f"{key}_signature"] = signature
+        st.session_state[page_key] = 0
+    page = max(0, min(st.session_state.get(page_key, 0), pages - 1))
+    st.session_state[page_key] = page
+    start, end = page_range(total, page, page_size)
+
+    # 섬네일을 동시에 받아 로컬 캐시에서 제공 (실패 시 원본 URL 사용)
+    cache = get_thumbnail_cache()
+    visible = videos[start:end]
+    thumbnails = cache.fetch_many(video['thumbnail_url'] for video in visible)
+    cache.prefetch(video['thumbnail_url'] for video in videos[end:end + page_size])
+
+    cols = st.columns(GRID_COLUMNS)
+    for offset, video in enumerate(visible):
+        with cols[offset % GRID_COLUMNS]:
+            render_card(video, start + offset, thumbnails.get(video['thumbnail_url']) or video['thumbnail_url'])
+
+    if pages > 1:
+        prev_col, info_col, next_col = st.columns([1, 3, 1])
+        with prev_col:
+            st.button("◀ 이전", key=f"{key}_prev", disabled=page == 0,
+                      on_click=_move_page, args=(page_key, -1), use_container_width=True)
+        with info_col:
+            st.caption(f"{start + 1}–{end} / {total}개 ({page + 1} / {pages} 페이지)")
+        with next_col:
+            st.button("다음 ▶", key=f"{key}_next", disabled=page == pages - 1,
+                      on_click=_move_page, args=(page_key, 1), use_container_width=True)
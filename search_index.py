@@ -0,0 +1,155 @@
+import math
+import re
+
+import numpy as np
+
+from response_cache import normalize_keyword
+
+# 검색 대상 필드와 가중치 (제목 일치를 설명 일치보다 우선)
+DEFAULT_FIELDS = (('title', 3.0), ('channel_title', 2.0), ('description', 1.0))
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# 한 글자로도 뜻이 되는 문자 (한글 음절/자모, 가나, 한자): 글자 단위로도 색인하여 한 글자 검색어 지원
+CJK_PATTERN = re.compile('[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u4dbf'
+                         '\u4e00-\u9fff\uac00-\ud7a3\uf900-\ufaff]')
+
+
+def tokenize(text):
+    """정규화(NFC, 소문자, 공백 정리) 후 단어 단위로 분리"""
+    return TOKEN_PATTERN.findall(normalize_keyword(text or ''))
+
+
+def ngrams(token, n=2):
+    """문자 n-gram (한국어는 조사가 붙어도 어간 부분이 일치하도록 2-gram 사용)"""
+    if len(token) <= n:
+        return [token]
+    return [token[i:i + n] for i in range(len(token) - n + 1)]
+
+
+def index_grams(token):
+    """색인할 gram (2-gram + 2글자 이상 단어의 한글/한자 글자)
+
+    검색어 쪽은 ngrams()를 그대로 쓰므로 "산"처럼 한 글자 검색어도 "후지산" 안에서 일치합니다.
+    """
+    if len(token) <= 1:
+        return [token]
+    # 중복 gram은 레코드별 집합에 모을 때 합쳐짐
+    return ngrams(token) + CJK_PATTERN.findall(token)
+
+
+def text_grams(text):
+    """텍스트의 고유 n-gram 집합"""
+    return {gram for token in tokenize(text) for gram in ngrams(token)}
+
+
+class SearchIndex:
+    """데모/샘플 데이터용 문자 n-gram 역색인 (생성 시 한 번만 구축)
+
+    - 2-gram과 함께 한글/한자 글자도 색인하여 한 글자 검색어("산")도 단어 안에서 일치
+
+    - 모든 검색어 n-gram을 포함하고 한 필드에 검색어가 그대로 있는 레코드를 점수(IDF x 필드 가중치) 순으로 반환
+    - 완전히 일치하는 레코드가 없으면 일부만 일치하는 레코드를 일치 비율 순으로 반환
+    - 원본 레코드는 수정하지 않으며, 점수가 같으면 원래 순서 유지
+    """
+
+    def __init__(self, records, fields=DEFAULT_FIELDS):
+        self.records = records
+        self.fields = tuple(fields)
+        vocabulary = {}
+        token_grams = {}  # 단어 -> gram 번호 목록 (반복되는 단어는 한 번만 분해)
+
+        # (gram 번호, 레코드 번호) 쌍을 필드별로 모은 뒤 numpy로 한 번에 정렬/그룹화
+        self._field_postings = []
+        for field, _ in self.fields:
+            gram_ids, doc_ids = [], []
+            for doc_id, record in enumerate(records):
+                grams = set()
+                for token in tokenize(record.get(field)):
+                    ids = token_grams.get(token)
+                    if ids is None:
+                        ids = token_grams[token] = [vocabulary.setdefault(gram, len(vocabulary))
+                                                    for gram in index_grams(token)]
+                    grams.update(ids)
+                gram_ids.extend(grams)
+                doc_ids.extend([doc_id] * len(grams))
+            self._field_postings.append(self._group(np.array(gram_ids, dtype=np.int64),
+                                                    np.array(doc_ids, dtype=np.int32)))
+
+        self._vocabulary = vocabulary
+        self._idf = {}  # gram 번호 -> IDF (처음 검색될 때 계산)
+
+    @staticmethod
+    def _group(gram_ids, doc_ids):
+        """gram 번호별 레코드 번호 배열 (레코드 번호 오름차순)"""
+        if gram_ids.size == 0:
+            return {}
+        # 안정 정렬이므로 같은 gram 안에서는 레코드 번호 순서 유지
+        order = np.argsort(gram_ids, kind='stable')
+        gram_ids, doc_ids = gram_ids[order], doc_ids[order]
+        starts = np.flatnonzero(np.r_[True, gram_ids[1:] != gram_ids[:-1]])
+        return dict(zip(gram_ids[starts].tolist(), np.split(doc_ids, starts[1:])))
+
+    def __len__(self):
+        return len(self.records)
+
+    def search_ids(self, query, limit=None, partial=True):
+        """검색어에 맞는 레코드 번호를 순위대로 반환"""
+        query_grams = text_grams(query)
+        if not query_grams:
+            return []
+
+        count = len(self.records)
+        scores = np.zeros(count, dtype=np.float64)
+        matched = np.zeros(count, dtype=np.int32)
+        for gram in query_grams:
+            gram_id = self._vocabulary.get(gram)
+            if gram_id is None:
+                continue
+            postings = [(weight, field_grams.get(gram_id)) for (_, weight), field_grams
+                        in zip(self.fields, self._field_postings)]
+            # 여러 필드에 있어도 레코드당 한 번만 일치로 계산
+            present = np.zeros(count, dtype=bool)
+            for _, ids in postings:
+                if ids is not None:
+                    present[ids] = True
+            matched += present
+            idf = self._idf.get(gram_id)
+            if idf is None:
+                idf = self._idf[gram_id] = math.log(1 + count / int(present.sum()))
+            for weight, ids in postings:
+                if ids is not None:
+                    scores[ids] += idf * weight
+
+        # n-gram이 여러 필드에 흩어져 있어도 모두 포함되므로, 한 필드에 검색어가 그대로 있는지 다시 확인
+        phrase = ' '.join(tokenize(query))
+        candidates = np.flatnonzero(matched == len(query_grams))
+        order = []
+        for doc_id in self._ranked(candidates, scores):
+            # 순위대로 확인하여 limit개를 채우면 중단
+            if limit is not None and len(order) >= limit:
+                break
+            if self._contains(doc_id, phrase):
+                order.append(doc_id)
+        if order:
+            return order
+        if not partial:
+            return []
+        # 완전 일치가 없으면 일치한 n-gram 수를 점수에 우선 반영
+        candidates = np.flatnonzero(matched)
+        order = self._ranked(candidates, scores + matched * (scores.max() + 1))
+        return order[:limit] if limit is not None else order
+
+    @staticmethod
+    def _ranked(candidates, scores):
+        # 점수 내림차순, 같은 점수는 원래 순서 (안정 정렬)
+        return candidates[np.argsort(-scores[candidates], kind='stable')].tolist()
+
+    def _contains(self, doc_id, phrase):
+        """검색어(정규화, 단어 사이 공백 하나)가 레코드의 한 필드 안에 그대로 있는지 여부"""
+        record = self.records[doc_id]
+        return any(phrase in ' '.join(tokenize(record.get(field))) for field, _ in self.fields)
+
+    def search(self, query, limit=None, partial=True):
+        """검색어에 맞는 레코드를 순위대로 반환 (원본 레코드 참조)"""
+        return [self.records[doc_id] for doc_id in self.search_ids(query, limit, partial)]
@@ -0,0 +1,446 @@
+import collections
+import struct
+import subprocess
+import threading
+import time
+
+from config import Config
+from stream_pipeline import PIPE_OUTPUT, STDERR_TAIL_LINES, FfmpegSink
+
+# FLV 태그 종류
+FLV_AUDIO = 8
+FLV_VIDEO = 9
+FLV_SCRIPT = 18
+
+FLV_TAG_HEADER_SIZE = 11
+# 'FLV', 버전 1, 오디오+비디오, 헤더 크기 9 + 첫 PreviousTagSize(0)
+FLV_FILE_HEADER = b'FLV\x01\x05\x00\x00\x00\x09\x00\x00\x00\x00'
+
+# 전송 상태
+STATE_CONNECTING = 'connecting'  # 첫 키프레임을 기다리거나 ffmpeg가 출력을 여는 중
+STATE_LIVE = 'live'              # 출력을 열고 전송 중 (ffmpeg 진행 보고를 받은 뒤)
+STATE_BACKOFF = 'backoff'        # 실패 후 재연결 대기
+STATE_STOPPED = 'stopped'
+
+RECONNECT_MIN_DELAY = 1.0   # 첫 재연결 대기 (초, 실패할 때마다 두 배)
+STABLE_SECONDS = 10.0       # 이만큼 전송이 이어지면 재연결 대기 시간을 처음 값으로
+STALL_TIMEOUT = 10.0        # 쓰기 하나나 ffmpeg 진행 보고가 이보다 오래 멈추면 연결을 끊고 재연결
+SPLICE_GAP_MS = 33          # 인코더 교체 직후 프레임 간격을 아직 모를 때 이어 붙일 간격 (ms)
+
+# 인코더 출력에서 태그를 나눠 담는 FLV 태그 (data: 태그 헤더 11바이트 + 본문, PreviousTagSize 제외)
+FlvTag = collections.namedtuple('FlvTag', ['kind', 'timestamp', 'data', 'keyframe', 'config'])
+
+
+def _read_exact(stream, size):
+    data = stream.read(size)
+    return data if len(data) == size else None
+
+
+def read_flv_tags(stream):
+    """FLV 바이트 스트림에서 태그를 차례로 읽음 (스트림이 끝나면 종료)
+
+    config는 메타데이터와 코덱 설정(AVC/AAC sequence header)처럼 새 연결마다 맨 앞에 보내야 하는 태그입니다.
+    """
+    header = _read_exact(stream, 9)
+    if header is None:
+        return
+    if header[:3] != b'FLV':
+        raise ValueError("FLV 스트림이 아닙니다.")
+    # 헤더 확장 부분 + 첫 PreviousTagSize 건너뜀
+    if _read_exact(stream, struct.unpack('>I', header[5:9])[0] - 9 + 4) is None:
+        return
+    while True:
+        head = _read_exact(stream, FLV_TAG_HEADER_SIZE)
+        if head is None:
+            return
+        kind = head[0] & 0x1f
+        size = int.from_bytes(head[1:4], 'big')
+        timestamp = int.from_bytes(head[4:7], 'big') | head[7] << 24
+        body = _read_exact(stream, size)
+        if body is None or _read_exact(stream, 4) is None:
+            return
+        config = (kind == FLV_SCRIPT
+                  or (kind == FLV_VIDEO and size > 1 and body[0] & 0x0f == 7 and body[1] == 0)
+                  or (kind == FLV_AUDIO and size > 1 and body[0] >> 4 == 10 and body[1] == 0))
+        keyframe = kind == FLV_VIDEO and size > 0 and body[0] >> 4 == 1 and not config
+        yield FlvTag(kind, timestamp, head + body, keyframe, config)
+
+
+def mask_url(url):
+    """스트림 키가 드러나지 않도록 마지막 경로를 가린 주소"""
+    base, _, key = url.rpartition('/')
+    return f"{base}/{key[:4]}***" if base and key else url
+
+
+class RelayDestination:
+    """인코딩된 FLV 태그를 하나의 RTMP 주소로 보내는 전송기
+
+    주소마다 재인코딩 없는 ffmpeg(-c copy) 프로세스와 전송 스레드를 따로 두므로, 한 주소가 느리거나
+    끊겨도 다른 주소와 인코더는 기다리지 않습니다 (offer()는 버퍼에 넣기만 함).
+    - 버퍼가 buffer_seconds를 넘으면 가장 오래된 GOP(키프레임부터 다음 키프레임 전까지)를 통째로 버림
+    - 연결이 끊기면 1, 2, 4...초(최대 max_backoff) 뒤 재연결하고, 새 연결은 FLV 헤더와 코덱 설정 뒤
+      버퍼의 가장 최근 키프레임부터 타임스탬프를 0으로 맞춰 전송
+    - 쓰기 하나나 ffmpeg 진행 보고가 STALL_TIMEOUT초 이상 멈추면(응답 없는 서버) ffmpeg를 종료하고 재연결
+    - 인코더가 다시 시작되면(화질 단계 변경) 연결은 유지한 채, 새 인코더의 첫 키프레임부터 새 코덱 설정과 함께
+      직전 프레임 다음 시각으로 이어 붙임 (ffmpeg -c copy가 바뀐 코덱 설정을 출력에 다시 기록)
+    """
+
+    def __init__(self, name, url, ffmpeg=None, buffer_seconds=None, max_backoff=None):
+        self.name = name
+        self.url = url
+        self.ffmpeg = ffmpeg or Config.FFMPEG_PATH
+        self.buffer_seconds = buffer_seconds or Config.STREAM_RELAY_BUFFER
+        self.max_backoff = max_backoff or Config.STREAM_RECONNECT_MAX_DELAY
+        self.state = STATE_CONNECTING
+        self.process = None
+        self.last_error = None
+        self.reconnects = 0
+        self.dropped_gops = 0
+        self.dropped_tags = 0
+        self.bytes_sent = 0
+        self._queue = collections.deque()
+        self._cond = threading.Condition()
+        self._init_tags = {}       # (태그 종류, 첫 바이트 상위 4비트) -> 최근 config 태그
+        self._generation = None
+        self._splice = False       # 새 인코더의 첫 키프레임부터 이어 붙여야 함
+        self.splices = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._stderr_thread = None
+        self._progress_thread = None
+        self._stalled = False
+        self._writing_since = None
+        self._progress_at = None
+        self._connected_at = None
+        self._connected_bytes = 0
+        self._stderr_tail = collections.deque(maxlen=STDERR_TAIL_LINES)
+
+    def command(self):
+        """ffmpeg 실행 인자 (FLV 그대로 복사하여 RTMP로 전송)
+
+        입력 파이프에 쓰기가 성공해도 연결되었다는 뜻은 아니므로(파이프 버퍼), 출력을 연 뒤에만 나오는
+        진행 보고(-progress)를 표준 출력으로 받아 연결 여부를 판단합니다.
+        """
+        return [self.ffmpeg, '-hide_banner', '-loglevel', 'warning', '-nostats', '-progress', 'pipe:1', '-y',
+                '-f', 'flv', '-i', 'pipe:0', '-c', 'copy', '-f', 'flv', self.url]
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f'relay-{self.name}', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        """버퍼에 남은 태그를 보낸 뒤 연결 종료 (timeout 안에 못 보내면 ffmpeg 강제 종료)"""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            process = self.process
+            if self._thread.is_alive() and process is not None:
+                process.kill()
+                self._thread.join(timeout)
+
+    def switch(self, generation):
+        """새 인코더로 전환 (이후 이전 세대 태그는 버림)
+
+        이전 인코더는 입력이 닫히면 남은 출력(무음 오디오 등)을 한꺼번에 내보내므로, 새 인코더를 시작할 때 바로
+        전환해야 그 출력이 이어 붙일 시각을 뒤로 밀지 않습니다.
+        """
+        with self._cond:
+            self._switch(generation)
+            self._cond.notify_all()
+
+    def _switch(self, generation):
+        if generation == self._generation:
+            return
+        # 이전 코덱 설정과 태그는 새 스트림과 섞을 수 없음
+        if self._generation is not None:
+            self._splice = True
+        self._generation = generation
+        self._init_tags = {}
+        self._queue.clear()
+
+    def offer(self, tag, generation):
+        """인코더 출력 태그 추가 (기다리지 않음, 버퍼가 넘치면 오래된 GOP를 버림)"""
+        with self._cond:
+            if self._generation is not None and generation < self._generation:
+                # 교체되어 종료 중인 이전 인코더의 남은 출력
+                return
+            self._switch(generation)
+            if tag.config:
+                self._init_tags[(tag.kind, tag.data[FLV_TAG_HEADER_SIZE] >> 4)] = tag
+            else:
+                self._queue.append(tag)
+                self._trim()
+            self._cond.notify_all()
+        self._check_stall()
+
+    def _trim(self):
+        limit = self.buffer_seconds * 1000
+        while self._queue and self._queue[-1].timestamp - self._queue[0].timestamp > limit:
+            self._queue.popleft()
+            self.dropped_tags += 1
+            while self._queue and not self._queue[0].keyframe:
+                self._queue.popleft()
+                self.dropped_tags += 1
+            self.dropped_gops += 1
+
+    def _check_stall(self):
+        writing_since, progress_at, process = self._writing_since, self._progress_at, self.process
+        if process is None:
+            return
+        # 서버가 받지 않으면 ffmpeg 출력 쓰기가 먼저 멈추고(진행 보고 중단), 입력 파이프가 찬 뒤에야 쓰기가 멈춤
+        now = time.monotonic()
+        if (writing_since is not None and now - writing_since > STALL_TIMEOUT) or \
+                (progress_at is not None and now - progress_at > STALL_TIMEOUT):
+            self._stalled = True
+            process.kill()
+
+    def _pop_latest_keyframe(self):
+        # 버퍼의 가장 최근 키프레임과 코덱 설정 (그 앞 태그는 버림), 키프레임이 없으면 None (_cond 안에서 호출)
+        keyframes = [index for index, tag in enumerate(self._queue) if tag.keyframe]
+        if not keyframes:
+            return None
+        for _ in range(keyframes[-1]):
+            self._queue.popleft()
+            self.dropped_tags += 1
+        self._splice = False
+        return self._queue.popleft(), list(self._init_tags.values())
+
+    def _take_latest_keyframe(self):
+        """버퍼의 가장 최근 키프레임까지 기다려 꺼냄 (그 앞 태그는 버림). 중지되면 None"""
+        with self._cond:
+            while not self._stop.is_set():
+                first = self._pop_latest_keyframe()
+                if first is not None:
+                    return first
+                self._cond.wait(0.5)
+            return None
+
+    def _next_tag(self):
+        """다음 (태그, 코덱 설정). 코덱 설정은 인코더가 바뀌어 이어 붙일 때만 있고 평소에는 None
+
+        중지 요청 후 버퍼를 다 보냈으면(이어 붙일 키프레임을 기다리는 중이면 바로) None
+        """
+        with self._cond:
+            while True:
+                if self._splice:
+                    spliced = self._pop_latest_keyframe()
+                    if spliced is not None:
+                        return spliced
+                elif self._queue:
+                    return self._queue.popleft(), None
+                if self._stop.is_set():
+                    return None
+                self._cond.wait(0.5)
+
+    def _write(self, tag, timestamp):
+        data = tag.data
+        header = bytearray(data[:FLV_TAG_HEADER_SIZE])
+        header[4:7] = (timestamp & 0xffffff).to_bytes(3, 'big')
+        header[7] = timestamp >> 24 & 0xff
+        self._writing_since = time.monotonic()
+        stdin = self.process.stdin
+        stdin.write(header)
+        stdin.write(memoryview(data)[FLV_TAG_HEADER_SIZE:])
+        stdin.write(struct.pack('>I', len(data)))
+        stdin.flush()
+        self._writing_since = None
+        self.bytes_sent += len(data) + 4
+
+    def _drain_stderr(self, process):
+        for line in process.stderr:
+            self._stderr_tail.append(line.decode('utf-8', 'replace').rstrip())
+
+    def _watch_progress(self, process):
+        for line in process.stdout:
+            if not line.startswith(b'progress=') or process is not self.process:
+                continue
+            self._progress_at = time.monotonic()
+            if self._connected_at is None:
+                self._connected_at = self._progress_at
+                self._connected_bytes = self.bytes_sent
+                self.state = STATE_LIVE
+
+    def _stream(self):
+        """한 번의 연결: 첫 키프레임부터 중지/오류까지 전송 (인코더가 바뀌어도 연결 유지)"""
+        self.state = STATE_CONNECTING
+        first = self._take_latest_keyframe()
+        if first is None:
+            return
+        keyframe, init_tags = first
+        self._stderr_tail.clear()
+        self._stalled = False
+        self.process = subprocess.Popen(self.command(), stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self._stderr_thread = threading.Thread(target=self._drain_stderr, args=(self.process,),
+                                               name=f'relay-{self.name}-stderr', daemon=True)
+        self._stderr_thread.start()
+        self._progress_thread = threading.Thread(target=self._watch_progress, args=(self.process,),
+                                                 name=f'relay-{self.name}-progress', daemon=True)
+        self._progress_thread.start()
+        self.process.stdin.write(FLV_FILE_HEADER)
+        for tag in init_tags:
+            self._write(tag, 0)
+        base = keyframe.timestamp
+        self._write(keyframe, 0)
+        floor = last = last_video = 0
+        interval = SPLICE_GAP_MS
+        while True:
+            item = self._next_tag()
+            if item is None:
+                return
+            tag, splice_tags = item
+            if splice_tags is not None:
+                # 새 인코더: 연결은 그대로 두고 새 코덱 설정을 보낸 뒤 직전 프레임 다음 시각부터 이어 붙임
+                floor = last + interval
+                for init_tag in splice_tags:
+                    self._write(init_tag, floor)
+                base = tag.timestamp - floor
+                self.splices += 1
+            # 키프레임 직전 오디오처럼 기준보다 앞선 태그는 기준 시각으로
+            timestamp = max(floor, tag.timestamp - base)
+            if tag.kind == FLV_VIDEO:
+                if timestamp > last_video:
+                    interval = timestamp - last_video
+                last_video = timestamp
+            last = max(last, timestamp)
+            self._write(tag, timestamp)
+
+    def _close_process(self):
+        process, self.process = self.process, None
+        self._writing_since = self._progress_at = None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(2)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        # 종료 원인을 오류로 남길 수 있도록 stderr를 끝까지 읽음
+        self._stderr_thread.join(1)
+        self._progress_thread.join(1)
+
+    def _run(self):
+        failures = 0
+        while not self._stop.is_set():
+            error = None
+            try:
+                self._stream()
+            except (OSError, ValueError) as e:
+                error = e
+            self._close_process()
+            live_for = time.monotonic() - self._connected_at if self._connected_at else 0
+            self._connected_at = None
+            if error is None or self._stop.is_set():
+                continue
+            if self._stalled:
+                self.last_error = f"{STALL_TIMEOUT:g}초 이상 전송이 멈춰 다시 연결합니다."
+            else:
+                self.last_error = self._stderr_tail[-1] if self._stderr_tail else str(error)
+            failures = 1 if live_for >= STABLE_SECONDS else failures + 1
+            self.state = STATE_BACKOFF
+            self._stop.wait(min(self.max_backoff, RECONNECT_MIN_DELAY * 2 ** (failures - 1)))
+            self.reconnects += 1
+        self.state = STATE_STOPPED
+
+    def buffered_seconds(self):
+        with self._cond:
+            if len(self._queue) < 2:
+                return 0.0
+            return (self._queue[-1].timestamp - self._queue[0].timestamp) / 1000
+
+    def health(self):
+        """전송 상태 요약 (상태, 버퍼 초, 전송 속도, 재연결/버린 GOP 수, 마지막 오류)"""
+        connected_for = time.monotonic() - self._connected_at if self._connected_at else 0
+        kbps = (self.bytes_sent - self._connected_bytes) * 8 / 1000 / connected_for if connected_for > 0 else 0.0
+        return {
+            'name': self.name,
+            'url': mask_url(self.url),
+            'state': self.state,
+            'buffered_seconds': self.buffered_seconds(),
+            'kbps': kbps,
+            'bytes_sent': self.bytes_sent,
+            'reconnects': self.reconnects,
+            'splices': self.splices,
+            'dropped_gops': self.dropped_gops,
+            'last_error': self.last_error
+        }
+
+
+class SimulcastSink:
+    """한 번 캡처/인코딩한 스트림을 여러 RTMP 주소로 동시에 보내는 싱크 (FfmpegSink와 같은 인터페이스)
+
+    인코더 ffmpeg 하나가 FLV를 표준 출력으로 내보내면 읽기 스레드가 태그 단위로 나눠 주소별
+    RelayDestination 버퍼에 넣습니다. 주소가 하나 늘 때 추가되는 것은 재인코딩 없는 ffmpeg -c copy
+    프로세스와 태그 전달뿐입니다. (ffmpeg tee muxer는 느린 주소 하나가 전체 출력을 막고 재연결이 없어 사용하지 않음)
+    """
+
+    def __init__(self, destinations, width, height, fps=None, bitrate=None, preset=None, ffmpeg=None,
+                 buffer_seconds=None, max_backoff=None):
+        self.encoder = FfmpegSink(PIPE_OUTPUT, width, height, fps, bitrate, preset, ffmpeg)
+        self.destinations = [
+            RelayDestination(name, url, ffmpeg, buffer_seconds, max_backoff) for name, url in destinations
+        ]
+        self.read_error = None
+        self._readers = []
+        self._generation = 0
+
+    def open(self):
+        for destination in self.destinations:
+            destination.start()
+        self.encoder.open()
+        self._start_reader()
+
+    def _start_reader(self):
+        self._generation += 1
+        for destination in self.destinations:
+            destination.switch(self._generation)
+        reader = threading.Thread(target=self._read_loop, args=(self.encoder.process.stdout, self._generation),
+                                  name='simulcast-reader', daemon=True)
+        self._readers.append(reader)
+        reader.start()
+
+    def _read_loop(self, stdout, generation):
+        try:
+            for tag in read_flv_tags(stdout):
+                for destination in self.destinations:
+                    destination.offer(tag, generation)
+        except (OSError, ValueError) as e:
+            # 교체된 이전 인코더의 출력이 끊긴 것은 오류가 아님
+            if generation == self._generation:
+                self.read_error = f"인코더 출력 읽기 오류: {e}"
+
+    def write(self, frame):
+        self.encoder.write(frame)
+
+    def set_quality(self, level):
+        """화질 단계 적용 (인코더만 교체, 각 주소의 연결은 유지한 채 새 인코더 출력을 이어 붙임)
+
+        이전 인코더는 다른 스레드에서 종료되고, 그 출력을 읽던 스레드는 출력이 끝나면 스스로 끝납니다
+        (주소별 전송기는 이전 세대의 태그를 버림).
+        """
+        running = self.encoder.process is not None
+        self.encoder.set_quality(level)
+        if running:
+            self._readers = [reader for reader in self._readers if reader.is_alive()]
+            self._start_reader()
+
+    def close(self, timeout=5):
+        self.encoder.close(timeout)
+        for reader in self._readers:
+            reader.join(timeout)
+        for destination in self.destinations:
+            destination.stop(timeout)
+
+    def error_output(self):
+        return '\n'.join(filter(None, [self.encoder.error_output(), self.read_error]))
+
+    def health(self):
+        """주소별 전송 상태"""
+        return [destination.health() for destination in self.destinations]
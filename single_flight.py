@@ -0,0 +1,87 @@
+import threading
+
+
+class _Call:
+    """진행 중인 호출 한 건"""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """동일 키의 동시 호출을 하나로 합치는 중복 제거기 (스레드 안전)
+
+    같은 키로 호출이 진행 중이면 새 호출자는 실제 호출 없이 기다렸다가
+    같은 결과(또는 예외)를 받습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """fn() 실행 결과 반환
+
+        Returns:
+            (result, shared): shared 는 결과를 다른 호출자와 공유했는지 여부.
+            공유된 결과를 수정하려면 호출자가 먼저 복사해야 합니다.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, call.waiters > 0
+
+    def stats(self):
+        """실제 실행 횟수 및 합쳐진 호출 수"""
+        with self._lock:
+            return {
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls)
+            }
+
+
+# 프로세스 전역 공유 인스턴스 (여러 Streamlit 세션 간 공유)
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight():
+    """모든 추출기 인스턴스가 공유하는 SingleFlight 반환"""
+    global _single_flight
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+    return _single_flight
@@ -0,0 +1,451 @@
+import collections
+import subprocess
+import threading
+import time
+
+from config import Config
+from frame_pacer import FramePacer
+
+# 키프레임 간격 (초, YouTube 권장 2초)
+KEYFRAME_INTERVAL = 2
+
+# ffmpeg 오류 메시지로 보관할 stderr 마지막 줄 수
+STDERR_TAIL_LINES = 20
+
+# 인코딩 결과를 표준 출력으로 받을 때의 출력 주소 (동시 전송용)
+PIPE_OUTPUT = 'pipe:1'
+
+# 싱크 쓰기 시간 분위수를 계산할 최근 프레임 수 (30fps 기준 약 1초)
+WRITE_TIME_WINDOW = 30
+
+
+def percentile(sorted_values, fraction):
+    """정렬된 값에서 분위수 (값이 없으면 None)"""
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class CameraSource:
+    """cv2.VideoCapture 프레임 소스 (BGR 프레임)"""
+
+    def __init__(self, index=None, width=None, height=None, fps=None, capture=None):
+        # OpenCV는 카메라를 열 때만 로드
+        import cv2
+
+        self.capture = capture if capture is not None else cv2.VideoCapture(Config.CAMERA_INDEX if index is None else index)
+        if not self.capture.isOpened():
+            self.capture.release()
+            raise RuntimeError("카메라를 열 수 없습니다.")
+        self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width or Config.CAMERA_WIDTH)
+        self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height or Config.CAMERA_HEIGHT)
+        self.capture.set(cv2.CAP_PROP_FPS, fps or Config.STREAM_FPS)
+        # 카메라가 요청한 해상도를 지원하지 않을 수 있으므로 실제 값을 사용
+        self.width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH)) or width or Config.CAMERA_WIDTH
+        self.height = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT)) or height or Config.CAMERA_HEIGHT
+        self.fps = fps or Config.STREAM_FPS
+
+    def read(self, out=None):
+        """다음 프레임 (카메라 속도에 맞춰 대기, 실패 시 None)
+
+        out을 주면 새 배열을 만들지 않고 그 버퍼에 디코딩합니다.
+        """
+        ok, frame = self.capture.read(image=out) if out is not None else self.capture.read()
+        if not ok:
+            return None
+        if out is not None and frame is not out:
+            # 실제 프레임 크기가 버퍼와 달라 OpenCV가 새 배열을 만든 경우
+            raise RuntimeError(f"카메라 프레임 크기 {frame.shape}가 버퍼 {out.shape}와 다릅니다.")
+        return frame
+
+    def close(self):
+        self.capture.release()
+
+
+class SyntheticSource:
+    """카메라 없이 테스트/벤치마크용 프레임 생성 (fps 간격으로 프레임 반환)"""
+
+    def __init__(self, width=None, height=None, fps=None):
+        import numpy as np
+
+        self.width = width or Config.CAMERA_WIDTH
+        self.height = height or Config.CAMERA_HEIGHT
+        self.fps = fps or Config.STREAM_FPS
+        # 가로 그라데이션 위로 흰 막대가 움직이는 화면
+        gradient = np.linspace(0, 255, self.width, dtype=np.uint8)
+        self._base = np.repeat(np.broadcast_to(gradient[None, :, None], (self.height, self.width, 1)), 3, axis=2)
+        self._index = 0
+        self._next_at = None
+
+    def read(self, out=None):
+        # 실제 카메라처럼 프레임 간격만큼 대기
+        now = time.monotonic()
+        if self._next_at is None:
+            self._next_at = now
+        elif now < self._next_at:
+            time.sleep(self._next_at - now)
+        self._next_at = max(self._next_at + 1 / self.fps, time.monotonic() - 1 / self.fps)
+
+        if out is None:
+            frame = self._base.copy()
+        else:
+            frame = out
+            frame[...] = self._base
+        x = (self._index * 8) % self.width
+        frame[:, x:x + 16] = 255
+        self._index += 1
+        return frame
+
+    def close(self):
+        pass
+
+
+class FfmpegSink:
+    """원시 BGR 프레임을 ffmpeg stdin으로 보내 H.264/FLV로 인코딩 후 RTMP(또는 파일)로 전송"""
+
+    def __init__(self, output, width, height, fps=None, bitrate=None, preset=None, ffmpeg=None, silent_audio=True,
+                 output_height=None):
+        self.output = output
+        self.width = width
+        self.height = height
+        # 입력보다 낮은 세로 해상도로 전송할 때 ffmpeg에서 축소 (가로는 비율 유지)
+        self.output_height = output_height
+        self.fps = fps or Config.STREAM_FPS
+        self.bitrate = int(bitrate or Config.STREAM_BITRATE)
+        self.preset = preset or Config.STREAM_PRESET
+        self.ffmpeg = ffmpeg or Config.FFMPEG_PATH
+        # YouTube는 오디오 트랙이 없으면 경고하므로 무음 트랙을 함께 전송
+        self.silent_audio = silent_audio
+        self.process = None
+        # 화질 단계 변경으로 교체되어 종료 중인 이전 ffmpeg 스레드
+        self._retiring = []
+        self._closing = False
+        self._lock = threading.Lock()
+        self._stderr_tail = collections.deque(maxlen=STDERR_TAIL_LINES)
+
+    def command(self):
+        """ffmpeg 실행 인자"""
+        command = [
+            self.ffmpeg, '-hide_banner', '-loglevel', 'warning', '-y',
+            '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f'{self.width}x{self.height}',
+            '-r', str(self.fps), '-i', '-'
+        ]
+        if self.silent_audio:
+            command += ['-f', 'lavfi', '-i', 'anullsrc=channel_layout=stereo:sample_rate=44100']
+        if self.output_height and self.output_height < self.height:
+            command += ['-vf', f'scale=-2:{self.output_height}']
+        command += [
+            '-c:v', 'libx264', '-preset', self.preset, '-tune', 'zerolatency', '-pix_fmt', 'yuv420p',
+            '-b:v', f'{self.bitrate}k', '-maxrate', f'{self.bitrate}k', '-bufsize', f'{self.bitrate * 2}k',
+            '-g', str(self.fps * KEYFRAME_INTERVAL)
+        ]
+        if self.silent_audio:
+            command += ['-c:a', 'aac', '-b:a', '128k', '-shortest']
+        if self.output == PIPE_OUTPUT:
+            # 파이프에서는 헤더의 길이/크기를 나중에 고쳐 쓸 수 없으므로 생략
+            command += ['-flvflags', 'no_duration_filesize']
+        return command + ['-f', 'flv', self.output]
+
+    def set_quality(self, level):
+        """화질 단계(비트레이트/해상도/fps) 적용. 전송 중이면 ffmpeg를 새 설정으로 교체
+
+        인코더 스레드를 멈추지 않도록 이전 ffmpeg는 다른 스레드에서 종료합니다.
+        - 파이프 출력(SimulcastSink): 새 ffmpeg를 바로 시작하여 다음 프레임부터 새 ffmpeg에 기록
+        - RTMP/파일 직접 출력: 같은 출력을 두 프로세스가 동시에 열 수 없으므로 이전 ffmpeg가 끝난 뒤 다시 열며,
+          그 사이 프레임은 버림 (출력 연결도 다시 맺으므로 연결을 유지하려면 SimulcastSink 사용)
+        """
+        self.fps, self.bitrate, self.output_height = level.fps, level.bitrate, level.height
+        old = self.process
+        if old is None:
+            return
+        reopen = self.output != PIPE_OUTPUT
+        self.process = None if reopen else self._spawn()
+        thread = threading.Thread(target=self._retire, args=(old, reopen), name='ffmpeg-retire', daemon=True)
+        self._retiring = [item for item in self._retiring if item.is_alive()] + [thread]
+        thread.start()
+
+    def _retire(self, process, reopen):
+        self._close_process(process)
+        with self._lock:
+            if reopen and not self._closing:
+                self.process = self._spawn()
+
+    def open(self):
+        self._closing = False
+        self.process = self._spawn()
+
+    def _spawn(self):
+        stdout = subprocess.PIPE if self.output == PIPE_OUTPUT else subprocess.DEVNULL
+        process = subprocess.Popen(self.command(), stdin=subprocess.PIPE, stdout=stdout, stderr=subprocess.PIPE)
+        self._stderr_tail.clear()
+        # stderr를 읽지 않으면 파이프가 가득 차 ffmpeg가 멈추므로 별도 스레드에서 비움
+        threading.Thread(target=self._drain_stderr, args=(process,), name='ffmpeg-stderr', daemon=True).start()
+        return process
+
+    def _drain_stderr(self, process):
+        for line in process.stderr:
+            # 교체된 이전 ffmpeg의 종료 메시지는 현재 오류로 보이지 않도록 제외
+            if process is self.process:
+                self._stderr_tail.append(line.decode('utf-8', 'replace').rstrip())
+
+    def write(self, frame):
+        """프레임 한 장 전송 (ffmpeg가 종료되었으면 BrokenPipeError/OSError)"""
+        process = self.process
+        if process is None:
+            # 직접 출력의 ffmpeg 교체 중
+            return
+        process.stdin.write(memoryview(frame).cast('B'))
+
+    def close(self, timeout=5):
+        """입력을 닫아 남은 프레임을 인코딩하게 한 뒤 종료 대기 (시간 초과 시 강제 종료)"""
+        with self._lock:
+            self._closing = True
+        for thread in self._retiring:
+            thread.join(timeout)
+        if self.process is not None:
+            self._close_process(self.process, timeout)
+
+    @staticmethod
+    def _close_process(process, timeout=5):
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def error_output(self):
+        """ffmpeg stderr 마지막 줄들"""
+        return '\n'.join(self._stderr_tail)
+
+
+class RawFileSink:
+    """ffmpeg 없이 원시 프레임을 파일에 그대로 기록 (테스트/벤치마크용 파일 싱크)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.bytes_written = 0
+        self.quality = None
+        self._file = None
+
+    def open(self):
+        self._file = open(self.path, 'wb')
+
+    def write(self, frame):
+        self.bytes_written += self._file.write(memoryview(frame).cast('B'))
+
+    def set_quality(self, level):
+        # 원시 프레임은 그대로 기록하고 적용된 단계만 보관
+        self.quality = level
+
+    def close(self, timeout=None):
+        if self._file is not None:
+            self._file.close()
+
+    def error_output(self):
+        return ''
+
+
+class StreamPipeline:
+    """캡처 스레드 -> 프레임 링 버퍼 -> 인코더 스레드(싱크) 스트리밍 파이프라인
+
+    - 프레임은 미리 할당한 슬롯에 바로 캡처하고 슬롯 뷰 그대로 싱크에 전달 (프레임마다 할당/복사 없음)
+    - 인코더 스레드는 FramePacer 틱(fps)마다 한 프레임을 전송: 가장 최근 프레임을 보내고 그 사이 쌓인
+      프레임은 건너뛰며, 새 프레임이 없으면 직전 프레임을 반복 (카메라가 빠르거나 느리거나 몰려 들어와도 출력 fps 일정)
+    - 인코더가 따라오지 못해 슬롯이 모두 차면 가장 오래된 프레임을 버려 지연이 쌓이지 않게 함
+    - 프레임별 캡처 시각부터 싱크 기록 완료까지의 지연과 초당 전송 프레임 수를 집계
+    - 싱크 오류(ffmpeg 종료, RTMP 연결 끊김) 시 파이프라인을 멈추고 error에 원인 기록
+    - controller(QualityController)를 주면 일정 간격으로 지표를 넘겨 화질 단계(출력 fps 포함)를 바꿈
+    """
+
+    def __init__(self, source, sink, queue_size=None, max_frames=None, controller=None, adapt_interval=None,
+                 fps=None):
+        self.source = source
+        self.sink = sink
+        # 출력 fps (싱크의 입력 fps와 같아야 함)
+        self.fps = fps or Config.STREAM_FPS
+        self.pacer = FramePacer(self.fps)
+        self.queue_size = queue_size or Config.STREAM_QUEUE_SIZE
+        # 지정한 프레임 수만큼 캡처 후 자동 종료 (테스트/벤치마크용)
+        self.max_frames = max_frames
+        self.controller = controller
+        self.adapt_interval = adapt_interval or Config.STREAM_ADAPT_INTERVAL
+        self.error = None
+        self.ring = None
+        self._stop = threading.Event()
+        self._finished = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._latencies = collections.deque(maxlen=1000)
+        self._write_times = collections.deque(maxlen=WRITE_TIME_WINDOW)
+        self._pending_level = None
+        self.frames_captured = 0
+        self.frames_encoded = 0
+        self.frames_repeated = 0
+        self._started_at = None
+        self._finished_at = None
+
+    @property
+    def running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self):
+        """싱크(ffmpeg)를 열고 캡처/인코더 스레드 시작
+
+        스레드를 시작하기 전에 실패하면 소스(카메라)와 싱크를 닫은 뒤 예외를 다시 발생시킵니다.
+        """
+        # numpy는 스트리밍을 시작할 때만 로드
+        from frame_ring import FrameRing
+        
+        try:
+            # 대기 프레임 queue_size개 + 캡처 중 1개 + 전송 중 1개
+            self.ring = FrameRing(self.queue_size + 2, (self.source.height, self.source.width, 3))
+            if self.controller is not None:
+                self._apply_level(self.controller.level)
+            self.sink.open()
+        except Exception:
+            # 평소에는 캡처/인코더 스레드가 닫지만 스레드가 없으므로 여기서 닫음 (카메라가 잠긴 채 남지 않도록)
+            self.sink.close()
+            self.source.close()
+            raise
+        self._started_at = time.monotonic()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name='stream-capture', daemon=True),
+            threading.Thread(target=self._encode_loop, name='stream-encode', daemon=True)
+        ]
+        if self.controller is not None:
+            self._threads.append(threading.Thread(target=self._adapt_loop, name='stream-quality', daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=5):
+        """캡처를 멈추고 큐에 남은 프레임까지 전송한 뒤 싱크/소스 닫기"""
+        self._stop.set()
+        self.join(timeout)
+
+    def join(self, timeout=None):
+        """파이프라인 종료 대기"""
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _capture_loop(self):
+        try:
+            while not self._stop.is_set():
+                if self.max_frames is not None and self.frames_captured >= self.max_frames:
+                    break
+                # 빈 슬롯에 바로 캡처 (슬롯이 모두 차 있으면 가장 오래된 대기 프레임을 덮어씀)
+                index, slot = self.ring.acquire()
+                try:
+                    frame = self.source.read(out=slot)
+                except Exception:
+                    self.ring.release(index)
+                    raise
+                if frame is None:
+                    self.ring.release(index)
+                    self.error = self.error or "카메라에서 프레임을 읽을 수 없습니다."
+                    break
+                self.frames_captured += 1
+                self.ring.publish(index, time.monotonic())
+        except Exception as e:
+            self.error = self.error or f"캡처 오류: {e}"
+        finally:
+            # 소스는 읽는 스레드에서 닫고, 인코더 스레드에 종료 신호 전달
+            self.source.close()
+            self.ring.close()
+
+    def _apply_level(self, level):
+        """싱크에 화질 단계를 적용하고 출력 간격을 단계 fps로 변경 (파이프라인 fps보다 높이지 않음)"""
+        level = level._replace(fps=min(level.fps, self.fps))
+        self.sink.set_quality(level)
+        self.pacer.set_fps(level.fps)
+        with self._lock:
+            # 이전 단계의 쓰기 시간이 새 단계 판단에 섞이지 않도록
+            self._write_times.clear()
+
+    def _adapt_loop(self):
+        # 인코더가 끝날 때까지 일정 간격으로 지표를 넘기고, 바뀐 단계는 인코더 스레드가 적용
+        while not self._finished.wait(self.adapt_interval):
+            level = self.controller.observe(self.stats())
+            if level is not None:
+                self._pending_level = level
+
+    def _encode_loop(self):
+        # 반복 전송을 위해 마지막으로 보낸 프레임의 슬롯은 새 프레임이 올 때까지 붙잡아 둠
+        current = self.ring.get()
+        try:
+            if current is None:
+                return
+            self.pacer.start()
+            fresh = True
+            while True:
+                level, self._pending_level = self._pending_level, None
+                if level is not None:
+                    self._apply_level(level)
+                self.pacer.wait()
+                item = self.ring.get_latest(timeout=0)
+                if item is None and not self.ring.closed:
+                    # 틱 직후에 도착하는 프레임을 반복 대신 보내도록 잠시 대기
+                    item = self.ring.get_latest(timeout=self.pacer.grace_seconds)
+                if item is not None:
+                    self.ring.release(current[0])
+                    current, fresh = item, True
+                elif self._stop.is_set() or (self.ring.closed and not self.ring.pending()):
+                    break
+                index, frame, captured_at = current
+                # 출력 간격은 틱이 아니라 싱크에 넘기는 시각으로 집계 (반복 전 대기 시간 포함)
+                self.pacer.record()
+                write_started = time.monotonic()
+                # 슬롯 뷰를 복사 없이 ffmpeg 파이프에 기록
+                self.sink.write(frame)
+                written = time.monotonic()
+                with self._lock:
+                    self.frames_encoded += 1
+                    self._write_times.append(written - write_started)
+                    if fresh:
+                        self._latencies.append(written - captured_at)
+                    else:
+                        self.frames_repeated += 1
+                fresh = False
+        except (OSError, ValueError) as e:
+            detail = self.sink.error_output()
+            self.error = f"인코더 오류: {e}" + (f"\n{detail}" if detail else '')
+            self._stop.set()
+        finally:
+            if current is not None:
+                self.ring.release(current[0])
+            self._finished_at = time.monotonic()
+            self._finished.set()
+            self.sink.close()
+
+    def stats(self):
+        """전송 프레임 수, 초당 프레임, 지연/싱크 쓰기 시간(ms) 분위수, 버린/반복 프레임 수, 출력 간격 흔들림, 화질 단계"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            write_times = sorted(self._write_times)
+            encoded = self.frames_encoded
+        elapsed = ((self._finished_at or time.monotonic()) - self._started_at) if self._started_at else 0
+        to_ms = lambda value: None if value is None else value * 1000
+        return {
+            'running': self.running,
+            'frames_captured': self.frames_captured,
+            'frames_encoded': encoded,
+            'frames_dropped': self.ring.dropped if self.ring is not None else 0,
+            'frames_skipped': self.ring.superseded if self.ring is not None else 0,
+            'frames_repeated': self.frames_repeated,
+            'queue_depth': self.ring.pending() if self.ring is not None else 0,
+            'queue_size': self.queue_size,
+            'fps': encoded / elapsed if elapsed else 0.0,
+            'latency_p50_ms': to_ms(percentile(latencies, 0.50)),
+            'latency_p95_ms': to_ms(percentile(latencies, 0.95)),
+            'latency_p99_ms': to_ms(percentile(latencies, 0.99)),
+            'write_avg_ms': to_ms(sum(write_times) / len(write_times)) if write_times else None,
+            'write_p95_ms': to_ms(percentile(write_times, 0.95)),
+            'jitter_p99_ms': self.pacer.jitter.quantile(0.99),
+            'drift_ms': self.pacer.drift_ms,
+            'pacer_rebases': self.pacer.rebases,
+            'quality': self.controller.level.name if self.controller is not None else None,
+            'error': self.error
+        }
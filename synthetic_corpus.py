@@ -0,0 +1,141 @@
+import base64
+import gzip
+import json
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+from video_record import DESCRIPTION_LIMIT, VideoRecord
+
+# 언어별 제목/설명 구성 요소 (국가 코드, 주제, 수식어, 설명 문장)
+LANGUAGES = {
+    'ko': {
+        'regions': ('KR',),
+        'topics': ('후지산', '서울 야경', '파이썬 강의', '제주도 여행', '벚꽃', '한강', '라면 먹방', '캠핑',
+                   '축구 하이라이트', '데이터 분석', '머신러닝', '고양이', 'K-POP 커버', '부산 바다', '등산'),
+        'modifiers': ('실시간', '브이로그', '완전 정복', '초보자를 위한', '4K', '하이라이트', '라이브', '리뷰'),
+        'sentences': ('오늘은 {topic}을(를) 소개합니다.', '{topic} 관련 영상을 매주 올리고 있어요.',
+                      '구독과 좋아요 부탁드립니다.', '{topic}의 모든 것을 담았습니다.', '실제 촬영 영상입니다.')
+    },
+    'ja': {
+        'regions': ('JP',),
+        'topics': ('富士山', '東京タワー', '桜', '温泉', 'ラーメン', '渋谷スクランブル交差点', '京都', '鉄道',
+                   'アニメ', '猫', '花火大会', '北海道'),
+        'modifiers': ('ライブカメラ', '生配信', '24時間', '絶景', 'ガイド', 'まとめ', '4K'),
+        'sentences': ('{topic}の様子をお届けします。', 'チャンネル登録お願いします。', '{topic}を24時間配信中。',
+                      '今日の{topic}はとてもきれいです。')
+    },
+    'en': {
+        'regions': ('US', 'GB', 'CA', 'AU', 'IN', 'PH'),
+        'topics': ('Mount Fuji', 'Python tutorial', 'New York City', 'lo-fi beats', 'cooking', 'football',
+                   'space launch', 'gaming', 'wildlife', 'London walk', 'React course', 'travel vlog'),
+        'modifiers': ('LIVE', 'full course', 'for beginners', '24/7', 'highlights', 'in 4K', 'explained'),
+        'sentences': ('Welcome to our {topic} channel.', 'Watch {topic} live every day.',
+                      "Don't forget to subscribe.", 'Everything you need to know about {topic}.')
+    },
+    'es': {
+        'regions': ('ES', 'MX'),
+        'topics': ('fútbol', 'recetas', 'música', 'viajes', 'noticias', 'playa'),
+        'modifiers': ('EN VIVO', 'completo', 'resumen', 'tutorial'),
+        'sentences': ('Bienvenidos a {topic}.', 'Suscríbete para más videos de {topic}.')
+    },
+    'de': {
+        'regions': ('DE',),
+        'topics': ('Fußball', 'Berlin', 'Kochen', 'Nachrichten', 'Alpen'),
+        'modifiers': ('LIVE', 'Tutorial', 'Zusammenfassung'),
+        'sentences': ('Willkommen bei {topic}.', 'Alles über {topic}.')
+    },
+    'th': {
+        'regions': ('TH',),
+        'topics': ('กรุงเทพ', 'อาหารไทย', 'ทะเล', 'ข่าว'),
+        'modifiers': ('ถ่ายทอดสด', 'รีวิว'),
+        'sentences': ('ยินดีต้อนรับสู่ {topic}', 'กดติดตามด้วยนะครับ')
+    }
+}
+
+# 언어 비중 (한국어/일본어/영어 위주)
+LANGUAGE_WEIGHTS = {'ko': 0.35, 'ja': 0.25, 'en': 0.25, 'es': 0.07, 'de': 0.04, 'th': 0.04}
+
+
+def _video_id(rng):
+    """YouTube 형식의 11자리 영상 id"""
+    return base64.urlsafe_b64encode(rng.getrandbits(72).to_bytes(9, 'big')).decode('ascii')[:11]
+
+
+def _view_count(rng, is_live):
+    """조회수 분포: 대부분 수백~수천, 일부 영상만 수백만 이상 (파레토 분포)"""
+    views = int(300 * rng.paretovariate(0.7))
+    # 라이브는 동시 시청 중심이라 누적 조회수가 상대적으로 낮음
+    return min(views // 3 if is_live else views, 5_000_000_000)
+
+
+def generate_records(count, seed=0, live_ratio=0.15, channels=None, end=None):
+    """search_videos 결과와 같은 형식의 합성 VideoRecord를 순서대로 생성 (메모리에 모두 올리지 않음)
+
+    같은 seed와 count이면 항상 같은 레코드를 생성합니다.
+    """
+    rng = random.Random(seed)
+    languages = list(LANGUAGE_WEIGHTS)
+    weights = list(LANGUAGE_WEIGHTS.values())
+    channels = channels or max(10, int(math.sqrt(count) * 5))
+    end = end or datetime(2024, 7, 13, tzinfo=timezone.utc)
+
+    for _ in range(count):
+        language = LANGUAGES[rng.choices(languages, weights)[0]]
+        topic = rng.choice(language['topics'])
+        is_live = rng.random() < live_ratio
+        title = f"{topic} {rng.choice(language['modifiers'])}"
+        if is_live:
+            title = f"🔴 {title}"
+        description = ' '.join(rng.choice(language['sentences']).format(topic=topic)
+                               for _ in range(rng.randint(1, 4)))[:DESCRIPTION_LIMIT]
+
+        # 채널도 소수 채널에 영상이 몰리도록 편중
+        channel = int(channels * rng.random() ** 2)
+        # 라이브는 최근 시작, 업로드 영상은 최근 2년에 분포
+        age = timedelta(minutes=rng.randint(1, 600)) if is_live else timedelta(seconds=rng.randint(0, 2 * 365 * 86400))
+
+        video_id = _video_id(rng)
+        views = _view_count(rng, is_live)
+        likes = int(views * rng.uniform(0.005, 0.06))
+        comments = int(likes * rng.uniform(0.02, 0.2))
+        yield VideoRecord(
+            video_id=video_id,
+            title=title,
+            description=description,
+            channel_title=f"{topic} Channel {channel}",
+            published_at=(end - age).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            thumbnail_url=f"https://i.ytimg.com/vi/{video_id}/mqdefault.jpg",
+            is_live=is_live,
+            view_count=str(views),
+            like_count=str(likes),
+            comment_count=str(comments),
+            region_code=rng.choice(language['regions'])
+        )
+
+
+def _open(path, mode):
+    # .gz 확장자는 gzip 압축
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def write_corpus(path, count, seed=0, **options):
+    """합성 레코드를 JSONL(.gz)로 스트리밍 저장 후 기록한 개수 반환"""
+    written = 0
+    with _open(path, 'w') as f:
+        for record in generate_records(count, seed, **options):
+            f.write(json.dumps(record.to_dict(), ensure_ascii=False) + '\n')
+            written += 1
+    return written
+
+
+def load_corpus(path, limit=None):
+    """JSONL(.gz) 파일에서 VideoRecord를 순서대로 읽기 (스트리밍)"""
+    with _open(path, 'r') as f:
+        for index, line in enumerate(f):
+            if limit is not None and index >= limit:
+                break
+            if line.strip():
+                yield VideoRecord.from_dict(json.loads(line))
@@ -0,0 +1,208 @@
+import hashlib
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from http_client import create_session
+
+# Pillow가 없으면 원본 이미지를 그대로 캐시
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# 다운로드 실패한 URL은 일정 시간 동안 다시 시도하지 않음 (초)
+FAILURE_TTL = 300
+
+
+def resize_image(data, width):
+    """이미지를 지정한 너비로 축소하여 JPEG 바이트로 반환"""
+    if not PIL_AVAILABLE:
+        return data
+    with Image.open(io.BytesIO(data)) as image:
+        # 이미 충분히 작은 JPEG는 다시 인코딩하지 않음
+        if image.width <= width and image.format == 'JPEG':
+            return data
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            # JPEG는 디코딩 단계에서 축소하여 큰 원본의 디코딩 비용을 줄임
+            image.draft('RGB', (width, height))
+            image = image.convert('RGB').resize((width, height), Image.LANCZOS, reducing_gap=2.0)
+        else:
+            image = image.convert('RGB')
+        output = io.BytesIO()
+        image.save(output, format='JPEG', quality=85, optimize=True)
+        return output.getvalue()
+
+
+class ThumbnailCache:
+    """섬네일 디스크 캐시 (내용 주소 기반, 크기 제한 LRU 제거)
+
+    - objects/<sha256>.jpg : 리사이즈된 이미지 (같은 이미지는 한 번만 저장)
+    - refs/<url 해시>      : URL(+너비) -> 이미지 해시
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None, width=None, session=None, max_workers=None, timeout=None):
+        self.cache_dir = cache_dir or Config.THUMBNAIL_CACHE_DIR
+        self.max_bytes = max_bytes or Config.THUMBNAIL_CACHE_MAX_BYTES
+        self.width = width or Config.THUMBNAIL_WIDTH
+        # 없는/임시 섬네일 주소마다 재시도 x 타임아웃만큼 렌더링이 늦어지지 않도록 재시도 없는 별도 세션 사용
+        self.session = session or create_session(retries=0)
+        self.max_workers = max_workers or Config.THUMBNAIL_WORKERS
+        self.timeout = timeout or Config.THUMBNAIL_TIMEOUT
+        self._objects_dir = os.path.join(self.cache_dir, 'objects')
+        self._refs_dir = os.path.join(self.cache_dir, 'refs')
+        os.makedirs(self._objects_dir, exist_ok=True)
+        os.makedirs(self._refs_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._failures = {}  # url -> 실패 시각
+        self._prefetching = set()  # 백그라운드에서 받는 중인 url
+        self._prefetch_executor = None
+        self.current_bytes = sum(entry.stat().st_size for entry in os.scandir(self._objects_dir))
+
+    def get(self, url):
+        """캐시된 섬네일 바이트 반환 (없으면 None)"""
+        object_path = self._read_ref(url)
+        if object_path is None:
+            return None
+        try:
+            with open(object_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        # LRU 제거 순서를 위해 접근 시각 갱신
+        try:
+            os.utime(object_path)
+        except OSError:
+            pass
+        return data
+
+    def fetch(self, url):
+        """섬네일 반환 (캐시에 없으면 다운로드 후 리사이즈하여 저장)"""
+        if not url:
+            return None
+        data = self.get(url)
+        if data is not None:
+            return data
+
+        failed_at = self._failures.get(url)
+        if failed_at is not None and time.monotonic() - failed_at < FAILURE_TTL:
+            return None
+
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            data = resize_image(response.content, self.width)
+        except Exception:
+            self._failures[url] = time.monotonic()
+            return None
+
+        self._store(url, data)
+        return data
+
+    def fetch_many(self, urls):
+        """여러 섬네일을 동시에 가져오기 ({url: bytes 또는 None})"""
+        urls = [url for url in dict.fromkeys(urls) if url]
+        if not urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls)),
+                                thread_name_prefix='thumbnail') as executor:
+            return dict(zip(urls, executor.map(self.fetch, urls)))
+
+    def prefetch(self, urls):
+        """섬네일을 백그라운드에서 미리 받아 캐시에 저장 (완료를 기다리지 않음)
+
+        다음 페이지 섬네일을 미리 받아 두면 페이지를 넘길 때 로컬 캐시에서 바로 표시됩니다.
+        """
+        with self._lock:
+            urls = [url for url in dict.fromkeys(urls) if url and url not in self._prefetching]
+            if not urls:
+                return
+            self._prefetching.update(urls)
+            if self._prefetch_executor is None:
+                self._prefetch_executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                             thread_name_prefix='thumbnail-prefetch')
+            executor = self._prefetch_executor
+        for url in urls:
+            executor.submit(self._prefetch_one, url)
+
+    def _prefetch_one(self, url):
+        try:
+            self.fetch(url)
+        finally:
+            with self._lock:
+                self._prefetching.discard(url)
+
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            for directory in (self._objects_dir, self._refs_dir):
+                for entry in os.scandir(directory):
+                    os.remove(entry.path)
+            self.current_bytes = 0
+            self._failures.clear()
+
+    def _ref_path(self, url):
+        key = hashlib.sha256(f"{self.width}:{url}".encode('utf-8')).hexdigest()
+        return os.path.join(self._refs_dir, key)
+
+    def _read_ref(self, url):
+        try:
+            with open(self._ref_path(url), 'r') as f:
+                digest = f.read().strip()
+        except OSError:
+            return None
+        object_path = os.path.join(self._objects_dir, f"{digest}.jpg")
+        return object_path if os.path.exists(object_path) else None
+
+    def _store(self, url, data):
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = os.path.join(self._objects_dir, f"{digest}.jpg")
+        with self._lock:
+            if not os.path.exists(object_path):
+                # 임시 파일에 쓴 뒤 교체하여 읽는 쪽이 불완전한 파일을 보지 않도록 함
+                tmp_path = f"{object_path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, object_path)
+                self.current_bytes += len(data)
+            with open(self._ref_path(url), 'w') as f:
+                f.write(digest)
+            if self.current_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """오래 사용하지 않은 이미지부터 크기 제한 이하가 될 때까지 제거"""
+        entries = sorted(
+            (entry for entry in os.scandir(self._objects_dir) if entry.name.endswith('.jpg')),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in entries:
+            if self.current_bytes <= self.max_bytes:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self.current_bytes -= size
+        # 참조하는 이미지가 없는 ref 는 다음 조회 시 캐시 미스로 처리됨
+
+
+# 프로세스 전역 공유 캐시
+_thumbnail_cache = None
+_thumbnail_cache_lock = threading.Lock()
+
+
+def get_thumbnail_cache():
+    """모든 페이지가 공유하는 섬네일 캐시 반환"""
+    global _thumbnail_cache
+    if _thumbnail_cache is None:
+        with _thumbnail_cache_lock:
+            if _thumbnail_cache is None:
+                _thumbnail_cache = ThumbnailCache()
+    return _thumbnail_cache
@@ -3,8 +3,11 @@
 
 import os
 import sys
+import json
 import subprocess
 import argparse
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 def run_command(command):
     """명령어 실행 및 결과 반환"""
@@ -52,10 +55,222 @@ def clean_cache():
             run_command(f'rm -rf {cache_dir}')
             print(f'✅ {cache_dir} 정리 완료')
 
+def load_jobs(jobs_file):
+    """작업 파일에서 (키워드, 국가, 영상 유형) 작업 목록 생성
+
+    작업 파일 형식 (JSON):
+        {"keywords": ["후지산"], "regions": ["JP", "KR"], "event_types": ["live"],
+         "max_results": 50, "order": "relevance", "with_statistics": true}
+    """
+    with open(jobs_file, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+    
+    options = {
+        'max_results': int(spec.get('max_results', 50)),
+        'order': spec.get('order', 'relevance'),
+        'with_statistics': bool(spec.get('with_statistics', True))
+    }
+    jobs = [
+        {'keyword': keyword, 'region_code': region, 'event_type': event_type}
+        for keyword, region, event_type in itertools.product(
+            spec['keywords'], spec.get('regions', ['KR']), spec.get('event_types', ['video'])
+        )
+    ]
+    return jobs, options
+
+def job_id(job, options):
+    """체크포인트용 작업 식별자 (작업 파일의 모든 항목 포함, 옵션이 바뀌면 다른 작업)"""
+    return json.dumps([job['keyword'], job['region_code'], job['event_type'],
+                       options['max_results'], options['order'], options['with_statistics']],
+                      ensure_ascii=False)
+
+def job_label(job):
+    """진행 상황 출력용 작업 이름"""
+    return f"{job['keyword']}|{job['region_code']}|{job['event_type']}"
+
+def load_checkpoint(checkpoint_file):
+    """완료된 작업 식별자 목록 로드"""
+    if not os.path.exists(checkpoint_file):
+        return set()
+    with open(checkpoint_file, 'r', encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.strip()}
+
+def run_extract_job(extractor, job, options):
+    """작업 한 건 실행 후 (작업, 레코드 목록, 오류) 반환"""
+    try:
+        videos = list(extractor.iter_search(
+            job['keyword'], job['region_code'], options['order'], job['event_type'],
+            limit=options['max_results']
+        ))
+        if options['with_statistics'] and videos:
+            stats_by_id = extractor.get_video_statistics_bulk(video['video_id'] for video in videos)
+            for video in videos:
+                video.update(stats_by_id.get(video['video_id'], {}))
+    except Exception as e:
+        return job, [], str(e)
+    
+    records = []
+    for rank, video in enumerate(videos, 1):
+        record = dict(video.to_dict() if hasattr(video, 'to_dict') else video)
+        record.update(job, rank=rank)
+        records.append(record)
+    return job, records, None
+
+def extract_videos(jobs_file, output, output_format='jsonl', workers=4, checkpoint_file=None):
+    """브라우저 없이 여러 키워드/국가/영상 유형을 병렬 수집
+
+    결과는 작업이 끝나는 대로 기록하고 마지막에 작업 파일 순서로 정리하며, 완료된 작업은 체크포인트에 남겨
+    중단 후 다시 실행하면 남은 작업만 수행합니다 (할당량 재사용 방지).
+    JSONL은 실행이 끝날 때 이어 쓴 결과까지 작업 파일 순서로 정리하고 중복 기록을 제거합니다.
+    """
+    # Streamlit 페이지 모듈은 extract 명령에서만 로드
+    from config import Config
+    from quota_scheduler import PRIORITY_BACKGROUND
+    from youtube_video_extractor import YouTubeVideoExtractor
+    
+    api_key = Config.YOUTUBE_API_KEY
+    if not api_key:
+        print('❌ YOUTUBE_API_KEY가 설정되지 않았습니다.')
+        return False
+    
+    jobs, options = load_jobs(jobs_file)
+    checkpoint_file = checkpoint_file or f"{output}.checkpoint"
+    completed = load_checkpoint(checkpoint_file)
+    # 작업 순번은 Parquet 파일명에 사용
+    pending = [(index, job) for index, job in enumerate(jobs) if job_id(job, options) not in completed]
+    print(f'📦 작업 {len(jobs)}개 중 {len(pending)}개 실행 (완료 {len(jobs) - len(pending)}개 건너뜀)')
+    
+    if output_format == 'parquet':
+        os.makedirs(output, exist_ok=True)
+    else:
+        truncate_partial_line(output)
+    
+    # 야간 수집 작업은 대화형 검색보다 낮은 우선순위로 할당량 사용
+    extractor = YouTubeVideoExtractor(api_key, priority=PRIORITY_BACKGROUND)
+    failed = 0
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor, \
+            open(checkpoint_file, 'a', encoding='utf-8') as checkpoint:
+        out = open(output, 'a', encoding='utf-8') if output_format == 'jsonl' else None
+        try:
+            futures = {executor.submit(run_extract_job, extractor, job, options): index for index, job in pending}
+            # 끝난 작업부터 바로 기록/완료 표시 (앞 작업이 느려도 결과를 메모리에 쌓아 두지 않음)
+            # 출력 순서는 JSONL은 finalize_jsonl()이, Parquet은 작업 순번 파일명이 맞춤
+            for future in as_completed(futures):
+                index = futures[future]
+                job, records, error = future.result()
+                if error:
+                    failed += 1
+                    print(f'❌ {job_label(job)}: {error}')
+                    continue
+                
+                if out is not None:
+                    for record in records:
+                        out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    out.flush()
+                else:
+                    write_parquet_part(output, index, records)
+                
+                # 결과를 기록한 뒤에 완료 표시
+                checkpoint.write(job_id(job, options) + '\n')
+                checkpoint.flush()
+                print(f'✅ {job_label(job)}: {len(records)}개')
+        finally:
+            if out is not None:
+                out.close()
+    
+    if output_format == 'jsonl':
+        # 이어서 실행한 작업/재시도한 작업이 뒤에 붙으므로 작업 파일 순서로 다시 정리
+        finalize_jsonl(output, jobs)
+    
+    print(f'🏁 수집 완료 (실패 {failed}개)')
+    return failed == 0
+
+def truncate_partial_line(path):
+    """중단되어 줄바꿈 없이 끝난 마지막 레코드 제거 (이어 쓴 레코드와 한 줄로 붙지 않도록)"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        # 파일 끝에서부터 거꾸로 읽어 마지막 줄바꿈 위치를 찾음
+        position = end
+        while position > 0:
+            start = max(0, position - 65536)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b'\n')
+            if newline >= 0:
+                position = start + newline + 1
+                break
+            position = start
+        if position < end:
+            f.truncate(position)
+
+def finalize_jsonl(output, jobs):
+    """JSONL 결과를 작업 파일 순서(작업 내에서는 순위 순)로 다시 기록
+
+    결과 기록 후 체크포인트 기록 전에 중단되면 다음 실행에서 같은 작업이 다시 기록되므로,
+    작업마다 마지막으로 기록된 결과(순위 1부터 시작하는 묶음)만 남깁니다.
+    작업 파일에 없는 작업의 결과는 기존 순서대로 뒤에 둡니다.
+    """
+    if not os.path.exists(output):
+        return
+    order = {(job['keyword'], job['region_code'], job['event_type']): index
+             for index, job in enumerate(jobs)}
+    # 작업 한 건의 레코드는 연속으로 기록되므로 레코드 대신 마지막 실행의 바이트 범위만 기억
+    runs = {}  # 작업 -> [시작, 끝]
+    position = 0
+    with open(output, 'rb') as f:
+        for line in f:
+            record = json.loads(line)
+            key = (record['keyword'], record['region_code'], record['event_type'])
+            end = position + len(line)
+            if record['rank'] == 1 or key not in runs:
+                runs[key] = [position, end]
+            runs[key][1] = position = end
+        
+        # 정렬은 안정적이므로 작업 파일에 없는 작업끼리는 처음 나온 순서 유지
+        keys = sorted(runs, key=lambda key: order.get(key, len(order)))
+        temp_path = f"{output}.tmp"
+        with open(temp_path, 'wb') as out:
+            for key in keys:
+                start, end = runs[key]
+                f.seek(start)
+                while start < end:
+                    chunk = f.read(min(1 << 20, end - start))
+                    out.write(chunk)
+                    start += len(chunk)
+    os.replace(temp_path, output)
+
+def write_parquet_part(output_dir, index, records):
+    """작업별 Parquet 파일 기록 (작업 순번으로 파일명을 정해 순서 유지)"""
+    import pandas as pd
+    
+    frame = pd.DataFrame.from_records(records)
+    if 'region_codes' in frame:
+        frame = frame.drop(columns=['region_codes'])
+    frame.to_parquet(os.path.join(output_dir, f'part-{index:05d}.parquet'), index=False)
+
+def generate_corpus(output, count, seed=0):
+    """부하 테스트/데모용 합성 영상 데이터를 JSONL(.gz)로 생성"""
+    from synthetic_corpus import write_corpus
+    
+    written = write_corpus(output, count, seed)
+    print(f'🧪 합성 데이터 {written:,}개 생성: {output}')
+    return written
+
 def main():
     parser = argparse.ArgumentParser(description='YouTube Live Streamer 유틸리티')
-    parser.add_argument('command', choices=['setup', 'run', 'clean'], 
+    parser.add_argument('command', choices=['setup', 'run', 'clean', 'extract', 'corpus'], 
                        help='실행할 명령어')
+    parser.add_argument('--jobs', help='extract: 작업 파일 (JSON)')
+    parser.add_argument('--output', default='videos.jsonl',
+                       help='extract/corpus: 출력 파일 (parquet 형식은 디렉터리, corpus는 .gz 가능)')
+    parser.add_argument('--format', choices=['jsonl', 'parquet'], default='jsonl',
+                       help='extract: 출력 형식')
+    parser.add_argument('--workers', type=int, default=4, help='extract: 동시 작업 수')
+    parser.add_argument('--checkpoint', help='extract: 체크포인트 파일 (기본: <output>.checkpoint)')
+    parser.add_argument('--count', type=int, default=100000, help='corpus: 생성할 레코드 수')
+    parser.add_argument('--seed', type=int, default=0, help='corpus: 난수 시드 (같은 시드면 같은 데이터)')
     
     args = parser.parse_args()
     
@@ -65,6 +280,13 @@ def main():
         run_app()
     elif args.command == 'clean':
         clean_cache()
+    elif args.command == 'extract':
+        if not args.jobs:
+            parser.error('extract 명령에는 --jobs 작업 파일이 필요합니다.')
+        if not extract_videos(args.jobs, args.output, args.format, args.workers, args.checkpoint):
+            sys.exit(1)
+    elif args.command == 'corpus':
+        generate_corpus(args.output, args.count, args.seed)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,114 @@
+# search.list / videos.list 부분 응답 마스크 (UI에서 사용하는 필드만 요청)
+SEARCH_FIELDS = (
+    'nextPageToken,'
+    'items(id/videoId,snippet(title,description,channelTitle,publishedAt,'
+    'liveBroadcastContent,thumbnails/medium/url))'
+)
+STATS_FIELDS = 'items(id,statistics(viewCount,likeCount,commentCount))'
+
+# 설명 미리보기 최대 길이
+DESCRIPTION_LIMIT = 200
+
+
+class VideoRecord:
+    """검색 결과 한 건 (__slots__ 기반 경량 레코드)
+
+    기존 코드와 호환되도록 video['title'], 'view_count' in video,
+    video.get(...), video.update(...) 같은 딕셔너리 방식 접근을 지원합니다.
+    video_url, live_status 는 저장하지 않고 필요할 때 계산합니다.
+    """
+
+    __slots__ = (
+        'video_id', 'title', 'description', 'channel_title', 'published_at',
+        'thumbnail_url', 'is_live', 'view_count', 'like_count', 'comment_count',
+        'region_code', 'region_codes'
+    )
+
+    # 딕셔너리 방식으로 노출되는 계산 필드
+    COMPUTED_FIELDS = ('video_url', 'live_status')
+
+    def __init__(self, video_id, title, description, channel_title, published_at, thumbnail_url,
+                 is_live=False, view_count=None, like_count=None, comment_count=None,
+                 region_code=None, region_codes=None):
+        self.video_id = video_id
+        self.title = title
+        self.description = description
+        self.channel_title = channel_title
+        self.published_at = published_at
+        self.thumbnail_url = thumbnail_url
+        self.is_live = is_live
+        self.view_count = view_count
+        self.like_count = like_count
+        self.comment_count = comment_count
+        self.region_code = region_code
+        self.region_codes = region_codes
+
+    @classmethod
+    def from_search_item(cls, item):
+        """search.list 응답 항목을 레코드로 변환"""
+        snippet = item['snippet']
+        description = snippet.get('description', '')
+        if len(description) > DESCRIPTION_LIMIT:
+            description = description[:DESCRIPTION_LIMIT] + '...'
+
+        return cls(
+            video_id=item['id']['videoId'],
+            title=snippet['title'],
+            description=description,
+            channel_title=snippet['channelTitle'],
+            published_at=snippet['publishedAt'],
+            thumbnail_url=snippet['thumbnails']['medium']['url'],
+            is_live=snippet.get('liveBroadcastContent') == 'live'
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """딕셔너리(샘플 데이터 등)를 레코드로 변환"""
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+    @property
+    def video_url(self):
+        return f"https://www.youtube.com/watch?v={self.video_id}"
+
+    @property
+    def live_status(self):
+        return '🔴 LIVE' if self.is_live else '📹 영상'
+
+    def keys(self):
+        """값이 설정된 필드 이름"""
+        names = [name for name in self.__slots__ if getattr(self, name) is not None]
+        return names + list(self.COMPUTED_FIELDS)
+
+    def to_dict(self):
+        """딕셔너리로 변환 (JSON 직렬화용)"""
+        return {name: self[name] for name in self.keys()}
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in self.__slots__ or key in self.COMPUTED_FIELDS else None
+        return default if value is None else value
+
+    def update(self, values):
+        for key, value in values.items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __eq__(self, other):
+        if not isinstance(other, VideoRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"VideoRecord(video_id={self.video_id!r}, title={self.title!r})"
@@ -0,0 +1,102 @@
+from video_record import SEARCH_FIELDS, VideoRecord
+
+# 국가 코드 매핑
+COUNTRY_CODES = {
+    '한국': 'KR',
+    '미국': 'US',
+    '일본': 'JP',
+    '중국': 'CN',
+    '영국': 'GB',
+    '독일': 'DE',
+    '프랑스': 'FR',
+    '이탈리아': 'IT',
+    '스페인': 'ES',
+    '캐나다': 'CA',
+    '호주': 'AU',
+    '인도': 'IN',
+    '브라질': 'BR',
+    '러시아': 'RU',
+    '멕시코': 'MX',
+    '태국': 'TH',
+    '베트남': 'VN',
+    '인도네시아': 'ID',
+    '필리핀': 'PH',
+    '말레이시아': 'MY'
+}
+
+# 영상 유형 옵션
+VIDEO_TYPES = {
+    '전체': 'video',
+    '라이브': 'live',
+    '업로드된 영상': 'uploaded'
+}
+
+# search.list 페이지당 최대 결과 수
+SEARCH_PAGE_SIZE = 50
+
+# videos.list 요청당 최대 id 수
+STATS_BATCH_SIZE = 50
+
+
+def format_number(num_str):
+    """숫자를 한국어 단위로 포맷팅"""
+    try:
+        num = int(num_str)
+        if num >= 100000000:  # 1억 이상
+            return f"{num // 100000000}억 {(num % 100000000) // 10000}만"
+        elif num >= 10000:  # 1만 이상
+            return f"{num // 10000}만 {(num % 10000) // 1000}천"
+        elif num >= 1000:  # 1천 이상
+            return f"{num // 1000}천 {num % 1000}"
+        else:
+            return str(num)
+    except:
+        return num_str
+
+
+def merge_statistics(videos, stats_by_id):
+    """검색 결과에 통계 정보 병합"""
+    for video in videos:
+        stats = stats_by_id.get(video['video_id'])
+        if stats:
+            video.update(stats)
+    return videos
+
+
+def build_search_params(api_key, keyword, country_code, max_results, order, event_type):
+    """search.list 요청 파라미터 생성"""
+    params = {
+        'part': 'snippet',
+        'fields': SEARCH_FIELDS,
+        'q': keyword,
+        'type': 'video',
+        'maxResults': max_results,
+        'order': order,
+        'regionCode': country_code,
+        'key': api_key
+    }
+
+    # 라이브 스트리밍 필터 추가
+    if event_type == 'live':
+        params['eventType'] = 'live'
+    elif event_type == 'uploaded':
+        params['eventType'] = 'completed'
+    return params
+
+
+def parse_search_page(data):
+    """search.list 응답을 (비디오 목록, 다음 페이지 토큰)으로 변환"""
+    return [VideoRecord.from_search_item(item) for item in data.get('items', [])], data.get('nextPageToken')
+
+
+def parse_statistics(data):
+    """videos.list(part=statistics) 응답을 {video_id: 통계}로 변환"""
+    stats_by_id = {}
+    for item in data.get('items', []):
+        stats = item.get('statistics', {})
+        stats_by_id[item['id']] = {
+            'view_count': stats.get('viewCount', '0'),
+            'like_count': stats.get('likeCount', '0'),
+            'comment_count': stats.get('commentCount', '0')
+        }
+    return stats_by_id
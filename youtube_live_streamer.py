@@ -1,22 +1,28 @@
 import streamlit as st
-import numpy as np
 from datetime import datetime
+import importlib.util
 import json
 import os
+import shutil
+from adaptive_quality import QualityController, build_ladder
+from config import Config
+from simulcast import SimulcastSink
+from stream_pipeline import CameraSource, FfmpegSink, StreamPipeline
 
-# Try to import OpenCV with error handling
-try:
-    import cv2
-    OPENCV_AVAILABLE = True
-except ImportError as e:
-    OPENCV_AVAILABLE = False
+# OpenCV는 카메라를 열 때만 로드 (시작 시에는 설치 여부만 확인하여 첫 화면 표시를 앞당김)
+OPENCV_AVAILABLE = importlib.util.find_spec('cv2') is not None
 
 class YouTubeLiveStreamer:
     def __init__(self):
         self.stream_key = None
         self.camera = None
-        self.is_streaming = False
+        self.pipeline = None
         self.opencv_available = OPENCV_AVAILABLE
+    
+    @property
+    def is_streaming(self):
+        """캡처/인코딩 스레드가 실행 중인지 여부"""
+        return self.pipeline is not None and self.pipeline.running
         
     def setup_camera(self):
         """카메라 설정"""
@@ -24,6 +30,14 @@ class YouTubeLiveStreamer:
             st.error("OpenCV가 설치되지 않아 카메라 기능을 사용할 수 없습니다.")
             return False
             
+        try:
+            import cv2
+        except ImportError as e:
+            # 설치되어 있어도 시스템 라이브러리가 없으면 로드에 실패할 수 있음
+            self.opencv_available = False
+            st.error(f"OpenCV를 불러올 수 없습니다: {e}")
+            return False
+            
         try:
             self.camera = cv2.VideoCapture(0)
             if not self.camera.isOpened():
@@ -34,27 +48,74 @@ class YouTubeLiveStreamer:
             st.error(f"카메라 설정 중 오류 발생: {e}")
             return False
     
-    def start_stream(self, stream_key):
-        """라이브 스트리밍 시작"""
+    def start_stream(self, stream_key, adaptive=None, backup=None):
+        """라이브 스트리밍 시작 (카메라 캡처 -> ffmpeg 인코딩 -> YouTube RTMP 전송)
+
+        adaptive이면 전송 상태에 따라 화질 단계(비트레이트/해상도/fps)를 자동으로 조절
+        (주소가 하나여도 전송기를 거쳐 화질 단계가 바뀔 때 RTMP 연결을 유지)
+        backup이나 추가 주소(STREAM_EXTRA_DESTINATIONS)가 있으면 한 번 인코딩하여 모든 주소로 동시 전송
+        """
+        adaptive = Config.STREAM_ADAPTIVE if adaptive is None else adaptive
+        if self.is_streaming:
+            st.info("이미 스트리밍 중입니다.")
+            return True
+        if not self.opencv_available:
+            st.error("OpenCV가 설치되지 않아 카메라 영상을 전송할 수 없습니다.")
+            return False
+        if shutil.which(Config.FFMPEG_PATH) is None:
+            st.error(f"ffmpeg를 찾을 수 없습니다 (FFMPEG_PATH={Config.FFMPEG_PATH}).")
+            return False
+        
+        source = sink = None
+        try:
+            # 카메라 설정에서 연 장치가 있으면 그대로 사용
+            source = CameraSource(capture=self.camera)
+            destinations = Config.get_stream_destinations(stream_key, backup=backup)
+            if len(destinations) == 1 and not adaptive:
+                sink = FfmpegSink(destinations[0][1], source.width, source.height)
+            else:
+                sink = SimulcastSink(destinations, source.width, source.height)
+            # 카메라 해상도와 STREAM_QUALITY를 넘지 않는 단계 중 가장 높은 단계로 시작
+            controller = QualityController(build_ladder(source.height), source_fps=source.fps) if adaptive else None
+            self.pipeline = StreamPipeline(source, sink, controller=controller)
+            self.pipeline.start()
+        except Exception as e:
+            # 이미 연 ffmpeg/카메라를 닫아 다음 시작 때 장치가 잠겨 있지 않도록 함 (두 번 닫아도 무방)
+            if sink is not None:
+                sink.close()
+            if source is not None:
+                source.close()
+            self.camera = None
+            self.pipeline = None
+            st.error(f"스트리밍 시작 중 오류 발생: {e}")
+            return False
+        
         self.stream_key = stream_key
-        self.is_streaming = True
         st.success("라이브 스트리밍이 시작되었습니다!")
+        return True
         
     def stop_stream(self):
-        """라이브 스트리밍 중지"""
-        self.is_streaming = False
-        if self.camera and self.opencv_available:
+        """라이브 스트리밍 중지 (남은 프레임 전송 후 ffmpeg 종료, 카메라 해제)"""
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        elif self.camera and self.opencv_available:
             self.camera.release()
+        self.camera = None
         st.info("라이브 스트리밍이 중지되었습니다.")
         
     def get_stream_info(self):
         """스트리밍 정보 반환"""
-        return {
+        info = {
             "timestamp": datetime.now().isoformat(),
             "status": "streaming" if self.is_streaming else "stopped",
             "stream_key": self.stream_key,
             "opencv_available": self.opencv_available
         }
+        if self.pipeline is not None:
+            info["pipeline"] = self.pipeline.stats()
+            if isinstance(self.pipeline.sink, SimulcastSink):
+                info["destinations"] = self.pipeline.sink.health()
+        return info
 
 def main():
     st.set_page_config(
@@ -73,7 +134,10 @@ def main():
         st.warning("⚠️ OpenCV 사용 불가 - 제한된 기능으로 실행")
         st.info("Streamlit Cloud에서는 OpenCV가 제한될 수 있습니다. 로컬 환경에서 전체 기능을 사용하세요.")
     
-    streamer = YouTubeLiveStreamer()
+    # 스트리밍 스레드가 재실행 사이에도 유지되도록 세션에 보관
+    if 'streamer' not in st.session_state:
+        st.session_state.streamer = YouTubeLiveStreamer()
+    streamer = st.session_state.streamer
     
     # 사이드바 설정
     with st.sidebar:
@@ -93,6 +157,11 @@ def main():
         else:
             st.info("카메라 기능은 OpenCV가 필요합니다.")
         
+        adaptive = st.checkbox("자동 화질 조절", value=Config.STREAM_ADAPTIVE,
+                               help=f"전송이 밀리면 화질을 낮추고, 여유가 생기면 {Config.STREAM_QUALITY}까지 다시 올립니다.")
+        backup = st.checkbox("백업 서버 동시 전송", value=Config.STREAM_BACKUP_INGEST,
+                             help="한 번 인코딩한 영상을 YouTube 백업 수집 서버로도 보냅니다 (CPU 추가 사용 거의 없음).")
+        
         st.divider()
         
         # 스트리밍 제어
@@ -101,7 +170,7 @@ def main():
         with col1:
             if st.button("▶️ 시작", use_container_width=True):
                 if stream_key:
-                    streamer.start_stream(stream_key)
+                    streamer.start_stream(stream_key, adaptive=adaptive, backup=backup)
                 else:
                     st.error("스트림 키를 입력해주세요.")
         
@@ -119,6 +188,9 @@ def main():
             st.success("🔴 LIVE - 스트리밍 중...")
             if not OPENCV_AVAILABLE:
                 st.info("실제 카메라 피드는 로컬 환경에서 OpenCV와 함께 사용하세요.")
+        elif streamer.pipeline is not None and streamer.pipeline.error:
+            # 인코더/전송 오류로 멈춘 경우 원인 표시
+            st.error(f"스트리밍이 중단되었습니다: {streamer.pipeline.error}")
         else:
             st.info("📹 스트리밍 대기 중...")
             
@@ -137,6 +209,35 @@ def main():
         
         st.subheader("📈 실시간 통계")
         
+        # 전송 통계 (캡처 -> RTMP 전송)
+        if streamer.pipeline is not None:
+            stats = info["pipeline"]
+            col_a, col_b, col_c = st.columns(3)
+            col_a.metric("전송 FPS", f"{stats['fps']:.1f}")
+            col_b.metric("지연 p95", "-" if stats['latency_p95_ms'] is None else f"{stats['latency_p95_ms']:.0f}ms")
+            col_c.metric("버린 프레임", stats['frames_dropped'])
+            jitter = "-" if stats['jitter_p99_ms'] is None else f"{stats['jitter_p99_ms']:g}ms"
+            st.caption(f"출력 간격 흔들림 p99 {jitter} · 누적 어긋남 {stats['drift_ms']:.1f}ms · "
+                       f"반복 {stats['frames_repeated']} / 건너뜀 {stats['frames_skipped']}")
+            
+            controller = streamer.pipeline.controller
+            if controller is not None:
+                level = controller.level
+                st.metric("화질", f"{level.name} · {level.bitrate}kbps · {level.fps}fps")
+                if controller.events:
+                    event = controller.events[-1]
+                    st.caption(f"최근 변경: {event['from']} → {event['to']} ({event['reason']})")
+            
+            # 동시 전송 주소별 상태
+            for health in info.get("destinations", []):
+                icon = {'live': '🟢', 'connecting': '🟡', 'backoff': '🔴'}.get(health['state'], '⚪')
+                line = (f"{icon} {health['name']} · {health['state']} · {health['kbps']:.0f}kbps · "
+                        f"버퍼 {health['buffered_seconds']:.1f}초 · 재연결 {health['reconnects']} · "
+                        f"버린 GOP {health['dropped_gops']}")
+                if health['last_error'] and health['state'] != 'live':
+                    line += f" · {health['last_error']}"
+                st.caption(line)
+        
         # 통계 메트릭
         col_a, col_b = st.columns(2)
         
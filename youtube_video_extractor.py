@@ -2,147 +2,373 @@ import streamlit as st
 import requests
 import json
 from datetime import datetime
-import pandas as pd
 from urllib.parse import quote
+import copy
 import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import partial
 from config import Config
-
-# 국가 코드 매핑
-COUNTRY_CODES = {
-    '한국': 'KR',
-    '미국': 'US',
-    '일본': 'JP',
-    '중국': 'CN',
-    '영국': 'GB',
-    '독일': 'DE',
-    '프랑스': 'FR',
-    '이탈리아': 'IT',
-    '스페인': 'ES',
-    '캐나다': 'CA',
-    '호주': 'AU',
-    '인도': 'IN',
-    '브라질': 'BR',
-    '러시아': 'RU',
-    '멕시코': 'MX',
-    '태국': 'TH',
-    '베트남': 'VN',
-    '인도네시아': 'ID',
-    '필리핀': 'PH',
-    '말레이시아': 'MY'
-}
-
-# 영상 유형 옵션
-VIDEO_TYPES = {
-    '전체': 'video',
-    '라이브': 'live',
-    '업로드된 영상': 'uploaded'
-}
+from http_client import get_session, retry_count
+from response_cache import get_response_cache, search_cache_key, search_ttl
+from video_record import STATS_FIELDS
+from quota_scheduler import (PRIORITY_INTERACTIVE, RATE_LIMIT_RETRIES, QuotaExceeded, get_quota_scheduler, is_quota_error,
+                             is_rate_limit_error, rate_limit_delay)
+from single_flight import get_single_flight
+from result_store import ResultStore
+from youtube_core import (COUNTRY_CODES, SEARCH_PAGE_SIZE, STATS_BATCH_SIZE, VIDEO_TYPES, build_search_params,
+                          format_number, merge_statistics, parse_search_page, parse_statistics)
+from results_grid import render_results_grid
+from api_metrics import NO_REGION, get_api_metrics, render_diagnostics_panel, start_metrics_server
 
 class YouTubeVideoExtractor:
-    def __init__(self, api_key):
+    def __init__(self, api_key, session=None, cache=None, scheduler=None, priority=PRIORITY_INTERACTIVE, single_flight=None, base_url=None, metrics=None):
         self.api_key = api_key
-        self.base_url = "https://www.googleapis.com/youtube/v3"
+        # 벤치마크/테스트 시 로컬 모의 서버로 지정 가능
+        self.base_url = (base_url or Config.YOUTUBE_API_BASE_URL).rstrip('/')
+        # 프로세스 전역 keep-alive 세션 공유 (요청마다 TCP+TLS 핸드셰이크 방지)
+        self.session = session or get_session()
+        # 동일 검색 반복 시 API 할당량 절약을 위한 응답 캐시
+        self.cache = cache or get_response_cache()
+        # 모든 API 호출은 할당량 스케줄러를 거침 (백그라운드 작업은 PRIORITY_BACKGROUND 사용)
+        self.scheduler = scheduler or get_quota_scheduler()
+        self.priority = priority
+        # 여러 세션의 동일한 동시 검색을 하나의 API 호출로 합침
+        self.single_flight = single_flight or get_single_flight()
+        # 엔드포인트/국가별 호출 지연, 상태 코드, 할당량, 캐시 적중 집계
+        self.metrics = metrics or get_api_metrics()
+        
+    def search_videos(self, keyword, country_code='KR', max_results=20, order='relevance', event_type='video', with_statistics=False):
+        """YouTube API를 사용하여 비디오 검색
+
+        with_statistics=True 이면 통계 정보를 한 번의 videos.list 호출로 병합합니다.
+        """
+        # 캐시 확인 (정규화된 키워드 기준)
+        cache_key = search_cache_key(keyword, country_code, max_results, order, event_type,
+                                     with_statistics=with_statistics)
+        cached_videos = self.cache.get(cache_key)
+        if cached_videos is not None:
+            self.metrics.record_cache('search', country_code, 'hit')
+            return cached_videos, None
+        
+        # 할당량이 얼마 남지 않았으면 만료된 캐시라도 우선 사용
+        if self.scheduler.is_low(self.api_key):
+            stale_videos = self.cache.get(cache_key, allow_stale=True)
+            if stale_videos is not None:
+                self.metrics.record_cache('search', country_code, 'stale')
+                return stale_videos, None
         
-    def search_videos(self, keyword, country_code='KR', max_results=20, order='relevance', event_type='video'):
-        """YouTube API를 사용하여 비디오 검색"""
+        self.metrics.record_cache('search', country_code, 'miss')
+
+        # 같은 검색이 이미 진행 중이면 새로 호출하지 않고 결과를 공유 (single-flight)
+        (videos, error), shared = self.single_flight.do(
+            cache_key,
+            lambda: self._search_uncached(cache_key, keyword, country_code, max_results, order, event_type, with_statistics)
+        )
+        if shared:
+            # 공유된 결과는 호출자마다 복사본 사용
+            videos = copy.deepcopy(videos)
+        return videos, error
+
+    def _search_uncached(self, cache_key, keyword, country_code, max_results, order, event_type, with_statistics):
+        """API로 검색 후 캐시에 저장"""
         try:
-            # 검색 API 엔드포인트
-            search_url = f"{self.base_url}/search"
-            
-            # 검색 파라미터
-            params = {
-                'part': 'snippet',
-                'q': keyword,
-                'type': 'video',
-                'maxResults': max_results,
-                'order': order,
-                'regionCode': country_code,
-                'key': self.api_key
-            }
-            
-            # 라이브 스트리밍 필터 추가
-            if event_type == 'live':
-                params['eventType'] = 'live'
-            elif event_type == 'uploaded':
-                params['eventType'] = 'completed'
+            # nextPageToken을 따라 max_results개까지 수집 (50개 초과 시 다음 페이지 선행 요청)
+            videos = list(self.iter_search(
+                keyword, country_code, order, event_type,
+                limit=max_results,
+                prefetch=max_results > SEARCH_PAGE_SIZE
+            ))
             
-            # API 호출
-            response = requests.get(search_url, params=params)
-            response.raise_for_status()
+            # 통계 정보 일괄 병합
+            if with_statistics:
+                merge_statistics(videos, self.get_video_statistics_bulk(v['video_id'] for v in videos))
             
-            data = response.json()
-            
-            # 비디오 정보 처리
-            videos = []
-            for item in data.get('items', []):
-                # 라이브 스트리밍 상태 확인
-                live_status = '🔴 LIVE' if item['snippet'].get('liveBroadcastContent') == 'live' else '📹 영상'
-                
-                video_info = {
-                    'video_id': item['id']['videoId'],
-                    'title': item['snippet']['title'],
-                    'description': item['snippet']['description'][:200] + '...' if len(item['snippet']['description']) > 200 else item['snippet']['description'],
-                    'channel_title': item['snippet']['channelTitle'],
-                    'published_at': item['snippet']['publishedAt'],
-                    'thumbnail_url': item['snippet']['thumbnails']['medium']['url'],
-                    'video_url': f"https://www.youtube.com/watch?v={item['id']['videoId']}",
-                    'live_status': live_status,
-                    'is_live': item['snippet'].get('liveBroadcastContent') == 'live'
-                }
-                videos.append(video_info)
-                
+            self.cache.set(cache_key, videos, search_ttl(event_type))
             return videos, None
             
+        except QuotaExceeded as e:
+            # 할당량 부족 시 만료된 캐시라도 있으면 사용
+            stale_videos = self.cache.get(cache_key, allow_stale=True)
+            if stale_videos is not None:
+                return stale_videos, None
+            return [], f"{str(e)} 캐시된 검색 결과가 없습니다."
         except requests.exceptions.RequestException as e:
-            if response.status_code == 403:
+            # 타임아웃/연결 오류는 응답 객체가 없음
+            status_code = e.response.status_code if e.response is not None else None
+            if status_code == 403:
                 return [], "API 키가 올바르지 않거나 할당량이 초과되었습니다."
-            elif response.status_code == 400:
+            elif status_code == 400:
                 return [], "검색 파라미터가 올바르지 않습니다."
             else:
                 return [], f"API 요청 오류: {str(e)}"
         except Exception as e:
             return [], f"검색 중 오류 발생: {str(e)}"
 
+    def search_videos_multi_region(self, keyword, country_codes, max_results=20, order='relevance', event_type='video', with_statistics=False, max_workers=None):
+        """여러 국가를 동시에 검색하여 결과 병합
+
+        국가별 search_videos 호출을 제한된 스레드 풀에서 병렬로 실행합니다.
+        각 비디오에는 region_code(처음 발견된 국가)와 region_codes(발견된 모든 국가)가
+        추가되며, 일부 국가가 실패해도 나머지 결과와 국가별 오류를 함께 반환합니다.
+
+        Returns:
+            (videos, errors): errors는 {국가 코드: 오류 메시지}
+        """
+        country_codes = list(dict.fromkeys(country_codes))
+        results = {}
+        errors = {}
+        
+        if country_codes:
+            workers = min(max_workers or Config.FANOUT_MAX_WORKERS, len(country_codes))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='region-search') as executor:
+                futures = {
+                    executor.submit(self.search_videos, keyword, code, max_results, order, event_type): code
+                    for code in country_codes
+                }
+                for future in as_completed(futures):
+                    code = futures[future]
+                    try:
+                        videos, error = future.result()
+                    except Exception as e:
+                        videos, error = [], f"검색 중 오류 발생: {str(e)}"
+                    if error:
+                        errors[code] = error
+                    results[code] = videos
+        
+        # 국가 순서대로 병합 (중복 영상은 하나로 합치고 국가 목록만 추가)
+        merged = {}
+        for code in country_codes:
+            for video in results.get(code, []):
+                existing = merged.get(video['video_id'])
+                if existing is None:
+                    video['region_code'] = code
+                    video['region_codes'] = [code]
+                    merged[video['video_id']] = video
+                else:
+                    existing['region_codes'].append(code)
+        videos = list(merged.values())
+        
+        # 통계는 병합된 결과 전체를 한 번에 조회
+        if with_statistics and videos:
+            merge_statistics(videos, self.get_video_statistics_bulk(v['video_id'] for v in videos))
+        
+        return videos, errors
+
+    def iter_search(self, keyword, country_code='KR', order='relevance', event_type='video', limit=None, prefetch=True):
+        """nextPageToken을 따라가며 검색 결과를 하나씩 반환하는 제너레이터
+
+        현재 페이지를 소비하는 동안 다음 페이지를 백그라운드에서 미리 요청하며,
+        메모리에는 최대 두 페이지만 유지됩니다. API 오류는 requests 예외로 전달됩니다.
+        """
+        page_size = min(SEARCH_PAGE_SIZE, limit) if limit else SEARCH_PAGE_SIZE
+        if page_size <= 0:
+            return
+        params = build_search_params(self.api_key, keyword, country_code, page_size, order, event_type)
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='search-prefetch') if prefetch else None
+        
+        def submit(page_token):
+            if executor is not None:
+                return executor.submit(self._fetch_search_page, params, page_token)
+            # 선행 요청을 사용하지 않으면 즉시 실행
+            future = Future()
+            try:
+                future.set_result(self._fetch_search_page(params, page_token))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        
+        yielded = 0
+        try:
+            future = submit(None)
+            while future is not None:
+                videos, next_page_token = future.result()
+                
+                # 현재 페이지를 반환하기 전에 다음 페이지 요청 시작
+                if next_page_token and videos and (limit is None or yielded + len(videos) < limit):
+                    future = submit(next_page_token)
+                else:
+                    future = None
+                
+                for video in videos:
+                    if limit is not None and yielded >= limit:
+                        return
+                    yield video
+                    yielded += 1
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_search_page(self, params, page_token=None):
+        """search.list 한 페이지 요청 후 (비디오 목록, 다음 페이지 토큰) 반환"""
+        if page_token:
+            params = dict(params, pageToken=page_token)
+        
+        return parse_search_page(self._api_get('search', params).json())
+
     def get_video_statistics(self, video_id):
         """비디오 통계 정보 가져오기"""
-        try:
-            stats_url = f"{self.base_url}/videos"
-            params = {
-                'part': 'statistics',
-                'id': video_id,
-                'key': self.api_key
-            }
-            
-            response = requests.get(stats_url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            if data.get('items'):
-                stats = data['items'][0]['statistics']
-                return {
-                    'view_count': stats.get('viewCount', '0'),
-                    'like_count': stats.get('likeCount', '0'),
-                    'comment_count': stats.get('commentCount', '0')
+        return self.get_video_statistics_bulk([video_id]).get(video_id, {})
+
+    def get_video_statistics_bulk(self, video_ids):
+        """여러 비디오의 통계 정보를 한 번에 가져오기 (요청당 최대 50개 id)"""
+        # 중복 id 제거 (순서 유지)
+        ids = [video_id for video_id in dict.fromkeys(video_ids) if video_id]
+        stats_by_id = {}
+        
+        # 캐시에 있는 통계는 재사용하고 나머지만 요청
+        missing_ids = []
+        for video_id in ids:
+            cached_stats = self.cache.get(('stats', video_id))
+            if cached_stats is not None:
+                stats_by_id[video_id] = cached_stats
+                self.metrics.record_cache('videos', NO_REGION, 'hit')
+            else:
+                missing_ids.append(video_id)
+                self.metrics.record_cache('videos', NO_REGION, 'miss')
+        
+        for start in range(0, len(missing_ids), STATS_BATCH_SIZE):
+            chunk = missing_ids[start:start + STATS_BATCH_SIZE]
+            try:
+                params = {
+                    'part': 'statistics',
+                    'fields': STATS_FIELDS,
+                    'id': ','.join(chunk),
+                    'maxResults': len(chunk),
+                    'key': self.api_key
                 }
-            return {}
-            
-        except Exception as e:
-            return {}
+                
+                chunk_stats = parse_statistics(self._api_get('videos', params).json())
+                for video_id, stats in chunk_stats.items():
+                    self.cache.set(('stats', video_id), stats, Config.CACHE_TTL_STATS)
+                stats_by_id.update(chunk_stats)
+                    
+            except QuotaExceeded:
+                # 할당량 부족 시 남은 배치는 요청하지 않음
+                break
+            except Exception as e:
+                # 실패한 배치는 건너뛰고 나머지 결과는 반환
+                continue
+                
+        return stats_by_id
+
+    def _api_get(self, endpoint, params):
+        """할당량 스케줄러를 거쳐 API 호출 (할당량 부족 시 QuotaExceeded)
+
+        모든 호출은 성공/실패와 관계없이 지연, 상태 코드, 응답 크기, 할당량이 기록됩니다.
+        호출 제한(429, rateLimitExceeded) 응답은 잠시 기다린 뒤 RATE_LIMIT_RETRIES번까지 다시 시도합니다.
+        """
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            response = self._api_get_once(endpoint, params)
+            if not is_rate_limit_error(response) or attempt == RATE_LIMIT_RETRIES:
+                break
+            time.sleep(rate_limit_delay(response, attempt))
+        response.raise_for_status()
+        return response
+
+    def _api_get_once(self, endpoint, params):
+        region = params.get('regionCode', NO_REGION)
+        try:
+            self.scheduler.acquire(self.api_key, endpoint, self.priority)
+        except QuotaExceeded:
+            self.metrics.observe_request(endpoint, region, 'quota_exceeded')
+            raise
+        
+        start = time.perf_counter()
+        try:
+            response = self.session.get(f"{self.base_url}/{endpoint}", params=params, timeout=Config.HTTP_TIMEOUT)
+        except requests.exceptions.RequestException as e:
+            status = 'timeout' if isinstance(e, requests.exceptions.Timeout) else 'error'
+            self.metrics.observe_request(endpoint, region, status, time.perf_counter() - start,
+                                         quota_units=self.scheduler.cost(endpoint))
+            raise
+        self.metrics.observe_response(endpoint, region, response, time.perf_counter() - start,
+                                      quota_units=self.scheduler.cost(endpoint))
+        # 5xx 등으로 urllib3가 다시 보낸 요청도 할당량이 차감되므로 스케줄러 사용량에 반영
+        self.scheduler.charge(self.api_key, endpoint, retry_count(response))
+        
+        if is_quota_error(response):
+            self.scheduler.mark_exhausted(self.api_key)
+        return response
+
+@st.cache_resource(show_spinner=False)
+def get_extractor(api_key):
+    """재실행/세션마다 새로 만들지 않고 프로세스에서 공유하는 추출기 (HTTP 커넥션 풀 포함)"""
+    # METRICS_PORT 설정 시 Prometheus /metrics 노출 (프로세스당 한 번)
+    start_metrics_server()
+    return YouTubeVideoExtractor(api_key, session=get_session())
+
+class SearchFailed(Exception):
+    """검색 실패 (st.cache_data가 실패 결과를 캐시하지 않도록 예외로 전달)"""
 
-def format_number(num_str):
-    """숫자를 한국어 단위로 포맷팅"""
+@st.cache_data(ttl=Config.CACHE_TTL_LIVE, max_entries=256, show_spinner=False)
+def cached_search(api_key, keyword, country_code, max_results, order, event_type):
+    """검색 조건별로 캐시된 검색 결과 (통계 포함)
+
+    TTL은 가장 짧은 라이브 TTL을 사용하며, 더 긴 TTL은 하위 응답 캐시가 처리합니다.
+    """
+    videos, error = get_extractor(api_key).search_videos(
+        keyword, country_code, max_results, order, event_type, with_statistics=True
+    )
+    if error:
+        raise SearchFailed(error)
+    return videos
+
+@st.fragment
+def render_card_details(extractor, video, idx):
+    """카드별 설명/통계 (버튼 클릭 시 전체 페이지가 아닌 이 카드만 다시 실행)"""
+    # 설명
+    with st.expander("설명 보기"):
+        st.write(video['description'])
+    
+    # 비디오 통계 (옵션)
+    if st.button(f"📊 통계 보기", key=f"stats_{idx}"):
+        with st.spinner("통계 로딩 중..."):
+            # 검색 시 병합된 통계가 있으면 추가 API 호출 없이 사용
+            if 'view_count' in video:
+                stats = video
+            else:
+                stats = extractor.get_video_statistics(video['video_id'])
+            if stats:
+                col_a, col_b = st.columns(2)
+                with col_a:
+                    st.metric("조회수", format_number(stats.get('view_count', '0')))
+                    st.metric("좋아요", format_number(stats.get('like_count', '0')))
+                with col_b:
+                    st.metric("댓글", format_number(stats.get('comment_count', '0')))
+            else:
+                st.error("통계 정보를 가져올 수 없습니다.")
+
+def render_video_card(extractor, video, idx, thumbnail):
+    """결과 카드 하나 (섬네일, 제목, 채널, 일시, 설명/통계)"""
+    # 섬네일 이미지
+    st.image(thumbnail, use_container_width=True)
+    
+    # 라이브 상태 표시
+    if video['is_live']:
+        st.markdown(f"🔴 **LIVE**")
+    
+    # 제목 (클릭 가능한 링크)
+    st.markdown(f"**[{video['title']}]({video['video_url']})**")
+    
+    # 채널명
+    st.caption(f"📺 {video['channel_title']}")
+    
+    # 검색 국가 (여러 국가 동시 검색 시)
+    if 'region_codes' in video:
+        st.caption(f"🌍 {', '.join(video['region_codes'])}")
+    
+    # 업로드 일시
     try:
-        num = int(num_str)
-        if num >= 100000000:  # 1억 이상
-            return f"{num // 100000000}억 {(num % 100000000) // 10000}만"
-        elif num >= 10000:  # 1만 이상
-            return f"{num // 10000}만 {(num % 10000) // 1000}천"
-        elif num >= 1000:  # 1천 이상
-            return f"{num // 1000}천 {num % 1000}"
-        else:
-            return str(num)
+        published_date = datetime.fromisoformat(video['published_at'].replace('Z', '+00:00'))
+        st.caption(f"📅 {published_date.strftime('%Y-%m-%d %H:%M')}")
     except:
-        return num_str
+        st.caption(f"📅 {video['published_at']}")
+    
+    # 설명/통계는 카드 단위 fragment로 렌더링
+    render_card_details(extractor, video, idx)
+    
+    st.divider()
 
 def main():
     st.set_page_config(
@@ -167,8 +393,8 @@ def main():
         st.code("streamlit run demo_youtube_extractor.py", language="bash")
         st.stop()
     
-    # 추출기 초기화
-    extractor = YouTubeVideoExtractor(api_key)
+    # 추출기 초기화 (cache_resource로 재실행 간 공유)
+    extractor = get_extractor(api_key)
     
     # 검색 설정
     st.sidebar.header("🔍 검색 설정")
@@ -180,12 +406,19 @@ def main():
     country = st.sidebar.selectbox("검색 국가", list(COUNTRY_CODES.keys()), index=2)  # 일본을 기본값으로
     country_code = COUNTRY_CODES[country]
     
+    # 여러 국가 동시 검색
+    multi_region = st.sidebar.checkbox("🌍 여러 국가 동시 검색")
+    if multi_region:
+        countries = st.sidebar.multiselect("추가 검색 국가", list(COUNTRY_CODES.keys()), default=[country])
+        if country not in countries:
+            countries = [country] + countries
+    
     # 영상 유형 선택 (라이브/전체/업로드)
     video_type = st.sidebar.selectbox("영상 유형", list(VIDEO_TYPES.keys()), index=1)  # 라이브를 기본값으로
     event_type = VIDEO_TYPES[video_type]
     
     # 검색 결과 개수
-    max_results = st.sidebar.slider("검색 결과 개수", 5, 50, 20)
+    max_results = st.sidebar.slider("검색 결과 개수", 5, 200, 20)
     
     # 정렬 방식
     order_options = {
@@ -200,24 +433,75 @@ def main():
     if st.sidebar.button("🔍 검색", use_container_width=True):
         if keyword:
             with st.spinner("검색 중..."):
-                videos, error = extractor.search_videos(
-                    keyword, 
-                    country_code, 
-                    max_results, 
-                    order_options[order],
-                    event_type
-                )
+                region_codes = [COUNTRY_CODES[name] for name in countries] if multi_region else [country_code]
+                if multi_region:
+                    country = ', '.join(countries)
+                
+                # 정렬/개수/라이브 필터만 바뀐 경우 받아둔 결과로 응답 (API 호출 없음)
+                store = st.session_state.get('result_store')
+                if store is not None and store.can_answer(keyword, region_codes, event_type, order_options[order], max_results):
+                    videos, error = store.select(event_type, order_options[order], max_results), None
+                elif multi_region:
+                    videos, region_errors = extractor.search_videos_multi_region(
+                        keyword,
+                        region_codes,
+                        max_results,
+                        order_options[order],
+                        event_type,
+                        with_statistics=True
+                    )
+                    for code, region_error in region_errors.items():
+                        st.warning(f"{code} 검색 실패: {region_error}")
+                    # 모든 국가가 실패한 경우에만 오류로 처리
+                    error = None if len(region_errors) < len(countries) else "모든 국가 검색에 실패했습니다."
+                    store = None
+                else:
+                    try:
+                        videos, error = cached_search(
+                            api_key,
+                            keyword, 
+                            country_code, 
+                            max_results, 
+                            order_options[order],
+                            event_type
+                        ), None
+                    except SearchFailed as e:
+                        videos, error = [], str(e)
+                    store = None
                 
                 if error:
                     st.error(f"검색 오류: {error}")
                 else:
+                    if store is None:
+                        st.session_state.result_store = ResultStore(
+                            keyword, region_codes, event_type, order_options[order], max_results, videos
+                        )
                     st.session_state.videos = videos
                     st.session_state.search_keyword = keyword
                     st.session_state.search_country = country
                     st.session_state.video_type = video_type
+                    st.session_state.search_order = order
         else:
             st.sidebar.error("검색 키워드를 입력해주세요.")
     
+    # 캐시 상태 표시
+    cache_stats = extractor.cache.stats()
+    st.sidebar.caption(f"💾 캐시 적중 {cache_stats['hits']}회 / 미스 {cache_stats['misses']}회")
+    flight_stats = extractor.single_flight.stats()
+    st.sidebar.caption(f"🔗 동시 검색 합치기 {flight_stats['coalesced']}회")
+    
+    # 할당량 상태 표시
+    quota = extractor.scheduler.status(api_key)
+    st.sidebar.caption(f"📊 남은 할당량 {quota['remaining']:,} / {quota['daily_units']:,} units")
+    if quota['projected_exhaustion']:
+        st.sidebar.caption(f"⏳ 예상 소진 시각 {quota['projected_exhaustion'].strftime('%H:%M')} (PT)")
+    if extractor.scheduler.is_low(api_key):
+        st.sidebar.warning("⚠️ 할당량이 얼마 남지 않아 캐시된 결과를 우선 사용합니다.")
+    
+    # API 호출 지표 (선택 표시)
+    if st.sidebar.checkbox("📈 API 진단 보기"):
+        render_diagnostics_panel(extractor.metrics)
+    
     # 검색 결과 표시
     if 'videos' in st.session_state and st.session_state.videos:
         st.subheader(f"🎯 검색 결과: '{st.session_state.search_keyword}' ({st.session_state.search_country} - {st.session_state.video_type})")
@@ -229,52 +513,11 @@ def main():
         
         st.info(f"총 {len(st.session_state.videos)}개의 영상을 찾았습니다.")
         
-        # 그리드 레이아웃으로 비디오 표시
-        cols = st.columns(3)  # 3열 그리드
-        
-        for idx, video in enumerate(st.session_state.videos):
-            col = cols[idx % 3]
-            
-            with col:
-                # 섬네일 이미지
-                st.image(video['thumbnail_url'], use_container_width=True)
-                
-                # 라이브 상태 표시
-                if video['is_live']:
-                    st.markdown(f"🔴 **LIVE**")
-                
-                # 제목 (클릭 가능한 링크)
-                st.markdown(f"**[{video['title']}]({video['video_url']})**")
-                
-                # 채널명
-                st.caption(f"📺 {video['channel_title']}")
-                
-                # 업로드 일시
-                try:
-                    published_date = datetime.fromisoformat(video['published_at'].replace('Z', '+00:00'))
-                    st.caption(f"📅 {published_date.strftime('%Y-%m-%d %H:%M')}")
-                except:
-                    st.caption(f"📅 {video['published_at']}")
-                
-                # 설명
-                with st.expander("설명 보기"):
-                    st.write(video['description'])
-                
-                # 비디오 통계 (옵션)
-                if st.button(f"📊 통계 보기", key=f"stats_{idx}"):
-                    with st.spinner("통계 로딩 중..."):
-                        stats = extractor.get_video_statistics(video['video_id'])
-                        if stats:
-                            col_a, col_b = st.columns(2)
-                            with col_a:
-                                st.metric("조회수", format_number(stats.get('view_count', '0')))
-                                st.metric("좋아요", format_number(stats.get('like_count', '0')))
-                            with col_b:
-                                st.metric("댓글", format_number(stats.get('comment_count', '0')))
-                        else:
-                            st.error("통계 정보를 가져올 수 없습니다.")
-                
-                st.divider()
+        # 현재 페이지 카드만 렌더링 (다음 페이지 섬네일은 백그라운드로 미리 받기)
+        render_results_grid(
+            st.session_state.videos, partial(render_video_card, extractor),
+            state=(st.session_state.video_type, st.session_state.get('search_order'))
+        )
     else:
         # 초기 화면
         st.info("🔍 왼쪽 사이드바에서 키워드와 국가를 선택한 후 검색 버튼을 클릭하세요.")
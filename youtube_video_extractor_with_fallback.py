@@ -2,39 +2,22 @@ import streamlit as st
 import requests
 import json
 from datetime import datetime
+import copy
 import os
-import random
-
-# 국가 코드 매핑
-COUNTRY_CODES = {
-    '한국': 'KR',
-    '미국': 'US',
-    '일본': 'JP',
-    '중국': 'CN',
-    '영국': 'GB',
-    '독일': 'DE',
-    '프랑스': 'FR',
-    '이탈리아': 'IT',
-    '스페인': 'ES',
-    '캐나다': 'CA',
-    '호주': 'AU',
-    '인도': 'IN',
-    '브라질': 'BR',
-    '러시아': 'RU',
-    '멕시코': 'MX',
-    '태국': 'TH',
-    '베트남': 'VN',
-    '인도네시아': 'ID',
-    '필리핀': 'PH',
-    '말레이시아': 'MY'
-}
-
-# 영상 유형 옵션
-VIDEO_TYPES = {
-    '전체': 'video',
-    '라이브': 'live',
-    '업로드된 영상': 'uploaded'
-}
+import time
+from functools import lru_cache
+from config import Config
+from http_client import get_session, retry_count
+from response_cache import get_response_cache, search_cache_key, search_ttl
+from quota_scheduler import (PRIORITY_INTERACTIVE, RATE_LIMIT_RETRIES, QuotaExceeded, get_quota_scheduler, is_quota_error,
+                             is_rate_limit_error, rate_limit_delay)
+from single_flight import get_single_flight
+from circuit_breaker import STATE_CLOSED, get_circuit_breaker
+from youtube_core import (COUNTRY_CODES, STATS_BATCH_SIZE, VIDEO_TYPES, build_search_params, format_number,
+                          merge_statistics, parse_search_page, parse_statistics)
+from video_record import STATS_FIELDS
+from results_grid import render_results_grid
+from api_metrics import NO_REGION, get_api_metrics, render_diagnostics_panel, start_metrics_server
 
 # 일본 후지산 관련 샘플 데이터
 FUJISAN_LIVE_SAMPLES = [
@@ -124,91 +107,92 @@ FUJISAN_LIVE_SAMPLES = [
     }
 ]
 
+
+@lru_cache(maxsize=1)
+def get_sample_index():
+    """샘플 데이터 검색 색인 (처음 샘플 데이터로 전환될 때 한 번 구축)"""
+    # numpy는 색인을 만들 때만 로드 (API 정상 시 시작 시간에 포함되지 않음)
+    from search_index import SearchIndex
+    return SearchIndex(FUJISAN_LIVE_SAMPLES)
+
+# 샘플 영상 통계 (video_id로 바로 조회). 실제 영상 통계는 API로만 가져오며 임의 값으로 채우지 않음
+SAMPLE_STATS_BY_ID = {
+    video['video_id']: {field: video[field] for field in ('view_count', 'like_count', 'comment_count')}
+    for video in FUJISAN_LIVE_SAMPLES
+}
+
 class YouTubeVideoExtractor:
-    def __init__(self, api_key):
+    def __init__(self, api_key, session=None, cache=None, scheduler=None, priority=PRIORITY_INTERACTIVE, single_flight=None, breaker=None, base_url=None, metrics=None):
         self.api_key = api_key
-        self.base_url = "https://www.googleapis.com/youtube/v3"
-        self.api_working = False
+        # 벤치마크/테스트 시 로컬 모의 서버로 지정 가능
+        self.base_url = (base_url or Config.YOUTUBE_API_BASE_URL).rstrip('/')
+        # 프로세스 전역 keep-alive 세션 공유 (요청마다 TCP+TLS 핸드셰이크 방지)
+        self.session = session or get_session()
+        # 동일 검색 반복 시 API 할당량 절약을 위한 응답 캐시
+        self.cache = cache or get_response_cache()
+        # 모든 API 호출은 할당량 스케줄러를 거침
+        self.scheduler = scheduler or get_quota_scheduler()
+        self.priority = priority
+        # 여러 세션의 동일한 동시 검색(예: 첫 로드 자동 검색)을 하나의 API 호출로 합침
+        self.single_flight = single_flight or get_single_flight()
+        # API 상태는 별도 테스트 요청 없이 실제 호출 결과로 판단
+        self.breaker = breaker or get_circuit_breaker(api_key)
+        # 엔드포인트/국가별 호출 지연, 상태 코드, 할당량, 캐시 적중 집계
+        self.metrics = metrics or get_api_metrics()
         
-    def test_api_key(self):
-        """API 키 유효성 테스트"""
+    def is_api_available(self):
+        """API 사용 가능 여부 (네트워크 요청 없이 실제 호출 결과로 학습한 상태 사용)"""
         if not self.api_key or self.api_key.startswith('AIzaSyDummy'):
             return False
-            
-        try:
-            # 간단한 테스트 요청
-            test_url = f"{self.base_url}/search"
-            params = {
-                'part': 'snippet',
-                'q': 'test',
-                'type': 'video',
-                'maxResults': 1,
-                'key': self.api_key
-            }
-            
-            response = requests.get(test_url, params=params)
-            if response.status_code == 200:
-                self.api_working = True
-                return True
-            else:
-                return False
-                
-        except Exception as e:
-            return False
+        return self.breaker.allow_request()
         
-    def search_videos(self, keyword, country_code='JP', max_results=20, order='relevance', event_type='video'):
-        """YouTube API를 사용하여 비디오 검색 (실패 시 샘플 데이터 사용)"""
+    def search_videos(self, keyword, country_code='JP', max_results=20, order='relevance', event_type='video', with_statistics=False):
+        """YouTube API를 사용하여 비디오 검색 (실패 시 샘플 데이터 사용)
+
+        with_statistics=True 이면 통계 정보를 일괄 조회하여 병합합니다.
+        샘플 데이터에는 통계 정보가 이미 포함되어 있습니다.
+        """
+        # 캐시 확인 (실제 API 결과만 캐시됨)
+        cache_key = search_cache_key(keyword, country_code, max_results, order, event_type,
+                                     with_statistics=with_statistics)
+        cached_videos = self.cache.get(cache_key)
+        if cached_videos is not None:
+            self.metrics.record_cache('search', country_code, 'hit')
+            return cached_videos, None
+        self.metrics.record_cache('search', country_code, 'miss')
         
-        # API 키 테스트
-        if not self.test_api_key():
+        # 할당량이 얼마 남지 않았으면 API 거부 전에 샘플 데이터로 전환
+        if self.api_key and self.scheduler.is_low(self.api_key):
+            return self.get_sample_data(keyword, country_code, max_results, event_type)
+        
+        # 같은 검색이 이미 진행 중이면 새로 호출하지 않고 결과를 공유 (single-flight)
+        (videos, error), shared = self.single_flight.do(
+            cache_key,
+            lambda: self._search_uncached(cache_key, keyword, country_code, max_results, order, event_type, with_statistics)
+        )
+        if shared:
+            # 공유된 결과는 호출자마다 복사본 사용
+            videos = copy.deepcopy(videos)
+        return videos, error
+
+    def _search_uncached(self, cache_key, keyword, country_code, max_results, order, event_type, with_statistics):
+        """API로 검색 후 캐시에 저장 (실패 시 샘플 데이터 사용)"""
+        # 연속 실패로 차단된 상태면 샘플 데이터 사용
+        if not self.is_api_available():
             return self.get_sample_data(keyword, country_code, max_results, event_type)
             
         try:
-            # 검색 API 엔드포인트
-            search_url = f"{self.base_url}/search"
-            
             # 검색 파라미터
-            params = {
-                'part': 'snippet',
-                'q': keyword,
-                'type': 'video',
-                'maxResults': max_results,
-                'order': order,
-                'regionCode': country_code,
-                'key': self.api_key
-            }
+            params = build_search_params(self.api_key, keyword, country_code, max_results, order, event_type)
             
-            # 라이브 스트리밍 필터 추가
-            if event_type == 'live':
-                params['eventType'] = 'live'
-            elif event_type == 'uploaded':
-                params['eventType'] = 'completed'
+            # API 호출 후 비디오 정보 처리
+            videos, _ = parse_search_page(self._api_get('search', params).json())
             
-            # API 호출
-            response = requests.get(search_url, params=params)
-            response.raise_for_status()
+            # 통계 정보 일괄 병합
+            if with_statistics:
+                merge_statistics(videos, self.get_video_statistics_bulk(v['video_id'] for v in videos))
             
-            data = response.json()
-            
-            # 비디오 정보 처리
-            videos = []
-            for item in data.get('items', []):
-                # 라이브 스트리밍 상태 확인
-                live_status = '🔴 LIVE' if item['snippet'].get('liveBroadcastContent') == 'live' else '📹 영상'
-                
-                video_info = {
-                    'video_id': item['id']['videoId'],
-                    'title': item['snippet']['title'],
-                    'description': item['snippet']['description'][:200] + '...' if len(item['snippet']['description']) > 200 else item['snippet']['description'],
-                    'channel_title': item['snippet']['channelTitle'],
-                    'published_at': item['snippet']['publishedAt'],
-                    'thumbnail_url': item['snippet']['thumbnails']['medium']['url'],
-                    'video_url': f"https://www.youtube.com/watch?v={item['id']['videoId']}",
-                    'live_status': live_status,
-                    'is_live': item['snippet'].get('liveBroadcastContent') == 'live'
-                }
-                videos.append(video_info)
-                
+            self.cache.set(cache_key, videos, search_ttl(event_type))
             return videos, None
             
         except requests.exceptions.RequestException as e:
@@ -218,11 +202,61 @@ class YouTubeVideoExtractor:
             # 기타 오류 시 샘플 데이터 반환
             return self.get_sample_data(keyword, country_code, max_results, event_type)
             
+    def _api_get(self, endpoint, params):
+        """할당량 스케줄러를 거쳐 API 호출 (할당량 부족 시 QuotaExceeded)
+
+        모든 호출은 성공/실패와 관계없이 지연, 상태 코드, 응답 크기, 할당량이 기록됩니다.
+        호출 제한(429, rateLimitExceeded) 응답은 잠시 기다린 뒤 RATE_LIMIT_RETRIES번까지 다시 시도하며,
+        서킷 브레이커에는 마지막 응답만 반영합니다.
+        """
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            response = self._api_get_once(endpoint, params)
+            if not is_rate_limit_error(response) or attempt == RATE_LIMIT_RETRIES:
+                break
+            time.sleep(rate_limit_delay(response, attempt))
+        
+        # 호출 결과를 서킷 브레이커에 반영 (호출 제한은 일시적 실패, 그 밖의 403은 즉시 차단,
+        # 400 등 요청 오류는 API 정상으로 간주)
+        if is_rate_limit_error(response) or response.status_code >= 500:
+            self.breaker.record_failure()
+        elif response.status_code == 403:
+            self.breaker.record_failure(fatal=True)
+        else:
+            self.breaker.record_success()
+        response.raise_for_status()
+        return response
+
+    def _api_get_once(self, endpoint, params):
+        region = params.get('regionCode', NO_REGION)
+        try:
+            self.scheduler.acquire(self.api_key, endpoint, self.priority)
+        except QuotaExceeded:
+            self.metrics.observe_request(endpoint, region, 'quota_exceeded')
+            raise
+        
+        start = time.perf_counter()
+        try:
+            response = self.session.get(f"{self.base_url}/{endpoint}", params=params, timeout=Config.HTTP_TIMEOUT)
+        except requests.exceptions.RequestException as e:
+            status = 'timeout' if isinstance(e, requests.exceptions.Timeout) else 'error'
+            self.metrics.observe_request(endpoint, region, status, time.perf_counter() - start,
+                                         quota_units=self.scheduler.cost(endpoint))
+            self.breaker.record_failure()
+            raise
+        self.metrics.observe_response(endpoint, region, response, time.perf_counter() - start,
+                                      quota_units=self.scheduler.cost(endpoint))
+        # 5xx 등으로 urllib3가 다시 보낸 요청도 할당량이 차감되므로 스케줄러 사용량에 반영
+        self.scheduler.charge(self.api_key, endpoint, retry_count(response))
+        
+        if is_quota_error(response):
+            self.scheduler.mark_exhausted(self.api_key)
+        return response
+            
     def get_sample_data(self, keyword, country_code, max_results, event_type):
         """샘플 데이터 반환"""
-        # 키워드가 "후지산"이고 일본 검색인 경우
-        if '후지산' in keyword.lower() and country_code == 'JP':
-            filtered_videos = FUJISAN_LIVE_SAMPLES.copy()
+        # 일본 검색인 경우 샘플 색인에서 관련도 순으로 검색
+        if country_code == 'JP':
+            filtered_videos = get_sample_index().search(keyword, partial=False)
         else:
             # 기본 샘플 데이터
             filtered_videos = []
@@ -233,41 +267,113 @@ class YouTubeVideoExtractor:
         elif event_type == 'uploaded':
             filtered_videos = [v for v in filtered_videos if not v['is_live']]
             
-        # 결과 수 제한
-        return filtered_videos[:max_results], "샘플 데이터"
+        # 결과 수 제한 (호출자가 통계를 병합해도 원본 샘플이 바뀌지 않도록 복사)
+        return [dict(video) for video in filtered_videos[:max_results]], "샘플 데이터"
 
     def get_video_statistics(self, video_id):
-        """비디오 통계 정보 가져오기"""
-        # 샘플 데이터에서 통계 찾기
-        for video in FUJISAN_LIVE_SAMPLES:
-            if video['video_id'] == video_id:
-                return {
-                    'view_count': video['view_count'],
-                    'like_count': video['like_count'],
-                    'comment_count': video['comment_count']
-                }
+        """비디오 통계 정보 가져오기 (가져오지 못하면 None)"""
+        return self.get_video_statistics_bulk([video_id]).get(video_id)
+
+    def get_video_statistics_bulk(self, video_ids):
+        """여러 비디오의 통계 정보를 한 번에 가져오기 (video_id 키 딕셔너리)
+
+        샘플 영상은 샘플 통계를, 실제 영상은 videos.list(요청당 최대 50개 id)를 사용합니다.
+        API를 쓸 수 없거나 실패한 배치의 영상은 결과에서 빠지므로, 호출자는 키가 없는 영상을
+        '통계 없음'으로 표시해야 합니다 (임의 값으로 채우지 않음).
+        """
+        # 중복 id 제거 (순서 유지)
+        ids = [video_id for video_id in dict.fromkeys(video_ids) if video_id]
+        stats_by_id = {}
+        
+        # 샘플/캐시에 있는 통계는 재사용하고 나머지만 요청
+        missing_ids = []
+        for video_id in ids:
+            stats = SAMPLE_STATS_BY_ID.get(video_id)
+            if stats is not None:
+                stats_by_id[video_id] = dict(stats)
+                continue
+            cached_stats = self.cache.get(('stats', video_id))
+            if cached_stats is not None:
+                stats_by_id[video_id] = cached_stats
+                self.metrics.record_cache('videos', NO_REGION, 'hit')
+            else:
+                missing_ids.append(video_id)
+                self.metrics.record_cache('videos', NO_REGION, 'miss')
         
-        # 기본 통계 반환
-        return {
-            'view_count': str(random.randint(1000, 50000)),
-            'like_count': str(random.randint(100, 2000)),
-            'comment_count': str(random.randint(10, 500))
-        }
+        if not missing_ids or not self.is_api_available():
+            return stats_by_id
+        
+        for start in range(0, len(missing_ids), STATS_BATCH_SIZE):
+            chunk = missing_ids[start:start + STATS_BATCH_SIZE]
+            try:
+                params = {
+                    'part': 'statistics',
+                    'fields': STATS_FIELDS,
+                    'id': ','.join(chunk),
+                    'maxResults': len(chunk),
+                    'key': self.api_key
+                }
+                
+                chunk_stats = parse_statistics(self._api_get('videos', params).json())
+                for video_id, stats in chunk_stats.items():
+                    self.cache.set(('stats', video_id), stats, Config.CACHE_TTL_STATS)
+                stats_by_id.update(chunk_stats)
+                    
+            except QuotaExceeded:
+                # 할당량 부족 시 남은 배치는 요청하지 않음
+                break
+            except Exception:
+                # 실패한 배치는 건너뛰고 나머지 결과는 반환
+                continue
+                
+        return stats_by_id
 
-def format_number(num_str):
-    """숫자를 한국어 단위로 포맷팅"""
+@st.cache_resource(show_spinner=False)
+def get_extractor(api_key):
+    """재실행/세션마다 새로 만들지 않고 프로세스에서 공유하는 추출기 (HTTP 커넥션 풀 포함)"""
+    # METRICS_PORT 설정 시 Prometheus /metrics 노출 (프로세스당 한 번)
+    start_metrics_server()
+    return YouTubeVideoExtractor(api_key, session=get_session())
+
+def render_video_card(video, idx, thumbnail):
+    """결과 카드 하나 (섬네일, 제목, 채널, 일시, 기본 통계, 설명)"""
+    # 섬네일 이미지
+    st.image(thumbnail, use_container_width=True)
+    
+    # 라이브 상태 표시
+    if video['is_live']:
+        st.markdown("🔴 **LIVE**")
+    
+    # 제목 (클릭 가능한 링크)
+    st.markdown(f"**[{video['title']}]({video['video_url']})**")
+    
+    # 채널명
+    st.caption(f"📺 {video['channel_title']}")
+    
+    # 업로드 일시
     try:
-        num = int(num_str)
-        if num >= 100000000:  # 1억 이상
-            return f"{num // 100000000}억 {(num % 100000000) // 10000}만"
-        elif num >= 10000:  # 1만 이상
-            return f"{num // 10000}만 {(num % 10000) // 1000}천"
-        elif num >= 1000:  # 1천 이상
-            return f"{num // 1000}천 {num % 1000}"
-        else:
-            return str(num)
+        published_date = datetime.fromisoformat(video['published_at'].replace('Z', '+00:00'))
+        st.caption(f"📅 {published_date.strftime('%Y-%m-%d %H:%M')}")
     except:
-        return num_str
+        st.caption(f"📅 {video['published_at']}")
+    
+    # 기본 통계 표시 (검색 시 결과 집합 단위로 한 번만 조회, 재실행 시 dict 조회만 수행)
+    stats = st.session_state.get('stats_by_id', {}).get(video['video_id'])
+    if stats:
+        col_a, col_b = st.columns(2)
+        with col_a:
+            st.metric("조회수", format_number(stats.get('view_count', '0')))
+        with col_b:
+            st.metric("좋아요", format_number(stats.get('like_count', '0')))
+    else:
+        # API 실패/할당량 부족으로 통계를 가져오지 못한 영상은 빈칸 대신 명시
+        st.caption("📊 통계 정보를 가져올 수 없습니다.")
+    
+    # 설명
+    with st.expander("설명 보기"):
+        st.write(video['description'])
+    
+    st.divider()
 
 def main():
     st.set_page_config(
@@ -282,13 +388,15 @@ def main():
     # API 키 확인
     api_key = os.getenv('YOUTUBE_API_KEY')
     
-    # 추출기 초기화
-    extractor = YouTubeVideoExtractor(api_key)
+    # 추출기 초기화 (cache_resource로 재실행 간 공유)
+    extractor = get_extractor(api_key)
     
     # API 상태 확인
     if not api_key or api_key.startswith('AIzaSyDummy'):
         st.warning("⚠️ 실제 YouTube API 키가 설정되지 않아 샘플 데이터를 사용합니다.")
         st.info("💡 실제 검색을 위해서는 .env 파일에 올바른 YOUTUBE_API_KEY를 설정해주세요.")
+    elif extractor.breaker.state != STATE_CLOSED:
+        st.warning("⚠️ YouTube API 호출이 연속으로 실패하여 잠시 샘플 데이터를 사용합니다.")
     
     # 검색 설정
     st.sidebar.header("🔍 검색 설정")
@@ -329,9 +437,11 @@ def main():
             )
             
             st.session_state.videos = videos
+            st.session_state.stats_by_id = extractor.get_video_statistics_bulk(v['video_id'] for v in videos)
             st.session_state.search_keyword = keyword
             st.session_state.search_country = country
             st.session_state.video_type = video_type
+            st.session_state.search_order = order
             st.session_state.error = error
     
     # 검색 버튼
@@ -347,13 +457,19 @@ def main():
                 )
                 
                 st.session_state.videos = videos
+                st.session_state.stats_by_id = extractor.get_video_statistics_bulk(v['video_id'] for v in videos)
                 st.session_state.search_keyword = keyword
                 st.session_state.search_country = country
                 st.session_state.video_type = video_type
+                st.session_state.search_order = order
                 st.session_state.error = error
         else:
             st.sidebar.error("검색 키워드를 입력해주세요.")
     
+    # API 호출 지표 (선택 표시)
+    if st.sidebar.checkbox("📈 API 진단 보기"):
+        render_diagnostics_panel(extractor.metrics)
+    
     # 검색 결과 표시
     if 'videos' in st.session_state and st.session_state.videos:
         st.subheader(f"🎯 검색 결과: '{st.session_state.search_keyword}' ({st.session_state.search_country} - {st.session_state.video_type})")
@@ -369,47 +485,11 @@ def main():
         
         st.info(f"총 {len(st.session_state.videos)}개의 영상을 찾았습니다.")
         
-        # 그리드 레이아웃으로 비디오 표시
-        cols = st.columns(3)  # 3열 그리드
-        
-        for idx, video in enumerate(st.session_state.videos):
-            col = cols[idx % 3]
-            
-            with col:
-                # 섬네일 이미지
-                st.image(video['thumbnail_url'], use_container_width=True)
-                
-                # 라이브 상태 표시
-                if video['is_live']:
-                    st.markdown("🔴 **LIVE**")
-                
-                # 제목 (클릭 가능한 링크)
-                st.markdown(f"**[{video['title']}]({video['video_url']})**")
-                
-                # 채널명
-                st.caption(f"📺 {video['channel_title']}")
-                
-                # 업로드 일시
-                try:
-                    published_date = datetime.fromisoformat(video['published_at'].replace('Z', '+00:00'))
-                    st.caption(f"📅 {published_date.strftime('%Y-%m-%d %H:%M')}")
-                except:
-                    st.caption(f"📅 {video['published_at']}")
-                
-                # 기본 통계 표시
-                stats = extractor.get_video_statistics(video['video_id'])
-                if stats:
-                    col_a, col_b = st.columns(2)
-                    with col_a:
-                        st.metric("조회수", format_number(stats.get('view_count', '0')))
-                    with col_b:
-                        st.metric("좋아요", format_number(stats.get('like_count', '0')))
-                
-                # 설명
-                with st.expander("설명 보기"):
-                    st.write(video['description'])
-                
-                st.divider()
+        # 현재 페이지 카드만 렌더링 (다음 페이지 섬네일은 백그라운드로 미리 받기)
+        render_results_grid(
+            st.session_state.videos, render_video_card,
+            state=(st.session_state.video_type, st.session_state.get('search_order'))
+        )
     
     # 하단 정보
     st.markdown("---")